@@ -52,20 +52,34 @@ function LiveScoring() {
     );
   };
 
+  // Someone else changed the match since we loaded it: show theirs instead of overwriting.
+  const isStale = (err) => {
+    if (err.response && err.response.status === 409) {
+      alert('This match was updated by someone else. Reloading the latest scores.');
+      fetchMatches();
+      return true;
+    }
+    return false;
+  };
+
   // --- NEW FUNCTION: To start a game ---
   const handleStartGame = async (matchId) => {
+    const match = matches.find(m => m.id === matchId);
+    if (!match) return;
+
     try {
       const apiClient = getApiClient();
       // Set status to LIVE and initialize scores to 0
       await apiClient.patch(`/api/tournaments/matches/${matchId}/`, {
         status: 'LIVE',
         team_a_score: 0,
-        team_b_score: 0
+        team_b_score: 0,
+        version: match.version
       });
       alert('Match started!');
       fetchMatches(); // Refresh the list
     } catch (err) {
-      setError('Failed to start match.');
+      if (!isStale(err)) setError('Failed to start match.');
     }
   };
 
@@ -78,12 +92,13 @@ function LiveScoring() {
       const apiClient = getApiClient();
       await apiClient.patch(`/api/tournaments/matches/${matchId}/`, {
         team_a_score: match.scoreA,
-        team_b_score: match.scoreB
+        team_b_score: match.scoreB,
+        version: match.version
       });
       alert('Score updated successfully!');
       fetchMatches(); // Refresh
     } catch (err) {
-      setError('Failed to update score. Are you a Volunteer?');
+      if (!isStale(err)) setError('Failed to update score. Are you a Volunteer?');
     }
   };
 
@@ -92,18 +107,21 @@ function LiveScoring() {
     if (!window.confirm('Are you sure you want to mark this match as final?')) {
       return;
     }
+    const match = matches.find(m => m.id === matchId);
+    if (!match) return;
 
     try {
       const apiClient = getApiClient();
       // Set status to FINAL and set is_final to true
       await apiClient.patch(`/api/tournaments/matches/${matchId}/`, {
         status: 'FINAL',
-        is_final: true
+        is_final: true,
+        version: match.version
       });
       alert('Match marked as final!');
       fetchMatches(); // Refresh
     } catch (err) {
-      setError('Failed to finalize match. Are you a Volunteer?');
+      if (!isStale(err)) setError('Failed to finalize match. Are you a Volunteer?');
     }
   };
 
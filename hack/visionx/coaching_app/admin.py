@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ChildProfile, Session, Attendance, HomeVisit, LSASAssessment, CoachActivity
+from .models import ChildProfile, Session, Attendance, HomeVisit, LSASAssessment, CoachActivity, ParticipationRollup, ChildAttendanceRollup, DropoutScan
 
 
 @admin.register(ChildProfile)
@@ -51,4 +51,23 @@ class CoachActivityAdmin(admin.ModelAdmin):
     list_display = ['coach', 'activity_type', 'date', 'duration_hours', 'created_at']
     list_filter = ['activity_type', 'date', 'coach']
     search_fields = ['coach__username']
-    readonly_fields = ['created_at', 'updated_at']
\ No newline at end of file
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(ParticipationRollup)
+class ParticipationRollupAdmin(admin.ModelAdmin):
+    list_display = ['period', 'period_start', 'coach_id', 'location', 'gender', 'present', 'absent']
+    list_filter = ['period', 'gender']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(ChildAttendanceRollup)
+class ChildAttendanceRollupAdmin(admin.ModelAdmin):
+    list_display = ['child', 'month', 'sessions_total', 'present_count']
+    list_filter = ['month']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(DropoutScan)
+class DropoutScanAdmin(admin.ModelAdmin):
+    list_display = ['started_at', 'finished_at', 'full', 'children_scanned', 'children_flagged']
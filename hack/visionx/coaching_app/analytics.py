@@ -0,0 +1,136 @@
+from array import array
+from statistics import median
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Attendance, ChildProfile
+
+
+# (upper age bound, label); the last band is open-ended.
+AGE_BANDS = ((10, 'under 10'), (13, '10-12'), (16, '13-15'), (None, '16+'))
+COHORT_DIMENSIONS = ('coach', 'location', 'gender', 'age_band')
+
+
+def age_band(date_of_birth, on):
+    if not date_of_birth:
+        return ''
+    age = on.year - date_of_birth.year - ((on.month, on.day) < (date_of_birth.month, date_of_birth.day))
+    for bound, label in AGE_BANDS:
+        if bound is None or age < bound:
+            return label
+
+
+class ScoreTable:
+    """
+    A set of LSAS assessments as parallel arrays sorted by child then date:
+    child index, day number and score per assessment. Each child's
+    assessments are one contiguous run, so every per-child statistic is a
+    single pass over the columns.
+    """
+
+    def __init__(self, rows):
+        self.child_ids = []
+        self.starts = array('l')
+        self.days, self.scores = array('l'), array('l')
+        self.last_dates = []
+        for child_id, day, score in rows:
+            if not self.child_ids or self.child_ids[-1] != child_id:
+                self.child_ids.append(child_id)
+                self.starts.append(len(self.days))
+                self.last_dates.append(day)
+            self.days.append(day.toordinal())
+            self.scores.append(score)
+            self.last_dates[-1] = day
+        self.starts.append(len(self.days))
+
+    @classmethod
+    def for_assessments(cls, assessments):
+        return cls(assessments.order_by('child_id', 'date', 'id').values_list('child_id', 'date', 'score'))
+
+    def trends(self):
+        """Per child: count, first and latest score, delta and least-squares slope (points per 30 days)."""
+        rows = []
+        for index, child_id in enumerate(self.child_ids):
+            start, end = self.starts[index], self.starts[index + 1]
+            days, scores = self.days[start:end], self.scores[start:end]
+            count = end - start
+            mean_day, mean_score = sum(days) / count, sum(scores) / count
+            spread = sum((day - mean_day) ** 2 for day in days)
+            slope = sum((day - mean_day) * (score - mean_score) for day, score in zip(days, scores)) / spread \
+                if spread else 0.0
+            rows.append({
+                'child_id': child_id,
+                'assessments': count,
+                'first_score': scores[0],
+                'latest_score': scores[-1],
+                'latest_date': self.last_dates[index],
+                'delta': scores[-1] - scores[0],
+                'slope_per_30_days': round(slope * 30, 3),
+            })
+        return rows
+
+
+def _distribution(trends):
+    deltas = [trend['delta'] for trend in trends]
+    return {
+        'children': len(trends),
+        'assessments': sum(trend['assessments'] for trend in trends),
+        'improved': sum(delta > 0 for delta in deltas),
+        'declined': sum(delta < 0 for delta in deltas),
+        'unchanged': sum(delta == 0 for delta in deltas),
+        'mean_delta': round(sum(deltas) / len(deltas), 2),
+        'median_delta': median(deltas),
+        'mean_slope_per_30_days': round(sum(trend['slope_per_30_days'] for trend in trends) / len(trends), 3),
+        'mean_latest_score': round(sum(trend['latest_score'] for trend in trends) / len(trends), 2),
+    }
+
+
+def lsas_trends(assessments):
+    """
+    Per-child LSAS score trends for an assessment queryset plus their
+    distribution overall and per coach, location (of the child's latest
+    session), gender and age band at the latest assessment. Three queries:
+    the assessments, the children's cohort attributes and their latest
+    session locations.
+    """
+    trends = ScoreTable.for_assessments(assessments).trends()
+    child_ids = assessments.order_by().values('child_id')
+    children = {
+        child_id: (coach_id, gender, date_of_birth)
+        for child_id, coach_id, gender, date_of_birth in ChildProfile.objects.filter(id__in=child_ids).values_list(
+            'id', 'assigned_coach_id', 'gender', 'date_of_birth'
+        )
+    }
+    # Each child's newest attendance, numbered per child in one pass over
+    # attendance_child_date_idx rather than a subquery per child.
+    locations = dict(Attendance.objects.filter(child_id__in=child_ids).annotate(
+        newest=Window(
+            RowNumber(), partition_by=[F('child_id')],
+            order_by=[F('session_date').desc(), F('session_time').desc(), F('session_id').desc()],
+        )
+    ).filter(newest=1).order_by().values_list('child_id', 'session__location'))
+
+    cohorts = {dimension: {} for dimension in COHORT_DIMENSIONS}
+    for trend in trends:
+        coach_id, gender, date_of_birth = children[trend['child_id']]
+        location = locations.get(trend['child_id'])
+        # Same "no value" convention as the participation rollups.
+        trend.update(
+            coach=coach_id or 0, location=location or '', gender=gender or '',
+            age_band=age_band(date_of_birth, trend['latest_date']),
+        )
+        for dimension in COHORT_DIMENSIONS:
+            cohorts[dimension].setdefault(trend[dimension], []).append(trend)
+
+    return {
+        'overall': _distribution(trends) if trends else None,
+        'cohorts': {
+            dimension: [
+                dict(_distribution(members), **{dimension: key})
+                for key, members in sorted(groups.items())
+            ]
+            for dimension, groups in cohorts.items()
+        },
+        'children': trends,
+    }
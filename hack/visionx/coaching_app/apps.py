@@ -5,3 +5,5 @@ class CoachingAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coaching_app'
 
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,134 @@
+from collections import deque
+from datetime import timedelta
+from itertools import groupby
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Attendance, ChildProfile, DropoutScan
+
+
+DEFAULT_ABSENCES = 3
+DEFAULT_WINDOW = 6
+# Percentage points the attendance rate has to fall by between windows.
+DEFAULT_DROP = 25
+FLUSH_SIZE = 500
+# Re-check a little before the last scan started, for rows saved just
+# before it but committed after it had read the table.
+SCAN_OVERLAP = timedelta(minutes=5)
+
+
+def _rate(marks):
+    return round(sum(marks) / len(marks) * 100, 2) if marks else None
+
+
+def assess_child(rows, absences=DEFAULT_ABSENCES, window=DEFAULT_WINDOW, drop=DEFAULT_DROP):
+    """
+    Dropout risk from one child's ``(date, status)`` attendance rows in
+    session order, kept to a bounded tail: the trailing run of absences and
+    the attendance rate of the last ``window`` sessions against the
+    ``window`` before them.
+    """
+    marks = deque(maxlen=2 * window)
+    streak, last_session = 0, None
+    for day, status in rows:
+        present = status == 'Present'
+        marks.append(present)
+        streak = 0 if present else streak + 1
+        last_session = day
+
+    marks = list(marks)
+    recent_rate = _rate(marks[-window:])
+    previous_rate = _rate(marks[:-window]) if len(marks) == 2 * window else None
+    reasons = []
+    if streak >= absences:
+        reasons.append('consecutive_absences')
+    if previous_rate is not None and previous_rate - recent_rate >= drop:
+        reasons.append('falling_attendance')
+    return {
+        'flagged': bool(reasons),
+        'reasons': reasons,
+        'consecutive_absences': streak,
+        'recent_rate': recent_rate,
+        'previous_rate': previous_rate,
+        'last_session': last_session.isoformat() if last_session else None,
+    }
+
+
+def _record(results, checked_at):
+    """
+    Store each child's assessment under ``participation_history['dropout_risk']``.
+    The rows are locked and re-read first, so history written by someone
+    else in the meantime is kept.
+    """
+    with transaction.atomic():
+        children = list(
+            ChildProfile.objects.select_for_update().filter(id__in=results).only('id', 'participation_history')
+        )
+        for child in children:
+            history = child.participation_history if isinstance(child.participation_history, dict) else {}
+            child.participation_history = dict(history, dropout_risk=dict(results[child.id], checked_at=checked_at))
+        ChildProfile.objects.bulk_update(children, ['participation_history'], batch_size=FLUSH_SIZE)
+
+
+def _changed_children(since):
+    """
+    Ids of children whose attendance, sessions or profile changed since
+    ``since``, as a UNION of per-table id queries so each can use its
+    updated_at index (an OR across the session join could not).
+    """
+    return Attendance.objects.filter(updated_at__gte=since).order_by().values('child_id').union(
+        Attendance.objects.filter(session__updated_at__gte=since).order_by().values('child_id'),
+        # Deleting attendance touches the child (see signals.py).
+        ChildProfile.objects.filter(updated_at__gte=since).order_by().values('id'),
+    )
+
+
+def scan_dropout_risk(absences=DEFAULT_ABSENCES, window=DEFAULT_WINDOW, drop=DEFAULT_DROP, full=False):
+    """
+    Re-assess every child whose attendance (or one of whose sessions)
+    changed since the last finished scan, or every child on the first run,
+    with ``full``, or when the thresholds differ from the last scan's.
+    Attendance is streamed in (child, session date) order, so memory stays
+    bounded by one child's window and a batch of results however large the
+    table grows. Returns the DropoutScan.
+    """
+    previous = DropoutScan.objects.filter(finished_at__isnull=False).first()
+    full = full or previous is None or (previous.absences, previous.window, previous.drop) != (absences, window, drop)
+    scan = DropoutScan.objects.create(
+        started_at=timezone.now(), full=full, absences=absences, window=window, drop=drop
+    )
+
+    attendances = Attendance.objects.all()
+    if not scan.full:
+        # Rows saved while this scan runs are newer than scan.started_at and go to the next one.
+        attendances = attendances.filter(child_id__in=_changed_children(previous.started_at - SCAN_OVERLAP))
+    rows = attendances.order_by('child_id', 'session_date', 'session_time', 'session_id').values_list(
+        'child_id', 'session_date', 'status'
+    ).iterator(chunk_size=2000)
+
+    checked_at = scan.started_at.isoformat()
+    results = {}
+    for child_id, child_rows in groupby(rows, key=lambda row: row[0]):
+        results[child_id] = assess_child(((day, status) for _, day, status in child_rows), absences, window, drop)
+        scan.children_scanned += 1
+        scan.children_flagged += results[child_id]['flagged']
+        if len(results) >= FLUSH_SIZE:
+            _record(results, checked_at)
+            results = {}
+
+    # Children left with no attendance at all never show up above.
+    for child_id in ChildProfile.objects.filter(
+        participation_history__dropout_risk__flagged=True, attendances__isnull=True
+    ).values_list('id', flat=True).iterator():
+        results[child_id] = assess_child([], absences, window, drop)
+        scan.children_scanned += 1
+        if len(results) >= FLUSH_SIZE:
+            _record(results, checked_at)
+            results = {}
+    if results:
+        _record(results, checked_at)
+
+    scan.finished_at = timezone.now()
+    scan.save()
+    return scan
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from coaching_app.rollups import rebuild_child_attendance_rollups
+
+
+class Command(BaseCommand):
+    help = "Backfill the per-child monthly attendance rollups from attendance records."
+
+    def handle(self, *args, **options):
+        rebuild_child_attendance_rollups()
+        self.stdout.write("Rebuilt child attendance rollups")
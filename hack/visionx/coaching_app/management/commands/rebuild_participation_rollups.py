@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from coaching_app.rollups import rebuild_participation_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the weekly/monthly participation rollups from attendance records."
+
+    def handle(self, *args, **options):
+        rebuild_participation_rollups()
+        self.stdout.write("Rebuilt participation rollups")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from coaching_app.dropout import DEFAULT_ABSENCES, DEFAULT_DROP, DEFAULT_WINDOW, scan_dropout_risk
+
+
+class Command(BaseCommand):
+    help = "Flag children at risk of dropping out, re-checking only attendance changed since the last scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--absences', type=int, default=DEFAULT_ABSENCES,
+                            help="Consecutive absences that flag a child.")
+        parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                            help="Sessions per window when comparing attendance rates.")
+        parser.add_argument('--drop', type=float, default=DEFAULT_DROP,
+                            help="Fall in attendance rate (percentage points) that flags a child.")
+        parser.add_argument('--full', action='store_true', help="Re-check every child.")
+
+    def handle(self, *args, **options):
+        scan = scan_dropout_risk(options['absences'], options['window'], options['drop'], options['full'])
+        self.stdout.write(
+            f"Scanned {scan.children_scanned} children, {scan.children_flagged} flagged"
+        )
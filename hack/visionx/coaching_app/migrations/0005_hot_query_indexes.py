@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching_app', '0004_session_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['session', 'status'], name='attendance_session_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['assigned_coach', 'status', 'date', 'time'], name='session_coach_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['-date', '-time', 'id'], name='session_date_time_idx'),
+        ),
+    ]
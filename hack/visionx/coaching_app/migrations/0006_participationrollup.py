@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:17
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rollups(apps, schema_editor):
+    # Same buckets as rollups.attendance_contribution, kept here so later
+    # changes to the app code cannot change what this migration writes.
+    Attendance = apps.get_model('coaching_app', 'Attendance')
+    ParticipationRollup = apps.get_model('coaching_app', 'ParticipationRollup')
+    totals = {}
+    for status, day, coach_id, location, gender, count in Attendance.objects.values_list(
+        'status', 'session__date', 'session__assigned_coach_id', 'session__location', 'child__gender'
+    ).annotate(count=Count('id')).order_by():
+        field = 'present' if status == 'Present' else 'absent'
+        for period, start in (('WEEK', day - timedelta(days=day.weekday())), ('MONTH', day.replace(day=1))):
+            row = totals.setdefault((period, start, coach_id or 0, location, gender or ''), {'present': 0, 'absent': 0})
+            row[field] += count
+    ParticipationRollup.objects.bulk_create([
+        ParticipationRollup(
+            period=period, period_start=start, coach_id=coach_id, location=location, gender=gender, **values
+        )
+        for (period, start, coach_id, location, gender), values in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching_app', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParticipationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('WEEK', 'Week'), ('MONTH', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('coach_id', models.PositiveBigIntegerField(default=0)),
+                ('location', models.CharField(max_length=200)),
+                ('gender', models.CharField(blank=True, max_length=10)),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('period', 'period_start', 'coach_id', 'location', 'gender')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
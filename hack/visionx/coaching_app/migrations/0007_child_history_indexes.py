@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching_app', '0006_participationrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='homevisit',
+            index=models.Index(fields=['child', '-date', '-id'], name='homevisit_child_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lsasassessment',
+            index=models.Index(fields=['child', '-date', '-id'], name='lsas_child_date_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching_app', '0007_child_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChildAttendanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('sessions_total', models.IntegerField(default=0)),
+                ('present_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_rollups', to='coaching_app.childprofile')),
+            ],
+            options={
+                'ordering': ['child', 'month'],
+                'unique_together': {('child', 'month')},
+            },
+        ),
+    ]
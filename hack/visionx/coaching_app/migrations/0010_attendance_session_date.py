@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:44
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_session_dates(apps, schema_editor):
+    Attendance = apps.get_model('coaching_app', 'Attendance')
+    Session = apps.get_model('coaching_app', 'Session')
+    sessions = Session.objects.filter(pk=OuterRef('session_id'))
+    Attendance.objects.update(
+        session_date=Subquery(sessions.values('date')[:1]),
+        session_time=Subquery(sessions.values('time')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching_app', '0009_dropoutscan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendance',
+            name='session_date',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='session_time',
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_session_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['child', '-session_date', '-session_time', '-session'], name='attendance_child_date_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching_app', '0010_attendance_session_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dropoutscan',
+            name='absences',
+            field=models.PositiveIntegerField(default=3),
+        ),
+        migrations.AddField(
+            model_name='dropoutscan',
+            name='drop',
+            field=models.FloatField(default=25),
+        ),
+        migrations.AddField(
+            model_name='dropoutscan',
+            name='window',
+            field=models.PositiveIntegerField(default=6),
+        ),
+        migrations.AddIndex(
+            model_name='childprofile',
+            index=models.Index(fields=['updated_at'], name='child_updated_idx'),
+        ),
+    ]
@@ -38,6 +38,10 @@ class ChildProfile(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Incremental dropout-risk scans pick up children whose attendance was deleted.
+            models.Index(fields=['updated_at'], name='child_updated_idx'),
+        ]
 
     def __str__(self):
         
@@ -80,6 +84,12 @@ class Session(models.Model):
 
     class Meta:
         ordering = ['-date', '-time']
+        indexes = [
+            # CoachDashboardView: assigned_coach + status, ordered/filtered by date.
+            models.Index(fields=['assigned_coach', 'status', 'date', 'time'], name='session_coach_status_idx'),
+            models.Index(fields=['-date', '-time', 'id'], name='session_date_time_idx'),
+            models.Index(fields=['updated_at'], name='session_updated_idx'),
+        ]
 
     def __str__(self):
         return f"Session on {self.date} at {self.time} - {self.location}"
@@ -106,12 +116,25 @@ class Attendance(models.Model):
         choices=STATUS_CHOICES,
         default='Absent'
     )
+    # Copies of session.date and session.time, kept in step by signals, so
+    # a child's history sorts on an index of this table instead of a join.
+    session_date = models.DateField(null=True, editable=False)
+    session_time = models.TimeField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = [['child', 'session']]
         ordering = ['-session__date', '-session__time']
+        indexes = [
+            # unified_history timeline: a child's sessions, newest first.
+            models.Index(fields=['child', '-session_date', '-session_time', '-session'],
+                         name='attendance_child_date_idx'),
+            # Coach-scoped attendance joins in on session_id; status makes counts index-only.
+            models.Index(fields=['session', 'status'], name='attendance_session_status_idx'),
+            # Incremental dropout-risk scans pick up rows changed since the last run.
+            models.Index(fields=['updated_at'], name='attendance_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.child} - {self.session} - {self.status}"
@@ -136,6 +159,10 @@ class HomeVisit(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # A child's history, newest first (unified_history timeline).
+            models.Index(fields=['child', '-date', '-id'], name='homevisit_child_date_idx'),
+        ]
 
     def __str__(self):
         return f"Home Visit for {self.child} on {self.date}"
@@ -156,6 +183,9 @@ class LSASAssessment(models.Model):
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['child', '-date', '-id'], name='lsas_child_date_idx'),
+        ]
 
     def __str__(self):
         return f"LSAS Assessment for {self.child} on {self.date} - Score: {self.score}"
@@ -195,4 +225,84 @@ class CoachActivity(models.Model):
         ordering = ['-date']
 
     def __str__(self):
-        return f"{self.coach} - {self.activity_type} on {self.date}"
\ No newline at end of file
+        return f"{self.coach} - {self.activity_type} on {self.date}"
+
+class ParticipationRollup(models.Model):
+    """
+    Present/absent attendance counts per week or month, coach, session
+    location and child gender. Maintained from the Attendance signals
+    (see rollups.py) so trend reports read buckets, not attendance rows.
+    """
+
+    PERIOD_CHOICES = [
+        ('WEEK', 'Week'),
+        ('MONTH', 'Month'),
+    ]
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    # Monday of the week, or the first of the month.
+    period_start = models.DateField()
+    # The session's assigned coach id, 0 when unassigned. Not a foreign key
+    # so the bucket key never contains NULL and stays unique.
+    coach_id = models.PositiveBigIntegerField(default=0)
+    location = models.CharField(max_length=200)
+    gender = models.CharField(max_length=10, blank=True)
+
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [['period', 'period_start', 'coach_id', 'location', 'gender']]
+
+    def __str__(self):
+        return f"{self.period} {self.period_start} coach {self.coach_id} {self.location} {self.gender}"
+
+
+class ChildAttendanceRollup(models.Model):
+    """
+    Sessions attended and present count per child per month, maintained
+    alongside ParticipationRollup so a child's attendance rate reads a
+    row per month instead of every attendance record.
+    """
+
+    child = models.ForeignKey(
+        ChildProfile,
+        on_delete=models.CASCADE,
+        related_name='attendance_rollups'
+    )
+    # First of the month.
+    month = models.DateField()
+    sessions_total = models.IntegerField(default=0)
+    present_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [['child', 'month']]
+        ordering = ['child', 'month']
+
+    def __str__(self):
+        return f"{self.child_id} {self.month}: {self.present_count}/{self.sessions_total}"
+
+
+class DropoutScan(models.Model):
+    """
+    One run of the dropout-risk detector (see dropout.py). The next run only
+    looks at attendance changed since the last run's ``started_at``, unless
+    it uses different thresholds.
+    """
+
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    full = models.BooleanField(default=False)
+    # The thresholds the run used; defaults are dropout.DEFAULT_*.
+    absences = models.PositiveIntegerField(default=3)
+    window = models.PositiveIntegerField(default=6)
+    drop = models.FloatField(default=25)
+    children_scanned = models.IntegerField(default=0)
+    children_flagged = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Dropout scan at {self.started_at}: {self.children_flagged}/{self.children_scanned} flagged"
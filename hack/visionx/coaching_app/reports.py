@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import TruncMonth
+
+from .models import CoachActivity, HomeVisit, Session
+
+
+WORKLOAD_KINDS = ('sessions', 'home_visits', 'activities')
+
+
+def _by_coach_and_month(queryset, coach_field, kind, hours):
+    return queryset.values(
+        coach_user=F(coach_field), month=TruncMonth('date'), kind=Value(kind)
+    ).annotate(count=Count('id'), hours=hours).order_by()
+
+
+def coach_workload(date_from=None, date_to=None):
+    """
+    Sessions created, home visits, activities and activity hours per coach,
+    in total and per month. Two queries whatever the number of coaches: the
+    coaches, and one UNION ALL of the three grouped counts.
+    """
+    dates = {}
+    if date_from:
+        dates['date__gte'] = date_from
+    if date_to:
+        dates['date__lte'] = date_to
+
+    no_hours = Sum(Value(Decimal('0')), output_field=DecimalField(max_digits=10, decimal_places=2))
+    counts = _by_coach_and_month(
+        Session.objects.filter(created_by__role='COACH', **dates), 'created_by', 'sessions', no_hours
+    ).union(
+        _by_coach_and_month(HomeVisit.objects.filter(coach__role='COACH', **dates), 'coach', 'home_visits', no_hours),
+        _by_coach_and_month(CoachActivity.objects.filter(coach__role='COACH', **dates), 'coach', 'activities',
+                            Sum('duration_hours')),
+        all=True,
+    )
+
+    workload = {
+        coach_id: {
+            'coach_id': coach_id,
+            'coach_name': username,
+            'sessions_count': 0,
+            'home_visits_count': 0,
+            'activities_count': 0,
+            'total_hours': 0.0,
+            'months': {},
+        }
+        for coach_id, username in get_user_model().objects.filter(role='COACH').order_by('id').values_list(
+            'id', 'username'
+        )
+    }
+    for row in counts:
+        coach = workload[row['coach_user']]
+        month = coach['months'].setdefault(row['month'].strftime('%Y-%m'), dict(
+            {kind: 0 for kind in WORKLOAD_KINDS}, hours=0.0
+        ))
+        month[row['kind']] += row['count']
+        coach[f"{row['kind']}_count"] += row['count']
+        if row['kind'] == 'activities':
+            month['hours'] += float(row['hours'] or 0)
+            coach['total_hours'] += float(row['hours'] or 0)
+
+    for coach in workload.values():
+        coach['months'] = [dict(month=month, **values) for month, values in sorted(coach['months'].items())]
+    return list(workload.values())
@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from visionx.counters import apply_counter_change, sum_contributions
+from .models import Attendance, ChildAttendanceRollup, ParticipationRollup
+
+
+ROLLUP_FIELDS = ['present', 'absent']
+ROLLUP_KEY = ('period', 'period_start', 'coach_id', 'location', 'gender')
+CHILD_ROLLUP_FIELDS = ['sessions_total', 'present_count']
+CHILD_ROLLUP_KEY = ('child_id', 'month')
+
+
+def period_starts(day):
+    """The (period, period_start) buckets an attendance on ``day`` falls in."""
+    return [('WEEK', day - timedelta(days=day.weekday())), ('MONTH', day.replace(day=1))]
+
+
+def attendance_contribution(status, day, coach_id, location, gender, count=1):
+    """
+    What ``count`` attendance records contribute to the rollups, as
+    ``{(period, period_start, coach_id, location, gender): {field: delta}}``.
+    """
+    field = 'present' if status == 'Present' else 'absent'
+    return {
+        (period, start, coach_id or 0, location, gender or ''): {field: count}
+        for period, start in period_starts(day)
+    }
+
+
+def contribution_for_attendance(attendance):
+    session = attendance.session
+    return attendance_contribution(
+        attendance.status, session.date, session.assigned_coach_id, session.location, attendance.child.gender
+    )
+
+
+def contribution_for_rows(rows):
+    """Sum contributions of ``(status, date, coach_id, location, gender, count)`` rows."""
+    return sum_contributions(ROLLUP_FIELDS, (attendance_contribution(*row) for row in rows))
+
+
+def contribution_for_attendances(attendances):
+    """Contribution of an Attendance queryset, from one grouped query."""
+    return contribution_for_rows(attendances.values_list(
+        'status', 'session__date', 'session__assigned_coach_id', 'session__location', 'child__gender'
+    ).annotate(count=Count('id')).order_by())
+
+
+def apply_rollup_change(before, after):
+    """
+    Move the rollup rows from the ``before`` contribution to the ``after``
+    one; only buckets whose counts change are touched, each with one F()
+    UPDATE.
+    """
+    apply_counter_change(ParticipationRollup, ROLLUP_FIELDS, before, after, key_fields=ROLLUP_KEY)
+
+
+def child_attendance_contribution(status, day, child_id, count=1):
+    """What ``count`` attendance records add to ``{(child_id, month): {field: delta}}``."""
+    return {(child_id, day.replace(day=1)): {
+        'sessions_total': count,
+        'present_count': count if status == 'Present' else 0,
+    }}
+
+
+def contribution_for_child_rows(rows):
+    """Sum contributions of ``(status, date, child_id, count)`` rows."""
+    return sum_contributions(CHILD_ROLLUP_FIELDS, (child_attendance_contribution(*row) for row in rows))
+
+
+def child_contribution_for_attendance(attendance):
+    return child_attendance_contribution(attendance.status, attendance.session.date, attendance.child_id)
+
+
+def child_contribution_for_attendances(attendances):
+    """Per-child monthly contribution of an Attendance queryset, from one grouped query."""
+    return contribution_for_child_rows(attendances.values_list(
+        'status', TruncMonth('session__date'), 'child_id'
+    ).annotate(count=Count('id')).order_by())
+
+
+def apply_child_rollup_change(before, after):
+    """apply_rollup_change for the per-child monthly rollups."""
+    apply_counter_change(ChildAttendanceRollup, CHILD_ROLLUP_FIELDS, before, after, key_fields=CHILD_ROLLUP_KEY)
+
+
+def rebuild_participation_rollups():
+    """Recompute every rollup bucket from the attendance table."""
+    totals = contribution_for_attendances(Attendance.objects.all())
+    with transaction.atomic():
+        ParticipationRollup.objects.all().delete()
+        ParticipationRollup.objects.bulk_create([
+            ParticipationRollup(
+                period=period, period_start=start, coach_id=coach_id, location=location, gender=gender, **values
+            )
+            for (period, start, coach_id, location, gender), values in totals.items()
+        ], batch_size=1000)
+
+
+def rebuild_child_attendance_rollups():
+    """Recompute every child's monthly attendance rollups from the attendance table."""
+    totals = child_contribution_for_attendances(Attendance.objects.all())
+    with transaction.atomic():
+        ChildAttendanceRollup.objects.all().delete()
+        ChildAttendanceRollup.objects.bulk_create([
+            ChildAttendanceRollup(child_id=child_id, month=month, **values)
+            for (child_id, month), values in totals.items()
+        ], batch_size=1000)
+
+
+TREND_DIMENSIONS = {'coach': 'coach_id', 'location': 'location', 'gender': 'gender'}
+
+
+def participation_trend(period='MONTH', by=None, date_from=None, date_to=None):
+    """
+    Present/absent counts and participation rate per bucket (and per coach,
+    location or gender when ``by`` is given), read from the rollup table.
+    """
+    rollups = ParticipationRollup.objects.filter(period=period)
+    if date_from:
+        rollups = rollups.filter(period_start__gte=date_from)
+    if date_to:
+        rollups = rollups.filter(period_start__lte=date_to)
+
+    group = ['period_start'] + ([TREND_DIMENSIONS[by]] if by else [])
+    rows = rollups.values(*group).annotate(
+        present_count=Sum('present'), absent_count=Sum('absent')
+    ).order_by(*group)
+    trend = []
+    for row in rows:
+        total = row['present_count'] + row['absent_count']
+        row['participation_rate'] = round(row['present_count'] / total * 100, 2) if total else 0
+        trend.append(row)
+    return trend
+
+
+def _rate(present, total):
+    return round(present / total * 100, 2) if total else 0
+
+
+def child_attendance_stats(children, date_from=None, date_to=None):
+    """
+    Attendance totals and rate per child and for the whole ``children``
+    queryset (a coach's cohort, say), overall and per month, read from the
+    monthly child rollups in two grouped queries.
+    """
+    rollups = ChildAttendanceRollup.objects.filter(child__in=children)
+    if date_from:
+        rollups = rollups.filter(month__gte=date_from.replace(day=1))
+    if date_to:
+        rollups = rollups.filter(month__lte=date_to)
+
+    per_child = [
+        dict(row, attendance_rate=_rate(row['present_count'], row['sessions_total']))
+        for row in rollups.values('child_id').annotate(
+            sessions_total=Sum('sessions_total'), present_count=Sum('present_count')
+        ).order_by('child_id')
+    ]
+    months = [
+        dict(row, attendance_rate=_rate(row['present_count'], row['sessions_total']))
+        for row in rollups.values('month').annotate(
+            sessions_total=Sum('sessions_total'), present_count=Sum('present_count')
+        ).order_by('month')
+    ]
+    sessions_total = sum(row['sessions_total'] for row in per_child)
+    present_count = sum(row['present_count'] for row in per_child)
+    return {
+        'children': per_child,
+        'months': months,
+        'sessions_total': sessions_total,
+        'present_count': present_count,
+        'attendance_rate': _rate(present_count, sessions_total),
+    }
@@ -0,0 +1,113 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Attendance, ChildProfile, Session
+from .rollups import (
+    apply_child_rollup_change,
+    apply_rollup_change,
+    attendance_contribution,
+    child_attendance_contribution,
+    child_contribution_for_attendance,
+    child_contribution_for_attendances,
+    contribution_for_attendance,
+    contribution_for_attendances,
+)
+
+
+@receiver(pre_save, sender=Attendance)
+def copy_session_date(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.session_date, instance.session_time = instance.session.date, instance.session.time
+
+
+@receiver(post_save, sender=Session)
+def copy_session_date_to_attendance(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    Attendance.objects.filter(session_id=instance.pk).exclude(
+        session_date=instance.date, session_time=instance.time
+    ).update(session_date=instance.date, session_time=instance.time)
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    """Stash what the stored row contributed before this save overwrites it."""
+    instance._previous_contribution = instance._previous_child_contribution = {}
+    if raw or not instance.pk:
+        return
+    previous = Attendance.objects.filter(pk=instance.pk).values_list(
+        'status', 'session__date', 'session__assigned_coach_id', 'session__location', 'child__gender', 'child_id'
+    ).first()
+    if previous:
+        status, day, coach_id, location, gender, child_id = previous
+        instance._previous_contribution = attendance_contribution(status, day, coach_id, location, gender)
+        instance._previous_child_contribution = child_attendance_contribution(status, day, child_id)
+
+
+@receiver(post_save, sender=Attendance)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_previous_contribution', {})
+    after = contribution_for_attendance(instance)
+    if before != after:
+        apply_rollup_change(before, after)
+    instance._previous_contribution = after
+
+    before = getattr(instance, '_previous_child_contribution', {})
+    after = child_contribution_for_attendance(instance)
+    if before != after:
+        apply_child_rollup_change(before, after)
+    instance._previous_child_contribution = after
+
+
+@receiver(post_delete, sender=Attendance)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    apply_rollup_change(contribution_for_attendance(instance), {})
+    apply_child_rollup_change(child_contribution_for_attendance(instance), {})
+
+
+@receiver(post_delete, sender=Attendance)
+def touch_child_on_delete(sender, instance, **kwargs):
+    # A deleted row leaves nothing newer behind; the child's own
+    # updated_at tells the next dropout-risk scan to look at them again.
+    ChildProfile.objects.filter(pk=instance.child_id).update(updated_at=timezone.now())
+
+
+# Moving a session or correcting a child's gender moves all their
+# attendance to other buckets; a session moved to another month also
+# moves its children's monthly rollups.
+
+@receiver(pre_save, sender=Session)
+@receiver(pre_save, sender=ChildProfile)
+def remember_previous_buckets(sender, instance, raw=False, **kwargs):
+    instance._previous_buckets = instance._previous_months = {}
+    if raw or not instance.pk:
+        return
+    if sender is Session:
+        fields = ('date', 'location', 'assigned_coach_id')
+        attendances = Attendance.objects.filter(session_id=instance.pk)
+    else:
+        fields = ('gender',)
+        attendances = Attendance.objects.filter(child_id=instance.pk)
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if previous and any(previous[field] != getattr(instance, field) for field in fields):
+        instance._previous_buckets = contribution_for_attendances(attendances)
+        if sender is Session and previous['date'].replace(day=1) != instance.date.replace(day=1):
+            instance._previous_months = child_contribution_for_attendances(attendances)
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_save, sender=ChildProfile)
+def move_buckets_on_save(sender, instance, raw=False, **kwargs):
+    before = getattr(instance, '_previous_buckets', {})
+    if raw or not before:
+        return
+    lookup = {'session_id': instance.pk} if sender is Session else {'child_id': instance.pk}
+    attendances = Attendance.objects.filter(**lookup)
+    apply_rollup_change(before, contribution_for_attendances(attendances))
+    months = getattr(instance, '_previous_months', {})
+    if months:
+        apply_child_rollup_change(months, child_contribution_for_attendances(attendances))
+    instance._previous_buckets = instance._previous_months = {}
@@ -0,0 +1,548 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser
+from .models import (
+    Attendance, ChildAttendanceRollup, ChildProfile, CoachActivity, DropoutScan, HomeVisit, LSASAssessment,
+    ParticipationRollup, Session,
+)
+from .analytics import ScoreTable, lsas_trends
+from .dropout import assess_child, scan_dropout_risk
+from .reports import coach_workload
+from .rollups import rebuild_child_attendance_rollups, rebuild_participation_rollups
+
+
+class CoachWorkloadTests(TestCase):
+
+    def setUp(self):
+        self.coaches = [CustomUser.objects.create_user(username=f'coach{index}', role='COACH') for index in range(3)]
+        admin = CustomUser.objects.create_user(username='admin', role='ADMIN')
+        child = ChildProfile.objects.create(user=CustomUser.objects.create_user(username='kid', role='PLAYER'))
+
+        days = [date(2025, 1, 15), date(2025, 1, 31), date(2025, 2, 1), date(2025, 3, 10)]
+        # Coach 2 has nothing at all; the admin's rows are never counted.
+        for coach, count in ((self.coaches[0], 4), (self.coaches[1], 2), (admin, 3)):
+            for day in days[:count]:
+                Session.objects.create(date=day, time=time(16), location='Park', created_by=coach)
+                HomeVisit.objects.create(child=child, coach=coach, date=day)
+                CoachActivity.objects.create(coach=coach, date=day, duration_hours=Decimal('1.25'))
+        CoachActivity.objects.create(coach=self.coaches[1], date=days[1], duration_hours=Decimal('2.5'))
+
+    def expected(self, **dates):
+        """The per-coach ORM queries the report replaced."""
+        rows = []
+        for coach in CustomUser.objects.filter(role='COACH').order_by('id'):
+            activities = CoachActivity.objects.filter(coach=coach, **dates)
+            rows.append({
+                'coach_id': coach.id,
+                'coach_name': coach.username,
+                'sessions_count': Session.objects.filter(created_by=coach, **dates).count(),
+                'home_visits_count': HomeVisit.objects.filter(coach=coach, **dates).count(),
+                'activities_count': activities.count(),
+                'total_hours': float(activities.aggregate(total=Sum('duration_hours'))['total'] or 0),
+            })
+        return rows
+
+    def totals(self, workload):
+        return [{key: value for key, value in row.items() if key != 'months'} for row in workload]
+
+    def test_totals_match_the_orm(self):
+        with self.assertNumQueries(2):
+            workload = coach_workload()
+        self.assertEqual(self.totals(workload), self.expected())
+        self.assertEqual(workload[2]['months'], [])
+
+    def test_totals_match_the_orm_within_a_date_range(self):
+        date_from, date_to = date(2025, 1, 31), date(2025, 2, 28)
+        workload = coach_workload(date_from, date_to)
+        self.assertEqual(self.totals(workload), self.expected(date__gte=date_from, date__lte=date_to))
+
+    def test_monthly_breakdown_adds_up_to_the_totals(self):
+        for row in coach_workload():
+            for kind in ('sessions', 'home_visits', 'activities'):
+                self.assertEqual(sum(month[kind] for month in row['months']), row[f'{kind}_count'])
+            self.assertAlmostEqual(sum(month['hours'] for month in row['months']), row['total_hours'])
+        months = coach_workload()[1]['months']
+        self.assertEqual(
+            [(month['month'], month['sessions'], month['activities'], month['hours']) for month in months],
+            [('2025-01', 2, 3, 5.0)],
+        )
+
+
+class ParticipationRollupTests(APITestCase):
+
+    def setUp(self):
+        self.coaches = [CustomUser.objects.create_user(username=f'coach{index}', role='COACH') for index in range(2)]
+        self.children = [
+            ChildProfile.objects.create(
+                user=CustomUser.objects.create_user(username=f'kid{index}', role='PLAYER'), gender=gender
+            )
+            for index, gender in enumerate(['F', 'M', None])
+        ]
+        self.sessions = [
+            Session.objects.create(date=day, time=time(16), location=location,
+                                   created_by=self.coaches[0], assigned_coach=coach)
+            for day, location, coach in (
+                (date(2025, 1, 30), 'Park', self.coaches[0]),
+                (date(2025, 2, 3), 'Park', self.coaches[0]),
+                (date(2025, 2, 4), 'School', None),
+            )
+        ]
+        for session in self.sessions:
+            for index, child in enumerate(self.children):
+                Attendance.objects.create(child=child, session=session, status='Present' if index else 'Absent')
+
+    def rollups(self):
+        return {
+            (row.period, row.period_start, row.coach_id, row.location, row.gender): (row.present, row.absent)
+            for row in ParticipationRollup.objects.all()
+            if row.present or row.absent
+        }
+
+    def assertMatchesRebuild(self):
+        maintained = self.rollups()
+        rebuild_participation_rollups()
+        self.assertEqual(maintained, self.rollups())
+
+    def test_attendance_saves_and_deletes_move_single_counts(self):
+        self.assertEqual(self.rollups()[('MONTH', date(2025, 2, 1), self.coaches[0].pk, 'Park', 'F')], (0, 1))
+        attendance = Attendance.objects.get(child=self.children[0], session=self.sessions[1])
+        attendance.status = 'Present'
+        attendance.save()
+        self.assertEqual(self.rollups()[('MONTH', date(2025, 2, 1), self.coaches[0].pk, 'Park', 'F')], (1, 0))
+        Attendance.objects.get(child=self.children[2], session=self.sessions[2]).delete()
+        self.assertNotIn(('WEEK', date(2025, 2, 3), 0, 'School', ''), self.rollups())
+        self.assertMatchesRebuild()
+
+    def test_moving_a_session_moves_its_attendance(self):
+        session = self.sessions[0]
+        session.date, session.location, session.assigned_coach = date(2025, 2, 10), 'School', self.coaches[1]
+        session.save()
+        self.assertNotIn(('MONTH', date(2025, 1, 1), self.coaches[0].pk, 'Park', 'M'), self.rollups())
+        self.assertEqual(self.rollups()[('WEEK', date(2025, 2, 10), self.coaches[1].pk, 'School', 'M')], (1, 0))
+        self.assertMatchesRebuild()
+
+        child = self.children[2]
+        child.gender = 'F'
+        child.save()
+        self.assertMatchesRebuild()
+
+    def test_migration_backfills_existing_attendance(self):
+        expected = self.rollups()
+        ParticipationRollup.objects.all().delete()
+        import_module('coaching_app.migrations.0006_participationrollup').backfill_rollups(apps, None)
+        self.assertEqual(self.rollups(), expected)
+
+    def test_report(self):
+        self.client.force_authenticate(self.coaches[0])
+        url = '/api/coaching/reports/participation/'
+        report = self.client.get(url).data
+        self.assertEqual((report['present_count'], report['absent_count']), (6, 3))
+        self.assertEqual(
+            [(row['period_start'], row['participation_rate']) for row in report['trend']],
+            [(date(2025, 1, 1), 66.67), (date(2025, 2, 1), 66.67)],
+        )
+        trend = self.client.get(url, {'period': 'week', 'by': 'location', 'from': '2025-02-01'}).data['trend']
+        self.assertEqual(
+            [(row['period_start'], row['location'], row['present_count'], row['absent_count']) for row in trend],
+            [(date(2025, 2, 3), 'Park', 2, 1), (date(2025, 2, 3), 'School', 2, 1)],
+        )
+        self.assertEqual(self.client.get(url, {'by': 'colour'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': 'soon'}).status_code, 400)
+
+
+class MarkForSessionTests(APITestCase):
+
+    url = '/api/coaching/attendance/mark_for_session/'
+
+    def setUp(self):
+        self.coach = CustomUser.objects.create_user(username='coach', role='COACH')
+        self.children = [
+            ChildProfile.objects.create(
+                user=CustomUser.objects.create_user(username=f'kid{index}', role='PLAYER'), gender=gender
+            )
+            for index, gender in enumerate(['F', 'M', 'F'])
+        ]
+        self.session = Session.objects.create(
+            date=date(2025, 3, 3), time=time(16), location='Park', created_by=self.coach, assigned_coach=self.coach
+        )
+        Attendance.objects.create(child=self.children[0], session=self.session, status='Absent')
+        self.client.force_authenticate(self.coach)
+
+    def mark(self, *rows):
+        return self.client.post(self.url, {'session_id': self.session.pk, 'attendance': [
+            {'child_id': child_id, 'status': mark} for child_id, mark in rows
+        ]}, format='json')
+
+    def snapshot(self):
+        return (
+            sorted(ParticipationRollup.objects.exclude(present=0, absent=0).values_list(
+                'period', 'period_start', 'gender', 'present', 'absent')),
+            sorted(ChildAttendanceRollup.objects.exclude(sessions_total=0).values_list(
+                'child_id', 'month', 'sessions_total', 'present_count')),
+        )
+
+    def test_upsert_creates_and_updates_marks(self):
+        first, second, _ = self.children
+        response = self.mark((first.pk, 'Present'), (second.pk, 'Absent'), (second.pk, 'Present'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [
+            {'child_id': first.pk, 'status': 'Present', 'created': False},
+            {'child_id': second.pk, 'status': 'Present', 'created': True},
+        ])
+        self.assertEqual(
+            dict(Attendance.objects.filter(session=self.session).values_list('child_id', 'status')),
+            {first.pk: 'Present', second.pk: 'Present'},
+        )
+
+    def test_rollup_deltas_match_a_rebuild(self):
+        self.mark((self.children[0].pk, 'Present'), (self.children[1].pk, 'Absent'))
+        self.mark((self.children[1].pk, 'Present'), (self.children[2].pk, 'Absent'))
+        maintained = self.snapshot()
+        self.assertEqual(ParticipationRollup.objects.get(period='MONTH', gender='F').present, 1)
+        rebuild_participation_rollups()
+        rebuild_child_attendance_rollups()
+        self.assertEqual(self.snapshot(), maintained)
+
+    def test_large_sheet_takes_a_fixed_number_of_queries(self):
+        children = ChildProfile.objects.bulk_create([
+            ChildProfile(user=user, gender='MF'[index % 2])
+            for index, user in enumerate(CustomUser.objects.bulk_create([
+                CustomUser(username=f'sheet{index}', role='PLAYER') for index in range(600)
+            ]))
+        ])
+        self.mark(*((child.pk, 'Absent') for child in children[:300]))
+        # 300 marks change and 300 are new: batched INSERTs and one rollup
+        # UPDATE per 250 keys, instead of a few queries per child.
+        with self.assertNumQueries(24):
+            response = self.mark(*((child.pk, 'Present') for child in children))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ChildAttendanceRollup.objects.get(child=children[0]).present_count, 1)
+        maintained = self.snapshot()
+        rebuild_participation_rollups()
+        rebuild_child_attendance_rollups()
+        self.assertEqual(self.snapshot(), maintained)
+
+    def test_one_bad_row_rejects_the_whole_sheet(self):
+        before = self.snapshot()
+        response = self.mark((self.children[0].pk, 'Present'), (self.children[1].pk, 'Late'), (999999, 'Present'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3])
+        self.assertEqual(Attendance.objects.get(child=self.children[0]).status, 'Absent')
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertEqual(self.snapshot(), before)
+
+
+class UnifiedHistoryTests(APITestCase):
+
+    def setUp(self):
+        self.coach = CustomUser.objects.create_user(username='coach', role='COACH')
+        self.child = ChildProfile.objects.create(
+            user=CustomUser.objects.create_user(username='kid', role='PLAYER'), assigned_coach=self.coach
+        )
+        self.url = f'/api/coaching/children/{self.child.pk}/unified_history/'
+        self.client.force_authenticate(self.coach)
+
+        # Several entries of every kind on the same days, and sessions at the same time.
+        for day in (date(2025, 4, 1), date(2025, 4, 8)):
+            for hour in (10, 16, 16):
+                session = Session.objects.create(
+                    date=day, time=time(hour), location='Park', created_by=self.coach, assigned_coach=self.coach
+                )
+                Attendance.objects.create(child=self.child, session=session, status='Present')
+            for _ in range(2):
+                HomeVisit.objects.create(child=self.child, coach=self.coach, date=day)
+                LSASAssessment.objects.create(child=self.child, date=day, score=40)
+        HomeVisit.objects.create(child=self.child, coach=self.coach, date=date(2025, 4, 5))
+
+    def expected(self):
+        entries = [
+            ((session.date, 2, session.time, session.pk), ('session', session.pk))
+            for session in Session.objects.filter(attendances__child=self.child)
+        ] + [
+            ((visit.date, 1, time(0), visit.pk), ('home_visit', visit.pk))
+            for visit in HomeVisit.objects.filter(child=self.child)
+        ] + [
+            ((assessment.date, 0, time(0), assessment.pk), ('assessment', assessment.pk))
+            for assessment in LSASAssessment.objects.filter(child=self.child)
+        ]
+        return [entry for _, entry in sorted(entries, reverse=True)]
+
+    def walk(self, page_size):
+        seen, url, params = [], self.url, {'page_size': page_size}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), page_size)
+            seen += [(item['type'], item['id']) for item in response.data['results']]
+            url, params = response.data['next'], None
+        return seen
+
+    def test_pages_follow_on_across_the_three_streams(self):
+        expected = self.expected()
+        self.assertEqual(len(expected), 15)
+        for page_size in (1, 2, 3, 5, 15, 50):
+            self.assertEqual(self.walk(page_size), expected)
+
+    def test_moved_session_moves_in_the_timeline(self):
+        session = Session.objects.filter(attendances__child=self.child).order_by('date', 'time', 'id').first()
+        session.date = date(2025, 5, 1)
+        session.save()
+        attendance = Attendance.objects.get(session=session)
+        self.assertEqual(attendance.session_date, date(2025, 5, 1))
+        self.assertEqual(self.walk(4)[0], ('session', session.pk))
+        self.assertEqual(self.walk(4), self.expected())
+
+
+class ChildAttendanceRollupTests(APITestCase):
+
+    def setUp(self):
+        self.coach = CustomUser.objects.create_user(username='coach', role='COACH')
+        other_coach = CustomUser.objects.create_user(username='other', role='COACH')
+        self.children = [
+            ChildProfile.objects.create(
+                user=CustomUser.objects.create_user(username=f'kid{index}', role='PLAYER'), assigned_coach=coach
+            )
+            for index, coach in enumerate([self.coach, self.coach, other_coach])
+        ]
+        self.sessions = [
+            Session.objects.create(date=day, time=time(16), location='Park', created_by=self.coach)
+            for day in (date(2025, 1, 20), date(2025, 1, 27), date(2025, 2, 3))
+        ]
+        for session in self.sessions:
+            for index, child in enumerate(self.children):
+                Attendance.objects.create(
+                    child=child, session=session, status='Present' if (index + session.date.day) % 2 else 'Absent'
+                )
+
+    def rollups(self):
+        return {
+            (row.child_id, row.month): (row.sessions_total, row.present_count)
+            for row in ChildAttendanceRollup.objects.exclude(sessions_total=0)
+        }
+
+    def assertMatchesRebuild(self):
+        maintained = self.rollups()
+        call_command('rebuild_child_attendance_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), maintained)
+
+    def test_saves_and_deletes_keep_the_months_exact(self):
+        child = self.children[0]
+        self.assertEqual(self.rollups()[(child.pk, date(2025, 1, 1))], (2, 1))
+        attendance = Attendance.objects.get(child=child, session=self.sessions[0])
+        attendance.status = 'Present'
+        attendance.save()
+        self.assertEqual(self.rollups()[(child.pk, date(2025, 1, 1))], (2, 2))
+        Attendance.objects.get(child=child, session=self.sessions[2]).delete()
+        self.assertNotIn((child.pk, date(2025, 2, 1)), self.rollups())
+        self.assertMatchesRebuild()
+
+    def test_session_moved_to_another_month_moves_its_attendance(self):
+        session = self.sessions[1]
+        session.date = date(2025, 3, 3)
+        session.save()
+        self.assertEqual(self.rollups()[(self.children[0].pk, date(2025, 1, 1))][0], 1)
+        self.assertEqual(self.rollups()[(self.children[0].pk, date(2025, 3, 1))][0], 1)
+        self.assertMatchesRebuild()
+
+    def test_backfill_command_rebuilds_from_attendance(self):
+        expected = self.rollups()
+        ChildAttendanceRollup.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_child_attendance_rollups', stdout=out)
+        self.assertEqual(self.rollups(), expected)
+        self.assertIn('Rebuilt', out.getvalue())
+
+    def test_attendance_stats(self):
+        url = '/api/coaching/children/attendance_stats/'
+        self.client.force_authenticate(self.coach)
+        stats = self.client.get(url).data
+        # Only this coach's two children.
+        self.assertEqual([row['child_id'] for row in stats['children']], [self.children[0].pk, self.children[1].pk])
+        self.assertEqual((stats['sessions_total'], stats['present_count'], stats['attendance_rate']), (6, 3, 50.0))
+        self.assertEqual(
+            [(row['month'], row['sessions_total'], row['present_count']) for row in stats['months']],
+            [(date(2025, 1, 1), 4, 2), (date(2025, 2, 1), 2, 1)],
+        )
+
+        stats = self.client.get(url, {'child': self.children[1].pk, 'from': '2025-02-01'}).data
+        self.assertEqual(stats['children'], [
+            {'child_id': self.children[1].pk, 'sessions_total': 1, 'present_count': 0, 'attendance_rate': 0}
+        ])
+        self.assertEqual(self.client.get(url, {'child': self.children[2].pk}).data['sessions_total'], 0)
+        self.assertEqual(self.client.get(url, {'child': 'x'}).status_code, 400)
+        response = self.client.get(url, {'to': '2025-02-30'})
+        self.assertEqual((response.status_code, list(response.data)), (400, ['to']))
+
+
+class LSASTrendTests(APITestCase):
+
+    def setUp(self):
+        self.coaches = [CustomUser.objects.create_user(username=f'coach{index}', role='COACH') for index in range(2)]
+        self.children = [
+            ChildProfile.objects.create(
+                user=CustomUser.objects.create_user(username=f'kid{index}', role='PLAYER'),
+                assigned_coach=coach, gender=gender, date_of_birth=born,
+            )
+            for index, (coach, gender, born) in enumerate([
+                (self.coaches[0], 'F', date(2014, 6, 1)),
+                (self.coaches[0], 'M', date(2011, 1, 1)),
+                (self.coaches[1], None, None),
+            ])
+        ]
+        for child, scores in zip(self.children, ([40, 50, 60], [70, 55], [30])):
+            for month, score in enumerate(scores):
+                LSASAssessment.objects.create(child=child, date=date(2025, 1 + month, 1), score=score)
+        for day, location in ((date(2025, 2, 10), 'School'), (date(2025, 3, 10), 'Park')):
+            session = Session.objects.create(date=day, time=time(16), location=location, created_by=self.coaches[0])
+            for child in self.children[:2]:
+                Attendance.objects.create(child=child, session=session, status='Present')
+
+    def test_delta_and_slope(self):
+        table = ScoreTable([(1, date(2025, 1, 1), 40), (1, date(2025, 1, 31), 50), (1, date(2025, 3, 2), 60),
+                            (2, date(2025, 1, 1), 30)])
+        first, single = table.trends()
+        self.assertEqual((first['assessments'], first['delta'], first['slope_per_30_days']), (3, 20, 10.0))
+        self.assertEqual((first['first_score'], first['latest_score'], first['latest_date']), (40, 60, date(2025, 3, 2)))
+        self.assertEqual((single['delta'], single['slope_per_30_days']), (0, 0.0))
+
+    def test_cohort_buckets(self):
+        with self.assertNumQueries(3):
+            report = lsas_trends(LSASAssessment.objects.all())
+        self.assertEqual(report['overall']['children'], 3)
+        self.assertEqual((report['overall']['improved'], report['overall']['declined']), (1, 1))
+        by_child = {trend['child_id']: trend for trend in report['children']}
+        self.assertEqual(
+            [(by_child[child.pk]['location'], by_child[child.pk]['age_band']) for child in self.children],
+            [('Park', '10-12'), ('Park', '13-15'), ('', '')],
+        )
+        self.assertEqual(
+            [(row['coach'], row['children'], row['mean_delta']) for row in report['cohorts']['coach']],
+            [(self.coaches[0].pk, 2, 2.5), (self.coaches[1].pk, 1, 0)],
+        )
+        self.assertEqual([row['gender'] for row in report['cohorts']['gender']], ['', 'F', 'M'])
+
+    def test_coaches_only_see_their_own_children(self):
+        self.client.force_authenticate(self.coaches[0])
+        other_child = self.children[2]
+        response = self.client.get('/api/coaching/lsas-assessments/by_child/', {'child_id': other_child.pk})
+        self.assertEqual(response.data, [])
+        response = self.client.get('/api/coaching/lsas-assessments/by_child/', {'child_id': self.children[0].pk})
+        self.assertEqual(len(response.data), 3)
+
+        trends = self.client.get('/api/coaching/lsas-assessments/trends/').data
+        self.assertEqual({trend['child_id'] for trend in trends['children']}, {self.children[0].pk, self.children[1].pk})
+        trends = self.client.get('/api/coaching/lsas-assessments/trends/', {'child_id': other_child.pk}).data
+        self.assertEqual((trends['overall'], trends['children']), (None, []))
+
+
+class DropoutRiskTests(APITestCase):
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(username='admin', role='ADMIN')
+        self.coaches = [CustomUser.objects.create_user(username=f'coach{index}', role='COACH') for index in range(2)]
+        self.children = [
+            ChildProfile.objects.create(
+                user=CustomUser.objects.create_user(username=f'kid{index}', role='PLAYER'), assigned_coach=coach
+            )
+            for index, coach in enumerate([self.coaches[0], self.coaches[0], self.coaches[1]])
+        ]
+        self.sessions = [
+            Session.objects.create(date=date(2025, 5, day), time=time(16), location='Park', created_by=self.admin)
+            for day in range(1, 6)
+        ]
+        # Child 0 misses the last three sessions, child 1 attends all, child 2 misses the last two.
+        for session_index, session in enumerate(self.sessions):
+            for child, missed_from in zip(self.children, (2, 5, 3)):
+                Attendance.objects.create(
+                    child=child, session=session, status='Absent' if session_index >= missed_from else 'Present'
+                )
+
+    def risk(self, child):
+        child.refresh_from_db()
+        return child.participation_history.get('dropout_risk')
+
+    def age_everything(self, scan):
+        """Move the scan and every row it read an hour back, clear of SCAN_OVERLAP."""
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (Attendance, Session, ChildProfile):
+            model.objects.update(updated_at=an_hour_ago)
+        DropoutScan.objects.filter(pk=scan.pk).update(started_at=an_hour_ago + timedelta(minutes=30))
+
+    def test_assess_child(self):
+        days = [date(2025, 1, day) for day in range(1, 13)]
+        marks = ['Present'] * 6 + ['Present', 'Absent', 'Present', 'Absent', 'Absent', 'Absent']
+        result = assess_child(zip(days, marks), absences=3, window=6, drop=25)
+        self.assertEqual(result['reasons'], ['consecutive_absences', 'falling_attendance'])
+        self.assertEqual((result['recent_rate'], result['previous_rate']), (33.33, 100.0))
+        self.assertEqual(result['last_session'], '2025-01-12')
+
+        short = assess_child(zip(days[:4], ['Absent', 'Absent', 'Present', 'Absent']), absences=3, window=6)
+        self.assertEqual((short['flagged'], short['consecutive_absences'], short['previous_rate']), (False, 1, None))
+        self.assertFalse(assess_child([])['flagged'])
+
+    def test_incremental_scan_only_rechecks_changed_children(self):
+        first = scan_dropout_risk()
+        self.assertEqual((first.full, first.children_scanned, first.children_flagged), (True, 3, 1))
+        self.assertTrue(self.risk(self.children[0])['flagged'])
+        self.age_everything(first)
+
+        attendance = Attendance.objects.get(child=self.children[2], session=self.sessions[4])
+        attendance.status = 'Absent'
+        attendance.save()
+        Attendance.objects.filter(child=self.children[0], session=self.sessions[4]).delete()
+        second = scan_dropout_risk()
+        # Child 1 did not change; child 0 lost a row, so only two absences are left.
+        self.assertEqual((second.full, second.children_scanned, second.children_flagged), (False, 2, 0))
+        self.assertFalse(self.risk(self.children[0])['flagged'])
+
+    def test_child_without_attendance_loses_the_flag(self):
+        scan_dropout_risk()
+        Attendance.objects.filter(child=self.children[0]).delete()
+        scan_dropout_risk()
+        self.assertFalse(self.risk(self.children[0])['flagged'])
+
+    def test_new_thresholds_force_a_full_scan(self):
+        scan_dropout_risk()
+        self.assertFalse(scan_dropout_risk().full)
+        scan = scan_dropout_risk(absences=2)
+        self.assertEqual((scan.full, scan.absences, scan.children_scanned, scan.children_flagged), (True, 2, 3, 2))
+        self.assertFalse(scan_dropout_risk(absences=2).full)
+
+    def test_other_history_is_kept(self):
+        child = self.children[0]
+        child.participation_history = {'transfers': ['from Ground 2']}
+        child.save()
+        scan_dropout_risk()
+        child.refresh_from_db()
+        self.assertEqual(child.participation_history['transfers'], ['from Ground 2'])
+        self.assertTrue(child.participation_history['dropout_risk']['flagged'])
+
+    def test_view(self):
+        url = '/api/coaching/reports/dropout-risk/'
+        self.client.force_authenticate(self.coaches[0])
+        self.assertEqual(self.client.post(url, {}, format='json').status_code, 403)
+
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.post(url, {'full': 'maybe'}, format='json').status_code, 400)
+        self.assertTrue(self.client.post(url, {'full': 'false'}, format='json').data['full'])  # first scan
+        response = self.client.post(url, {'full': 'false'})
+        self.assertEqual((response.status_code, response.data['full']), (200, False))
+        self.assertTrue(self.client.post(url, {'full': True}, format='json').data['full'])
+        self.assertEqual(DropoutScan.objects.count(), 3)
+
+        self.client.force_authenticate(self.coaches[1])
+        data = self.client.get(url).data
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['last_scan']['children_scanned'], 3)
+        self.client.force_authenticate(self.coaches[0])
+        self.assertEqual([child['id'] for child in self.client.get(url).data['results']], [self.children[0].pk])
@@ -0,0 +1,83 @@
+import heapq
+from datetime import date, time
+
+from django.db.models import Q
+
+from .models import Attendance, HomeVisit, LSASAssessment
+
+
+# Same-day entries are ordered by kind, then time, then id (newest first).
+KINDS = {'session': 2, 'home_visit': 1, 'assessment': 0}
+NO_TIME = time(0)
+
+
+def _after(kind, cursor, date_field, time_field, id_field):
+    """Rows of one ``kind`` that come after ``cursor`` in the newest-first timeline."""
+    last_date, last_kind, last_time, last_id = cursor
+    if KINDS[kind] < last_kind:
+        same_day = Q()
+    elif KINDS[kind] > last_kind:
+        same_day = Q(pk__in=[])
+    elif time_field:
+        same_day = Q(**{f'{time_field}__lt': last_time}) | Q(**{time_field: last_time, f'{id_field}__lt': last_id})
+    else:
+        same_day = Q(**{f'{id_field}__lt': last_id})
+    return Q(**{f'{date_field}__lt': last_date}) | (Q(**{date_field: last_date}) & same_day)
+
+
+def _sessions(child, cursor, limit):
+    attendances = Attendance.objects.filter(child=child).select_related('session')
+    # Sorted on the copied session date/time: attendance_child_date_idx, no join.
+    if cursor:
+        attendances = attendances.filter(_after('session', cursor, 'session_date', 'session_time', 'session_id'))
+    for attendance in attendances.order_by('-session_date', '-session_time', '-session_id')[:limit]:
+        session = attendance.session
+        yield (session.date, KINDS['session'], session.time, session.pk), {
+            'type': 'session', 'id': session.pk, 'date': session.date, 'time': session.time,
+            'location': session.location, 'status': session.status,
+            'attendance': attendance.status, 'coach': session.assigned_coach_id,
+        }
+
+
+def _home_visits(child, cursor, limit):
+    visits = HomeVisit.objects.filter(child=child)
+    if cursor:
+        visits = visits.filter(_after('home_visit', cursor, 'date', None, 'id'))
+    for visit in visits.order_by('-date', '-id')[:limit]:
+        yield (visit.date, KINDS['home_visit'], NO_TIME, visit.pk), {
+            'type': 'home_visit', 'id': visit.pk, 'date': visit.date,
+            'notes': visit.notes, 'coach': visit.coach_id,
+        }
+
+
+def _assessments(child, cursor, limit):
+    assessments = LSASAssessment.objects.filter(child=child)
+    if cursor:
+        assessments = assessments.filter(_after('assessment', cursor, 'date', None, 'id'))
+    for assessment in assessments.order_by('-date', '-id')[:limit]:
+        yield (assessment.date, KINDS['assessment'], NO_TIME, assessment.pk), {
+            'type': 'assessment', 'id': assessment.pk, 'date': assessment.date,
+            'score': assessment.score, 'remarks': assessment.remarks,
+        }
+
+
+def parse_cursor(values):
+    """Turn a decoded cursor back into a timeline key; raises ValueError if it is not one."""
+    last_date, last_kind, last_time, last_id = values
+    return date.fromisoformat(last_date), int(last_kind), time.fromisoformat(last_time), int(last_id)
+
+
+def child_timeline(child, limit, cursor=None):
+    """
+    One page of a child's sessions, home visits and LSAS assessments,
+    newest first. Each stream is read with its own indexed LIMIT query and
+    the three are k-way merged, so a page costs the same however long the
+    history is. Returns ``(items, next_key)``; ``next_key`` is None on the
+    last page.
+    """
+    streams = [stream(child, cursor, limit + 1) for stream in (_sessions, _home_visits, _assessments)]
+    merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+    page = [entry for _, entry in zip(range(limit + 1), merged)]
+    if len(page) > limit:
+        return [item for _, item in page[:limit]], page[limit - 1][0]
+    return [item for _, item in page], None
@@ -11,6 +11,7 @@ from .views import (
     ParticipationReportView,
     GenderDistributionView,
     CoachWorkloadView,
+    DropoutRiskView,
     MyCoachingProfileView
 )
 
@@ -29,5 +30,6 @@ urlpatterns = [
     path('reports/participation/', ParticipationReportView.as_view(), name='participation-report'),
     path('reports/gender/', GenderDistributionView.as_view(), name='gender-distribution'),
     path('reports/workload/', CoachWorkloadView.as_view(), name='coach-workload'),
+    path('reports/dropout-risk/', DropoutRiskView.as_view(), name='dropout-risk'),
     path('my-profile/', MyCoachingProfileView.as_view(), name='my-coaching-profile'),
 ]
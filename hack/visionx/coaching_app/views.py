@@ -1,11 +1,28 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.fields import BooleanField
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.permissions import IsAuthenticated
+from django.db import connection, transaction
 from django.db.models import Count, Q, Sum, Avg
 from django.utils import timezone
 from datetime import datetime, timedelta
-from .models import ChildProfile, Session, Attendance, HomeVisit, LSASAssessment, CoachActivity
+from .models import ChildProfile, Session, Attendance, HomeVisit, LSASAssessment, CoachActivity, ParticipationRollup, DropoutScan
+from .analytics import lsas_trends
+from .dropout import DEFAULT_ABSENCES, DEFAULT_DROP, DEFAULT_WINDOW, scan_dropout_risk
+from .reports import coach_workload
+from .timeline import child_timeline, parse_cursor
+from .rollups import (
+    TREND_DIMENSIONS,
+    apply_child_rollup_change,
+    apply_rollup_change,
+    child_attendance_stats,
+    contribution_for_child_rows,
+    contribution_for_rows,
+    participation_trend,
+)
 from .serializers import (
     ChildProfileSerializer,
     SessionSerializer,
@@ -16,8 +33,24 @@ from .serializers import (
     UserSerializer
 )
 from rest_framework.views import APIView # Make sure this is imported
+from django.contrib.auth import get_user_model
+from visionx.pagination import KeysetPagination
+
+User = get_user_model()
+
 
 
+def parse_date_range(request):
+    """(date_from, date_to) from the optional ``?from=`` / ``?to=`` (YYYY-MM-DD) query parameters."""
+    dates = []
+    for name in ('from', 'to'):
+        value = request.query_params.get(name)
+        try:
+            dates.append(datetime.strptime(value, '%Y-%m-%d').date() if value else None)
+        except ValueError:
+            raise ValidationError({name: 'Enter a date as YYYY-MM-DD.'})
+    return tuple(dates)
+
 
 class ChildProfileViewSet(viewsets.ModelViewSet):
     """
@@ -27,6 +60,7 @@ class ChildProfileViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ChildProfileSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     # --- THIS IS THE NEW FUNCTION ---
     def get_queryset(self):
@@ -44,8 +78,38 @@ class ChildProfileViewSet(viewsets.ModelViewSet):
         return ChildProfile.objects.none()
     @action(detail=True, methods=['get'])
     def unified_history(self, request, pk=None):
-        """Get unified history for a child (sessions, home visits, LSAS assessments)"""
+        """
+        Get unified history for a child (sessions, home visits, LSAS assessments).
+
+        With ``page_size`` or ``cursor`` this is one merged, newest-first
+        timeline, a page at a time; coaches are listed once under
+        ``coaches`` and referenced by id. Without them the three full
+        lists are returned as before.
+        """
         child = self.get_object()
+        paginator = KeysetPagination()
+        params = request.query_params
+        if paginator.cursor_query_param in params or paginator.page_size_query_param in params:
+            cursor = None
+            if params.get(paginator.cursor_query_param):
+                try:
+                    cursor = parse_cursor(paginator.decode_cursor(params[paginator.cursor_query_param]))
+                except (TypeError, ValueError):
+                    raise NotFound(paginator.invalid_cursor_message)
+
+            items, next_key = child_timeline(child, paginator.get_page_size(request), cursor)
+            coach_ids = {item['coach'] for item in items if item.get('coach')}
+            next_link = None
+            if next_key:
+                next_link = replace_query_param(
+                    request.build_absolute_uri(), paginator.cursor_query_param, paginator.encode_cursor(next_key)
+                )
+            return Response({
+                'child': ChildProfileSerializer(child).data,
+                'coaches': UserSerializer(User.objects.filter(id__in=coach_ids).order_by('id'), many=True).data,
+                'next': next_link,
+                'results': items,
+            })
         
         sessions = Session.objects.filter(
             attendances__child=child
@@ -62,6 +126,25 @@ class ChildProfileViewSet(viewsets.ModelViewSet):
         })
 
 
+    @action(detail=False, methods=['get'])
+    def attendance_stats(self, request):
+        """
+        Attendance totals and rate for each visible child and for the cohort
+        as a whole, overall and per month, from the monthly child rollups.
+        ``child`` narrows to one child; ``from`` / ``to`` (YYYY-MM-DD)
+        limit the months.
+        """
+        date_from, date_to = parse_date_range(request)
+
+        children = self.get_queryset()
+        child = request.query_params.get('child')
+        if child:
+            if not child.isdigit():
+                return Response({'error': 'child must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
+            children = children.filter(id=child)
+        return Response(child_attendance_stats(children.order_by().values('id'), date_from, date_to))
+
+
 class SessionViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing sessions.
@@ -69,6 +152,7 @@ class SessionViewSet(viewsets.ModelViewSet):
     """
     serializer_class = SessionSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date', '-time', 'id')
 
     def get_queryset(self):
         user = self.request.user
@@ -116,6 +200,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     """
     serializer_class = AttendanceSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-id',)
     
     def get_queryset(self):
         user = self.request.user
@@ -138,15 +223,24 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        attendance.status = new_status
-        attendance.save()
+        # The rollups are updated by the save signals; keep them in one transaction.
+        with transaction.atomic():
+            attendance.status = new_status
+            attendance.save()
         
         serializer = self.get_serializer(attendance)
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'])
     def mark_for_session(self, request):
-        """Mark attendance for multiple children in a session"""
+        """
+        Mark attendance for multiple children in a session.
+
+        The whole sheet is validated first and then written in one
+        transaction: the session and the children's current marks are read
+        under a row lock, then one bulk upsert on (child, session). Nothing
+        is saved if any row is invalid.
+        """
         session_id = request.data.get('session_id')
         attendance_data = request.data.get('attendance', [])
         
@@ -155,40 +249,88 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 {'error': 'session_id is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if not isinstance(attendance_data, list):
+            return Response(
+                {'error': 'attendance must be a list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         try:
             session = Session.objects.get(id=session_id)
-        except Session.DoesNotExist:
+        except (Session.DoesNotExist, ValueError, TypeError):
             return Response(
                 {'error': 'Session not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        results = []
-        for item in attendance_data:
-            child_id = item.get('child_id')
-            status_value = item.get('status', 'Absent')
-            
+        # Later rows for the same child win, as they did when saved one by one.
+        marks, rows, errors = {}, {}, []
+        for row, item in enumerate(attendance_data, start=1):
+            child_id = item.get('child_id') if isinstance(item, dict) else None
+            status_value = item.get('status', 'Absent') if isinstance(item, dict) else None
             if not child_id:
                 continue
-            
-            attendance, created = Attendance.objects.get_or_create(
-                session=session,
-                child_id=child_id,
-                defaults={'status': status_value}
+            try:
+                child_id = int(child_id)
+            except (TypeError, ValueError):
+                errors.append({'row': row, 'child_id': child_id, 'error': 'child_id must be a number'})
+                continue
+            if status_value not in ('Present', 'Absent'):
+                errors.append({'row': row, 'child_id': child_id, 'error': 'Status must be either "Present" or "Absent"'})
+                continue
+            marks[child_id] = status_value
+            rows[child_id] = row
+
+        genders = dict(ChildProfile.objects.filter(id__in=marks).values_list('id', 'gender'))
+        errors += [
+            {'row': rows[child_id], 'child_id': child_id, 'error': 'Child not found'}
+            for child_id in marks if child_id not in genders
+        ]
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # Lock the session, then read the marks being replaced: a
+            # concurrent sheet for the same session waits here, so the
+            # rollup deltas below start from what is really stored.
+            session = Session.objects.select_for_update().get(pk=session.pk)
+            current = dict(
+                Attendance.objects.select_for_update().filter(session=session, child_id__in=marks)
+                .values_list('child_id', 'status')
+            )
+
+            # bulk_create skips the model signals, so the rollups move here.
+            rollup_row = (session.date, session.assigned_coach_id, session.location)
+            before = contribution_for_rows(
+                (current[child_id], *rollup_row, genders[child_id], 1) for child_id in current
+            )
+            after = contribution_for_rows(
+                (mark, *rollup_row, genders[child_id], 1) for child_id, mark in marks.items()
+            )
+            months_before = contribution_for_child_rows(
+                (current[child_id], session.date, child_id, 1) for child_id in current
+            )
+            months_after = contribution_for_child_rows(
+                (mark, session.date, child_id, 1) for child_id, mark in marks.items()
             )
-            
-            if not created:
-                attendance.status = status_value
-                attendance.save()
-            
-            results.append({
-                'child_id': child_id,
-                'status': attendance.status,
-                'created': created
-            })
-        
-        return Response({'results': results})
+
+            Attendance.objects.bulk_create(
+                [Attendance(session=session, child_id=child_id, status=mark,
+                            session_date=session.date, session_time=session.time)
+                 for child_id, mark in marks.items()],
+                update_conflicts=True,
+                update_fields=['status', 'session_date', 'session_time', 'updated_at'],
+                # MySQL upserts on any unique key and refuses an explicit target.
+                unique_fields=['child', 'session'] if connection.features.supports_update_conflicts_with_target else None,
+                batch_size=500,
+            )
+            apply_rollup_change(before, after)
+            apply_child_rollup_change(months_before, months_after)
+
+        return Response({'results': [
+            {'child_id': child_id, 'status': mark, 'created': child_id not in current}
+            for child_id, mark in marks.items()
+        ]})
 
 
 class HomeVisitViewSet(viewsets.ModelViewSet):
@@ -198,6 +340,7 @@ class HomeVisitViewSet(viewsets.ModelViewSet):
     """
     serializer_class = HomeVisitSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date', '-id')
 
     def get_queryset(self):
         user = self.request.user
@@ -221,6 +364,7 @@ class LSASAssessmentViewSet(viewsets.ModelViewSet):
     """
     serializer_class = LSASAssessmentSerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date', '-id')
 
     def get_queryset(self):
         user = self.request.user
@@ -246,13 +390,36 @@ class LSASAssessmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        assessments = LSASAssessment.objects.filter(
+        # Same scoping as the list: coaches only see their assigned children.
+        assessments = self.get_queryset().filter(
             child_id=child_id
         ).order_by('-date')
         
         serializer = self.get_serializer(assessments, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def trends(self, request):
+        """
+        LSAS score trends of the visible assessments: per child the score
+        delta and slope over time, and their distribution overall and per
+        coach, location, gender and age band. ``child_id`` narrows to one
+        child; ``from`` / ``to`` (YYYY-MM-DD) limit the assessment dates.
+        """
+        date_from, date_to = parse_date_range(request)
+
+        assessments = self.get_queryset()
+        child_id = request.query_params.get('child_id')
+        if child_id:
+            if not child_id.isdigit():
+                return Response({'error': 'child_id must be a number.'}, status=status.HTTP_400_BAD_REQUEST)
+            assessments = assessments.filter(child_id=child_id)
+        if date_from:
+            assessments = assessments.filter(date__gte=date_from)
+        if date_to:
+            assessments = assessments.filter(date__lte=date_to)
+        return Response(lsas_trends(assessments))
+
 
 class CoachActivityViewSet(viewsets.ModelViewSet):
     """
@@ -261,6 +428,7 @@ class CoachActivityViewSet(viewsets.ModelViewSet):
     """
     serializer_class = CoachActivitySerializer
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-date', '-id')
 
     def get_queryset(self):
         user = self.request.user
@@ -313,17 +481,34 @@ class CoachDashboardView(APIView):
         })
     
 class ParticipationReportView(APIView):
-    """Participation report - overall participation statistics"""
+    """
+    Participation report: overall totals plus a participation-rate trend
+    per ``period`` ("week" or "month", the default), optionally split
+    ``by`` coach, location or gender and limited with ``from`` / ``to``
+    (YYYY-MM-DD). Everything is read from the participation rollups.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        period = request.query_params.get('period', 'month').upper()
+        by = request.query_params.get('by') or None
+        if period not in ('WEEK', 'MONTH') or (by and by not in TREND_DIMENSIONS):
+            return Response(
+                {'error': 'period must be week or month; by must be coach, location or gender.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        date_from, date_to = parse_date_range(request)
+
         # Get total children
         total_children = ChildProfile.objects.count()
-        
-        # Get attendance statistics
-        total_attendance_records = Attendance.objects.count()
-        present_count = Attendance.objects.filter(status='Present').count()
-        absent_count = Attendance.objects.filter(status='Absent').count()
+
+        # Every attendance record sits in exactly one monthly bucket.
+        totals = ParticipationRollup.objects.filter(period='MONTH').aggregate(
+            present=Sum('present'), absent=Sum('absent')
+        )
+        present_count = totals['present'] or 0
+        absent_count = totals['absent'] or 0
+        total_attendance_records = present_count + absent_count
         
         # Calculate participation rate
         participation_rate = 0
@@ -336,6 +521,7 @@ class ParticipationReportView(APIView):
             'present_count': present_count,
             'absent_count': absent_count,
             'participation_rate': round(participation_rate, 2),
+            'trend': participation_trend(period, by, date_from, date_to),
         })
 
 
@@ -360,37 +546,79 @@ class GenderDistributionView(APIView):
 
 
 class CoachWorkloadView(APIView):
-    """Coach workload distribution"""
+    """
+    Coach workload distribution: sessions created, home visits, activities
+    and activity hours per coach, with a per-month breakdown. Optional
+    ``from`` / ``to`` (YYYY-MM-DD) limit the date range.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # Get workload by coach (sessions created, home visits, activities)
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        
-        coaches = User.objects.filter(role='COACH')
-        
-        workload_data = []
-        for coach in coaches:
-            sessions_count = Session.objects.filter(created_by=coach).count()
-            home_visits_count = HomeVisit.objects.filter(coach=coach).count()
-            activities_count = CoachActivity.objects.filter(coach=coach).count()
-            total_hours = CoachActivity.objects.filter(coach=coach).aggregate(
-                total=Sum('duration_hours')
-            )['total'] or 0
-            
-            workload_data.append({
-                'coach_id': coach.id,
-                'coach_name': coach.username,
-                'sessions_count': sessions_count,
-                'home_visits_count': home_visits_count,
-                'activities_count': activities_count,
-                'total_hours': float(total_hours),
-            })
-        
+        date_from, date_to = parse_date_range(request)
+
+        return Response({
+            'workload': coach_workload(date_from, date_to),
+        })
+
+
+class DropoutRiskView(APIView):
+    """
+    Children flagged by the dropout-risk scan (coaches see their assigned
+    children only), with the last finished scan. POST (admins) runs an
+    incremental scan now; ``absences``, ``window``, ``drop`` and ``full``
+    are as for the scan_dropout_risk command.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        children = ChildProfile.objects.filter(participation_history__dropout_risk__flagged=True)
+        if user.role == 'COACH':
+            children = children.filter(assigned_coach=user)
+        elif user.role != 'ADMIN':
+            children = children.none()
+
+        last_scan = DropoutScan.objects.filter(finished_at__isnull=False).first()
         return Response({
-            'workload': workload_data,
+            'last_scan': {
+                'started_at': last_scan.started_at,
+                'finished_at': last_scan.finished_at,
+                'children_scanned': last_scan.children_scanned,
+                'children_flagged': last_scan.children_flagged,
+            } if last_scan else None,
+            'results': ChildProfileSerializer(children.select_related('user', 'assigned_coach'), many=True).data,
         })
+
+    def post(self, request):
+        if request.user.role != 'ADMIN':
+            return Response({'error': 'Only admins can run the dropout-risk scan.'},
+                            status=status.HTTP_403_FORBIDDEN)
+        try:
+            absences = int(request.data.get('absences', DEFAULT_ABSENCES))
+            window = int(request.data.get('window', DEFAULT_WINDOW))
+            drop = float(request.data.get('drop', DEFAULT_DROP))
+        except (TypeError, ValueError):
+            return Response({'error': 'absences and window must be numbers, drop a percentage.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if absences < 1 or window < 1:
+            return Response({'error': 'absences and window must be at least 1.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # Form values ("false", "0") as well as JSON booleans.
+            full = BooleanField().to_internal_value(request.data.get('full', False))
+        except ValidationError:
+            return Response({'error': 'full must be true or false.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        scan = scan_dropout_risk(absences, window, drop, full=full)
+        return Response({
+            'started_at': scan.started_at,
+            'finished_at': scan.finished_at,
+            'full': scan.full,
+            'children_scanned': scan.children_scanned,
+            'children_flagged': scan.children_flagged,
+        })
+
+
 class MyCoachingProfileView(APIView):
     """
     An endpoint for a player/spectator to view their
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='discussionthread',
+            index=models.Index(fields=['-updated_at', 'id'], name='thread_updated_idx'),
+        ),
+    ]
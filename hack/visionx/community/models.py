@@ -11,6 +11,9 @@ class DiscussionThread(models.Model):
 
     class Meta:
         ordering = ['-updated_at'] 
+        indexes = [
+            models.Index(fields=['-updated_at', 'id'], name='thread_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
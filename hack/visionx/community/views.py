@@ -5,6 +5,7 @@ from .serializers import DiscussionThreadSerializer, ThreadReplySerializer, Reso
 class DiscussionThreadViewSet(viewsets.ModelViewSet):
     
     queryset = DiscussionThread.objects.all()
+    keyset_ordering = ('-updated_at', 'id')
     serializer_class = DiscussionThreadSerializer
     
     permission_classes = [permissions.IsAuthenticatedOrReadOnly] 
@@ -16,6 +17,7 @@ class DiscussionThreadViewSet(viewsets.ModelViewSet):
 class ThreadReplyViewSet(viewsets.ModelViewSet):
     
     queryset = ThreadReply.objects.all()
+    keyset_ordering = ('created_at', 'id')
     serializer_class = ThreadReplySerializer
     
     permission_classes = [permissions.IsAuthenticated] 
@@ -27,6 +29,7 @@ class ThreadReplyViewSet(viewsets.ModelViewSet):
 class ResourceViewSet(viewsets.ModelViewSet):
     
     queryset = Resource.objects.all()
+    keyset_ordering = ('-uploaded_at', '-id')
     serializer_class = ResourceSerializer
    
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
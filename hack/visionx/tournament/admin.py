@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Tournament, Team, PlayerRegistration, Match, SpiritScore
+from .models import Tournament, Team, PlayerRegistration, Match, SpiritScore, TeamStanding, SpiritScoreSummary, TournamentVersion
 
 
 
@@ -7,4 +7,7 @@ admin.site.register(Tournament)
 admin.site.register(Team)
 admin.site.register(PlayerRegistration)
 admin.site.register(Match)
-admin.site.register(SpiritScore)
\ No newline at end of file
+admin.site.register(SpiritScore)
+admin.site.register(TeamStanding)
+admin.site.register(SpiritScoreSummary)
+admin.site.register(TournamentVersion)
\ No newline at end of file
@@ -0,0 +1,227 @@
+import string
+from itertools import zip_longest
+
+from django.db.models import F, Q
+
+from .models import Match
+from .ranking import rank_teams
+from .scheduling import round_robin_rounds
+
+
+BRACKET_FORMATS = ['single', 'double', 'placement']
+
+
+class TiedBracketGame(ValueError):
+    """A bracket game was marked FINAL with level scores; someone has to win it."""
+
+
+def is_tied_bracket_final(match):
+    return bool(
+        match.bracket_code and match.status == 'FINAL'
+        and match.team_a_score is not None and match.team_a_score == match.team_b_score
+    )
+
+
+def seed_pools(team_ids, pool_count):
+    """
+    Snake-seed teams (best first) into pools named A, B, C...: seeds 1-4 go
+    to A-D, seeds 5-8 to D-A, and so on, so pools are evenly matched.
+    """
+    if not 1 <= pool_count <= len(string.ascii_uppercase):
+        raise ValueError(f'pool_count must be between 1 and {len(string.ascii_uppercase)}.')
+    if len(team_ids) < 2 * pool_count:
+        raise ValueError('Every pool needs at least 2 teams.')
+
+    pools = {name: [] for name in string.ascii_uppercase[:pool_count]}
+    names = list(pools)
+    for index, team_id in enumerate(team_ids):
+        lap, offset = divmod(index, pool_count)
+        pools[names[offset if lap % 2 == 0 else pool_count - 1 - offset]].append(team_id)
+    return pools
+
+
+def pool_pairings(pools):
+    """Round-robin pairings for every pool, interleaved round by round."""
+    per_pool = {}
+    for name, team_ids in pools.items():
+        per_pool[name] = [
+            [(team_a, team_b, name) for team_a, team_b in pairings]
+            for pairings in round_robin_rounds(team_ids)
+        ]
+    for rounds in zip_longest(*per_pool.values(), fillvalue=[]):
+        for pairings in rounds:
+            yield from pairings
+
+
+def pool_seeds(pool_names, advance):
+    """Bracket seeds in order: every pool winner first, then runners-up, snaking across pools."""
+    seeds = []
+    for place in range(1, advance + 1):
+        order = pool_names if place % 2 else list(reversed(pool_names))
+        seeds.extend(f'POOL:{name}:{place}' for name in order)
+    return seeds
+
+
+def seed_positions(size):
+    """Standard bracket order for ``size`` (a power of two) seeds: 1 v size, 2 v size-1, ..."""
+    positions = [1]
+    while len(positions) < size:
+        total = 2 * len(positions) + 1
+        positions = [seed for position in positions for seed in (position, total - position)]
+    return positions
+
+
+def _play_round(entries, prefix, games):
+    """
+    Pair neighbouring entries into games. A ``None`` entry is a bye: the
+    other entry goes through without a game. Returns (winners, losers).
+    """
+    winners, losers = [], []
+    for index in range(0, len(entries), 2):
+        team_a, team_b = entries[index], entries[index + 1]
+        if team_a is None or team_b is None:
+            winners.append(team_b if team_a is None else team_a)
+            losers.append(None)
+            continue
+        code = f'{prefix}M{index // 2 + 1}'
+        games.append({'code': code, 'team_a_source': team_a, 'team_b_source': team_b})
+        winners.append(f'W:{code}')
+        losers.append(f'L:{code}')
+    return winners, losers
+
+
+def single_elimination(entries, games, prefix='W'):
+    round_number = 1
+    losers_by_round = []
+    while len(entries) > 1:
+        entries, losers = _play_round(entries, f'{prefix}R{round_number}', games)
+        losers_by_round.append(losers)
+        round_number += 1
+    return entries[0], losers_by_round
+
+
+def placement(entries, games, first_place=1):
+    """Every game's winners and losers keep playing, so every entrant finishes with a place."""
+    if len(entries) < 2:
+        return
+    last_place = first_place + len(entries) - 1
+    winners, losers = _play_round(entries, f'P{first_place}-{last_place}', games)
+    placement(winners, games, first_place)
+    placement(losers, games, first_place + len(winners))
+
+
+def double_elimination(entries, games):
+    """
+    Winners bracket, a losers bracket fed by each winners round (drop-in
+    rounds alternate with losers-only rounds), then a single grand final.
+    """
+    champion, wb_losers = single_elimination(entries, games, prefix='W')
+    survivors, _ = _play_round(wb_losers[0], 'LR1', games)
+    round_number = 1
+    for dropping in wb_losers[1:]:
+        round_number += 1
+        paired = [entry for pair in zip(survivors, reversed(dropping)) for entry in pair]
+        survivors, _ = _play_round(paired, f'LR{round_number}', games)
+        if len(survivors) > 1:
+            round_number += 1
+            survivors, _ = _play_round(survivors, f'LR{round_number}', games)
+    _play_round([champion, survivors[0]], 'GF', games)
+
+
+def build_bracket(seeds, bracket_format):
+    """
+    Placeholder games for a bracket over ``seeds`` (source codes, best
+    first). Each game is a dict with ``code``, ``team_a_source``,
+    ``team_b_source`` and ``wave``: games in the same wave can be played
+    side by side, wave N+1 only once wave N has finished.
+    """
+    if bracket_format not in BRACKET_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(BRACKET_FORMATS)}.")
+    if len(seeds) < 2:
+        raise ValueError('A bracket needs at least 2 teams.')
+
+    size = 1
+    while size < len(seeds):
+        size *= 2
+    if bracket_format == 'double' and size < 4:
+        raise ValueError('A double-elimination bracket needs at least 3 teams.')
+    entries = [seeds[seed - 1] if seed <= len(seeds) else None for seed in seed_positions(size)]
+
+    games = []
+    if bracket_format == 'single':
+        single_elimination(entries, games)
+    elif bracket_format == 'placement':
+        placement(entries, games)
+    else:
+        double_elimination(entries, games)
+
+    waves = {}
+    for game in games:
+        waves[game['code']] = 1 + max(
+            waves.get(source.partition(':')[2], 0)
+            for source in (game['team_a_source'], game['team_b_source'])
+        )
+        game['wave'] = waves[game['code']]
+    return games
+
+
+def _result_sources(match):
+    """(winner_id, loser_id) of a FINAL, decided game, else None."""
+    if match.status != 'FINAL' or match.team_a_score is None or match.team_b_score is None:
+        return None
+    if match.team_a_score == match.team_b_score:
+        return None
+    if match.team_a_score > match.team_b_score:
+        return match.team_a_id, match.team_b_id
+    return match.team_b_id, match.team_a_id
+
+
+def fill_sources(tournament_id, assignments):
+    """
+    Put teams into the not-yet-played games waiting on them.
+    ``assignments`` maps a source code to a team id. Each game is saved
+    through the model so its signals (versions, caches, live updates) run.
+    """
+    waiting = Match.objects.filter(tournament_id=tournament_id, status='SCHEDULED').filter(
+        Q(team_a_source__in=list(assignments)) | Q(team_b_source__in=list(assignments))
+    )
+    for match in waiting:
+        changed = []
+        for side in ('team_a', 'team_b'):
+            team_id = assignments.get(getattr(match, f'{side}_source'))
+            if team_id is not None and getattr(match, f'{side}_id') != team_id:
+                setattr(match, f'{side}_id', team_id)
+                changed.append(f'{side}_id')
+        if changed:
+            match.version = F('version') + 1
+            match.save(update_fields=changed + ['version'])
+            match.refresh_from_db(fields=['version'])
+
+
+def advance(match):
+    """
+    Called when a game is saved. Once it is FINAL its winner and loser move
+    into the games that reference it; once a whole pool is FINAL its
+    finishers move into the bracket. A tied bracket game raises
+    TiedBracketGame: nobody could move on and the bracket would stall.
+    """
+    if is_tied_bracket_final(match):
+        raise TiedBracketGame(f'Bracket game {match.bracket_code} cannot end in a tie.')
+
+    assignments = {}
+    result = _result_sources(match)
+    if result and match.bracket_code:
+        winner, loser = result
+        assignments[f'W:{match.bracket_code}'] = winner
+        assignments[f'L:{match.bracket_code}'] = loser
+
+    if match.stage == 'POOL' and match.status == 'FINAL':
+        unfinished = Match.objects.filter(
+            tournament_id=match.tournament_id, stage='POOL', pool=match.pool
+        ).filter(~Q(status='FINAL'))
+        if not unfinished.exists():
+            for place, team_id in enumerate(rank_teams(match.tournament_id, pool=match.pool), start=1):
+                assignments[f'POOL:{match.pool}:{place}'] = team_id
+
+    if assignments:
+        fill_sources(match.tournament_id, assignments)
@@ -0,0 +1,99 @@
+from bisect import bisect_left
+from datetime import timedelta
+
+from .models import Match
+
+
+SLOT_FIELDS = ('id', 'team_a_id', 'team_b_id', 'field_number', 'start_time', 'duration_minutes')
+
+
+class ScheduleConflict(Exception):
+    """A game would double-book a field or team; ``conflicts`` lists the clashes as the checks report them."""
+
+    def __init__(self, conflicts):
+        super().__init__('The game clashes with the schedule.')
+        self.conflicts = conflicts
+
+
+def slot(match_id, team_a_id, team_b_id, field_number, start_time, duration_minutes):
+    """(match_id, resources, start, end) for one game; a game occupies its field and both teams."""
+    resources = [('field', field_number)]
+    resources += [('team', team_id) for team_id in (team_a_id, team_b_id) if team_id is not None]
+    return match_id, resources, start_time, start_time + timedelta(minutes=duration_minutes)
+
+
+def slot_for_match(match):
+    return slot(match.pk, match.team_a_id, match.team_b_id, match.field_number,
+                match.start_time, match.duration_minutes)
+
+
+def _conflict(resource, match_id, other_id):
+    kind, value = resource
+    return {'type': kind, kind: value, 'match': match_id, 'other_match': other_id}
+
+
+class ScheduleIndex:
+    """
+    Interval index over a schedule: for every field and every team, the
+    games it is booked for, sorted by start time. Building it is
+    O(n log n); checking one game against it is O(log n) plus the games it
+    actually overlaps.
+    """
+
+    def __init__(self, slots):
+        self.by_resource = {}
+        for match_id, resources, start, end in slots:
+            for resource in resources:
+                self.by_resource.setdefault(resource, []).append((start, end, match_id))
+
+        self.starts = {}
+        self.longest = {}
+        for resource, intervals in self.by_resource.items():
+            intervals.sort(key=lambda interval: interval[:2])
+            self.starts[resource] = [start for start, _, _ in intervals]
+            self.longest[resource] = max(end - start for start, end, _ in intervals)
+
+    @classmethod
+    def for_tournament(cls, tournament_id, exclude=None):
+        matches = Match.objects.filter(tournament_id=tournament_id)
+        if exclude is not None:
+            matches = matches.exclude(pk=exclude)
+        return cls(slot(*row) for row in matches.values_list(*SLOT_FIELDS))
+
+    def conflicts(self):
+        """
+        Every game that overlaps an earlier one on the same field or team,
+        paired with the game it clashes with; one sweep per resource.
+        """
+        found = []
+        for resource, intervals in self.by_resource.items():
+            # Latest-ending game seen so far; any game starting before it ends overlaps it.
+            busy_until, busy_match = None, None
+            for start, end, match_id in intervals:
+                if busy_until is not None and start < busy_until:
+                    found.append(_conflict(resource, match_id, busy_match))
+                if busy_until is None or end > busy_until:
+                    busy_until, busy_match = end, match_id
+        return found
+
+    def conflicts_for(self, game):
+        """Games in the index that overlap ``game`` (a ``slot()`` tuple)."""
+        match_id, resources, start, end = game
+        found = []
+        for resource in resources:
+            intervals = self.by_resource.get(resource)
+            if not intervals:
+                continue
+            # Nothing starting earlier than start - longest can still be running.
+            first = bisect_left(self.starts[resource], start - self.longest[resource])
+            for other_start, other_end, other_id in intervals[first:]:
+                if other_start >= end:
+                    break
+                if other_end > start and other_id != match_id:
+                    found.append(_conflict(resource, match_id, other_id))
+        return found
+
+
+def match_conflicts(tournament_id, game):
+    """Conflicts one new or edited game would create in its tournament's stored schedule."""
+    return ScheduleIndex.for_tournament(tournament_id, exclude=game[0]).conflicts_for(game)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+class InProcessBroker:
+    """
+    Fan-out pub/sub for live score updates inside a single ASGI process.
+
+    Publishers may run on any thread (ordinary sync views and signals);
+    every subscriber is an asyncio queue owned by the event loop serving
+    its streaming response. A publish serializes the message once and hands
+    the same string to every subscriber. Slow subscribers drop their oldest
+    pending update instead of blocking the publisher.
+    """
+
+    queue_size = 50
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        with self._lock:
+            self._subscribers[channel].discard(subscription)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                # The subscriber's loop has already shut down.
+                self.unsubscribe(channel, (loop, queue))
+
+    @staticmethod
+    def _offer(queue, message):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+
+_broker = None
+
+
+def get_broker():
+    """Return the configured broker (``LIVE_SCORE_BROKER`` setting)."""
+    global _broker
+    if _broker is None:
+        path = getattr(settings, 'LIVE_SCORE_BROKER', 'tournament.live.InProcessBroker')
+        _broker = import_string(path)()
+    return _broker
+
+
+def tournament_channel(tournament_id):
+    return f"tournament:{tournament_id}"
+
+
+def match_channel(match_id):
+    return f"match:{match_id}"
+
+
+def match_payload(match):
+    return json.dumps({
+        'id': match.pk,
+        'tournament': match.tournament_id,
+        'status': match.status,
+        'team_a_score': match.team_a_score,
+        'team_b_score': match.team_b_score,
+        'is_final': match.is_final,
+        'start_time': match.start_time,
+        'field_number': match.field_number,
+    }, cls=DjangoJSONEncoder)
+
+
+def broadcast_match(match):
+    """Push a match's current score and status to its match and tournament channels."""
+    payload = match_payload(match)
+    broker = get_broker()
+    broker.publish(match_channel(match.pk), payload)
+    broker.publish(tournament_channel(match.tournament_id), payload)
+
+
+async def event_stream(channel, keepalive=15):
+    """
+    Server-sent events for one channel. Sends a comment line every
+    ``keepalive`` seconds so proxies do not close idle connections.
+    """
+    broker = get_broker()
+    subscription = broker.subscribe(channel)
+    queue = subscription[1]
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: match\ndata: {payload}\n\n"
+    finally:
+        broker.unsubscribe(channel, subscription)
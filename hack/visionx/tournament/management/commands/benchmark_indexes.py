@@ -0,0 +1,197 @@
+import random
+import time
+from datetime import date, datetime, time as clock, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from coaching_app.models import Attendance, ChildProfile, Session
+from community.models import DiscussionThread
+from tournament.models import Match, PlayerRegistration, SpiritScore, Team, Tournament
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a realistic dataset inside a transaction, EXPLAIN the hot "
+        "queries and check each one uses its composite index. Nothing is "
+        "kept: the transaction is rolled back at the end (on MySQL the seed "
+        "is therefore not ANALYZEd). Exits non-zero when a query misses "
+        "its index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1,
+                            help="Multiplier for the seeded row counts (default 1).")
+        parser.add_argument('--no-seed', action='store_true',
+                            help="EXPLAIN against the existing data instead of seeding.")
+
+    def handle(self, *args, **options):
+        self.failures = 0
+        if options['no_seed']:
+            self.analyze()
+            self.explain_all()
+        else:
+            try:
+                with transaction.atomic():
+                    started = time.perf_counter()
+                    self.seed(options['scale'])
+                    self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s")
+                    self.analyze()
+                    self.explain_all()
+                    raise Rollback
+            except Rollback:
+                pass
+
+        if self.failures:
+            raise CommandError(f"{self.failures} hot queries did not use their index.")
+        else:
+            self.stdout.write(self.style.SUCCESS("All hot queries use their index."))
+
+    def hot_queries(self):
+        tournament = Tournament.objects.order_by('id').first()
+        match = Match.objects.filter(tournament=tournament).first()
+        coach = get_user_model().objects.filter(role='COACH').order_by('id').first()
+        child = ChildProfile.objects.filter(attendances__isnull=False).order_by('id').first()
+        if match is None or coach is None or child is None:
+            raise CommandError(
+                "No tournament with matches, coach or child with attendance to explain against; "
+                "run without --no-seed."
+            )
+        today = timezone.now().date()
+        return [
+            ('Match(tournament) ordered by time', 'match_tourn_start_idx',
+             Match.objects.filter(tournament=tournament).order_by('start_time', 'id')),
+            ('Match keyset page', 'match_start_idx',
+             Match.objects.order_by('start_time', 'id')[:50]),
+            ('PlayerRegistration(tournament) distinct teams', 'registration_tourn_team_idx',
+             PlayerRegistration.objects.filter(tournament=tournament)
+             .values_list('team', flat=True).distinct()),
+            ('Session(assigned_coach, status) by date', 'session_coach_status_idx',
+             Session.objects.filter(assigned_coach=coach, status__in=['SCHEDULED', 'LIVE'])
+             .order_by('date', 'time')[:10]),
+            ('Session(assigned_coach, date, COMPLETED) count', 'session_coach_status_idx',
+             Session.objects.filter(assigned_coach=coach, status='COMPLETED',
+                                    date__gte=today.replace(day=1)).values('id')),
+            ('Attendance(session__assigned_coach)', 'attendance_session_status_idx',
+             Attendance.objects.filter(session__assigned_coach=coach).values('session_id', 'status')),
+            ('Attendance(child) history page', 'attendance_child_date_idx',
+             Attendance.objects.filter(child=child).order_by('-session_date', '-session_time', '-session_id')[:21]),
+            ('SpiritScore(match, target_team)', 'spirit_match_target_idx',
+             SpiritScore.objects.filter(match=match, target_team_id=match.team_a_id)),
+            ('DiscussionThread keyset page', 'thread_updated_idx',
+             DiscussionThread.objects.order_by('-updated_at', 'id')[:50]),
+        ]
+
+    def explain_all(self):
+        for label, index_name, queryset in self.hot_queries():
+            self.explain(label, index_name, queryset)
+
+    def explain(self, label, index_name, queryset):
+        plan = queryset.explain()
+        started = time.perf_counter()
+        list(queryset)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if index_name in plan:
+            self.stdout.write(f"[ok]   {label}: {index_name} ({elapsed:.1f} ms)")
+        else:
+            self.failures += 1
+            self.stdout.write(self.style.WARNING(f"[miss] {label}: expected {index_name} ({elapsed:.1f} ms)"))
+            self.stdout.write(f"       {plan}")
+
+    def analyze(self):
+        tables = [model._meta.db_table for model in (
+            Tournament, Team, PlayerRegistration, Match, SpiritScore,
+            Session, Attendance, ChildProfile, DiscussionThread,
+        )]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                if connection.in_atomic_block:
+                    # ANALYZE TABLE commits implicitly, which would keep the
+                    # seeded rows the rollback is meant to throw away.
+                    self.stdout.write("Skipping ANALYZE TABLE inside the seeding transaction.")
+                    return
+                cursor.execute(f"ANALYZE TABLE {', '.join(tables)}")
+                cursor.fetchall()
+            elif connection.vendor in ('sqlite', 'postgresql'):
+                cursor.execute("ANALYZE")
+
+    def seed(self, scale):
+        rng = random.Random(42)
+        User = get_user_model()
+        tag = f"bench{rng.randrange(10**6)}"
+
+        # MySQL does not hand primary keys back from bulk_create, so every
+        # batch is re-read through its unique tag before it is referenced.
+        tournaments = self.create(Tournament, {'title__startswith': tag}, [
+            Tournament(title=f"{tag} cup {i}", start_date=date(2025, 1, 1) + timedelta(days=7 * i),
+                       end_date=date(2025, 1, 3) + timedelta(days=7 * i), location='Field')
+            for i in range(20 * scale)
+        ])
+        players = self.create(User, {'username__startswith': f"{tag}_player"}, [
+            User(username=f"{tag}_player{i}", role='PLAYER') for i in range(6000 * scale)
+        ])
+        teams = self.create(Team, {'name__startswith': tag}, [
+            Team(name=f"{tag} team {i}", captain=players[i]) for i in range(400 * scale)
+        ])
+
+        registrations, matches = [], []
+        for t_index, tournament in enumerate(tournaments):
+            entered = rng.sample(teams, 24)
+            for team_index, team in enumerate(entered):
+                for slot in range(12):
+                    player = players[(t_index * 288 + team_index * 12 + slot) % len(players)]
+                    registrations.append(PlayerRegistration(player=player, team=team, tournament=tournament))
+            kickoff = timezone.make_aware(datetime.combine(tournament.start_date, clock(9)))
+            for m_index in range(120):
+                team_a, team_b = rng.sample(entered, 2)
+                matches.append(Match(
+                    tournament=tournament, team_a=team_a, team_b=team_b,
+                    start_time=kickoff + timedelta(minutes=90 * (m_index // 8)),
+                    field_number=m_index % 8 + 1, status='FINAL',
+                    team_a_score=rng.randint(5, 15), team_b_score=rng.randint(5, 15),
+                ))
+        PlayerRegistration.objects.bulk_create(registrations, ignore_conflicts=True)
+        matches = self.create(Match, {'tournament__title__startswith': tag}, matches)
+        SpiritScore.objects.bulk_create([
+            SpiritScore(match=match, submitting_user=players[0], target_team_id=target)
+            for match in matches for target in (match.team_a_id, match.team_b_id)
+        ])
+
+        coaches = self.create(User, {'username__startswith': f"{tag}_coach"}, [
+            User(username=f"{tag}_coach{i}", role='COACH') for i in range(50 * scale)
+        ])
+        children = self.create(ChildProfile, {'user__username__startswith': tag}, [
+            ChildProfile(user=players[i], assigned_coach=coaches[i % len(coaches)])
+            for i in range(2000 * scale)
+        ])
+        sessions = self.create(Session, {'created_by__username__startswith': tag}, [
+            Session(date=date(2023, 1, 1) + timedelta(days=i % 900), time=clock(16),
+                    location=f"Ground {i % 30}", created_by=coaches[i % len(coaches)],
+                    assigned_coach=coaches[i % len(coaches)],
+                    status=rng.choice(['SCHEDULED', 'LIVE', 'COMPLETED', 'COMPLETED']))
+            for i in range(6000 * scale)
+        ])
+        by_coach = {}
+        for child in children:
+            by_coach.setdefault(child.assigned_coach_id, []).append(child)
+        Attendance.objects.bulk_create([
+            Attendance(child=child, session=session, status=rng.choice(['Present', 'Absent']),
+                       session_date=session.date, session_time=session.time)
+            for session in sessions
+            for child in by_coach[session.assigned_coach_id][:10]
+        ], batch_size=5000)
+        DiscussionThread.objects.bulk_create([
+            DiscussionThread(title=f"{tag} thread {i}", content='...', author=players[i % len(players)])
+            for i in range(3000 * scale)
+        ])
+
+    def create(self, model, lookup, objects):
+        model.objects.bulk_create(objects, batch_size=5000)
+        return list(model.objects.filter(**lookup).order_by('id'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tournament.models import Tournament
+from tournament.spirit import rebuild_spirit_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the spirit score summaries from submitted spirit scores."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_ids', nargs='*', type=int,
+                            help="Tournaments to rebuild (default: all).")
+
+    def handle(self, *args, **options):
+        tournaments = Tournament.objects.all()
+        if options['tournament_ids']:
+            tournaments = tournaments.filter(pk__in=options['tournament_ids'])
+
+        for tournament in tournaments:
+            rebuild_spirit_summaries(tournament)
+            self.stdout.write(f"Rebuilt spirit summaries for {tournament}")
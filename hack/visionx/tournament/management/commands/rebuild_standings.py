@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from tournament.models import Tournament
+from tournament.standings import rebuild_standings
+from tournament import versioning
+
+
+class Command(BaseCommand):
+    help = "Recompute the standings table from match results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_ids', nargs='*', type=int,
+                            help="Tournaments to rebuild (default: all).")
+
+    def handle(self, *args, **options):
+        tournaments = Tournament.objects.all()
+        if options['tournament_ids']:
+            tournaments = tournaments.filter(pk__in=options['tournament_ids'])
+
+        for tournament in tournaments:
+            rebuild_standings(tournament)
+            versioning.bump(tournament.pk)
+            self.stdout.write(f"Rebuilt standings for {tournament}")
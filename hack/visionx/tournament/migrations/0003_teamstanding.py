@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_standings(apps, schema_editor):
+    # Same counting as standings.match_result, kept here so later changes
+    # to the app code cannot change what this migration writes.
+    Match = apps.get_model('tournament', 'Match')
+    TeamStanding = apps.get_model('tournament', 'TeamStanding')
+    totals = {}
+    for tournament_id, team_a_id, team_b_id, team_a_score, team_b_score in Match.objects.filter(
+        status='FINAL', team_a__isnull=False, team_b__isnull=False,
+        team_a_score__isnull=False, team_b_score__isnull=False,
+    ).values_list('tournament_id', 'team_a_id', 'team_b_id', 'team_a_score', 'team_b_score').iterator():
+        for team_id, scored, conceded in (
+            (team_a_id, team_a_score, team_b_score),
+            (team_b_id, team_b_score, team_a_score),
+        ):
+            row = totals.setdefault((tournament_id, team_id), {
+                'played': 0, 'wins': 0, 'losses': 0, 'ties': 0,
+                'points_for': 0, 'points_against': 0, 'point_differential': 0,
+            })
+            row['played'] += 1
+            row['wins'] += scored > conceded
+            row['losses'] += scored < conceded
+            row['ties'] += scored == conceded
+            row['points_for'] += scored
+            row['points_against'] += conceded
+            row['point_differential'] += scored - conceded
+    TeamStanding.objects.bulk_create([
+        TeamStanding(tournament_id=tournament_id, team_id=team_id, **row)
+        for (tournament_id, team_id), row in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0002_match_status_alter_match_team_a_score_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('losses', models.PositiveIntegerField(default=0)),
+                ('ties', models.PositiveIntegerField(default=0)),
+                ('points_for', models.PositiveIntegerField(default=0)),
+                ('points_against', models.PositiveIntegerField(default=0)),
+                ('point_differential', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='tournament.team')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='tournament.tournament')),
+            ],
+            options={
+                'ordering': ['-wins', '-point_differential', '-points_for', 'team_id'],
+                'indexes': [models.Index(fields=['tournament', '-wins', '-point_differential', '-points_for', 'team'], name='standing_rank_idx')],
+                'unique_together': {('tournament', 'team')},
+            },
+        ),
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
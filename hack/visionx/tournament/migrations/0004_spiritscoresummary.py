@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CATEGORIES = ['rules_knowledge', 'fouls_contact', 'fair_mindedness', 'positive_attitude', 'communication']
+
+
+def backfill_summaries(apps, schema_editor):
+    # Same sums as spirit.score_contribution, kept here so later changes
+    # to the app code cannot change what this migration writes.
+    SpiritScore = apps.get_model('tournament', 'SpiritScore')
+    SpiritScoreSummary = apps.get_model('tournament', 'SpiritScoreSummary')
+    totals = {}
+    for tournament_id, team_id, *values in SpiritScore.objects.values_list(
+        'match__tournament_id', 'target_team_id', *CATEGORIES
+    ).iterator():
+        row = totals.setdefault((tournament_id, team_id), dict.fromkeys(['submissions', 'total'] + CATEGORIES, 0))
+        row['submissions'] += 1
+        row['total'] += sum(values)
+        for category, value in zip(CATEGORIES, values):
+            row[category] += value
+    SpiritScoreSummary.objects.bulk_create([
+        SpiritScoreSummary(tournament_id=tournament_id, team_id=team_id, **row)
+        for (tournament_id, team_id), row in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0003_teamstanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpiritScoreSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('rules_knowledge', models.PositiveIntegerField(default=0)),
+                ('fouls_contact', models.PositiveIntegerField(default=0)),
+                ('fair_mindedness', models.PositiveIntegerField(default=0)),
+                ('positive_attitude', models.PositiveIntegerField(default=0)),
+                ('communication', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spirit_summaries', to='tournament.team')),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spirit_summaries', to='tournament.tournament')),
+            ],
+            options={
+                'unique_together': {('tournament', 'team')},
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
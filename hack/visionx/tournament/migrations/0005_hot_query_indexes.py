@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0004_spiritscoresummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['tournament', 'start_time', 'id'], name='match_tourn_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['start_time', 'id'], name='match_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerregistration',
+            index=models.Index(fields=['tournament', 'team'], name='registration_tourn_team_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spiritscore',
+            index=models.Index(fields=['match', 'target_team'], name='spirit_match_target_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='bracket_code',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='pool',
+            field=models.CharField(blank=True, max_length=5),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='stage',
+            field=models.CharField(choices=[('ROUND_ROBIN', 'Round robin'), ('POOL', 'Pool play'), ('BRACKET', 'Bracket')], default='ROUND_ROBIN', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='team_a_source',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='team_b_source',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='team_a',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='matches_as_team_a', to='tournament.team'),
+        ),
+        migrations.AlterField(
+            model_name='match',
+            name='team_b',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='matches_as_team_b', to='tournament.team'),
+        ),
+    ]
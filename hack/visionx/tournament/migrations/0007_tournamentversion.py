@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    Tournament = apps.get_model('tournament', 'Tournament')
+    TournamentVersion = apps.get_model('tournament', 'TournamentVersion')
+    TournamentVersion.objects.bulk_create(
+        [TournamentVersion(tournament_id=pk) for pk in Tournament.objects.values_list('pk', flat=True)],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0006_match_stage_and_bracket_sources'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TournamentVersion',
+            fields=[
+                ('tournament', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='version', serialize=False, to='tournament.tournament')),
+                ('version', models.PositiveBigIntegerField(default=1)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0007_tournamentversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='match',
+            name='duration_minutes',
+            field=models.PositiveSmallIntegerField(default=90),
+        ),
+    ]
@@ -12,6 +12,21 @@ class Tournament(models.Model):
     def __str__(self):
         return self.title
 
+class TournamentVersion(models.Model):
+    """
+    Change stamp for everything shown under a tournament (matches, teams,
+    registrations). Kept in its own row so saving a Tournament through the
+    API can never write back a stale version number.
+    """
+
+    tournament = models.OneToOneField(Tournament, on_delete=models.CASCADE, primary_key=True, related_name="version")
+    version = models.PositiveBigIntegerField(default=1)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.tournament} v{self.version}"
+
+
 class Team(models.Model):
     
     name = models.CharField(max_length=100, unique=True)
@@ -30,6 +45,10 @@ class PlayerRegistration(models.Model):
     class Meta:
         
         unique_together = ('player', 'tournament') 
+        indexes = [
+            # Covers "which teams are in this tournament" (values_list('team').distinct()).
+            models.Index(fields=['tournament', 'team'], name='registration_tourn_team_idx'),
+        ]
 
     def __str__(self):
         return f"{self.player.username} on {self.team.name} for {self.tournament.title}"
@@ -44,10 +63,28 @@ class Match(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='SCHEDULED')
   
     
+    STAGE_CHOICES = [
+        ('ROUND_ROBIN', 'Round robin'),
+        ('POOL', 'Pool play'),
+        ('BRACKET', 'Bracket'),
+    ]
+    stage = models.CharField(max_length=12, choices=STAGE_CHOICES, default='ROUND_ROBIN')
+    pool = models.CharField(max_length=5, blank=True)
+
     tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="matches")
-    team_a = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="matches_as_team_a")
-    team_b = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="matches_as_team_b")
+    # Bracket games are created before their teams are known; the team is
+    # filled in from its source once the feeding game or pool is FINAL.
+    team_a = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="matches_as_team_a", null=True, blank=True)
+    team_b = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="matches_as_team_b", null=True, blank=True)
+
+    # Source codes: "W:<bracket_code>" / "L:<bracket_code>" for the winner or
+    # loser of another game, "POOL:<pool>:<place>" for a pool finisher.
+    bracket_code = models.CharField(max_length=20, blank=True)
+    team_a_source = models.CharField(max_length=30, blank=True)
+    team_b_source = models.CharField(max_length=30, blank=True)
     start_time = models.DateTimeField()
+    # How long the game holds its field and teams; used by the conflict checks.
+    duration_minutes = models.PositiveSmallIntegerField(default=90)
     field_number = models.PositiveIntegerField()
     
 
@@ -57,8 +94,17 @@ class Match(models.Model):
     
     is_final = models.BooleanField(default=False)
 
+    # Bumped on every update, for optimistic concurrency checks by scorekeepers.
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['tournament', 'start_time', 'id'], name='match_tourn_start_idx'),
+            models.Index(fields=['start_time', 'id'], name='match_start_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.team_a} vs {self.team_b} at {self.start_time}"
+        return f"{self.team_a or self.team_a_source} vs {self.team_b or self.team_b_source} at {self.start_time}"
 
 
 
@@ -80,5 +126,60 @@ class SpiritScore(models.Model):
     comments = models.TextField(blank=True, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['match', 'target_team'], name='spirit_match_target_idx'),
+        ]
+
+    def __str__(self):
+        return f"Spirit score for {self.target_team} in match {self.match.id}"
+
+
+class TeamStanding(models.Model):
+
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="standings")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="standings")
+
+    played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    ties = models.PositiveIntegerField(default=0)
+    points_for = models.PositiveIntegerField(default=0)
+    points_against = models.PositiveIntegerField(default=0)
+    point_differential = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('tournament', 'team')
+        ordering = ['-wins', '-point_differential', '-points_for', 'team_id']
+        indexes = [
+            models.Index(
+                fields=['tournament', '-wins', '-point_differential', '-points_for', 'team'],
+                name='standing_rank_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.team} in {self.tournament}: {self.wins}-{self.losses}-{self.ties}"
+
+
+class SpiritScoreSummary(models.Model):
+
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="spirit_summaries")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="spirit_summaries")
+
+    # Running sums over every SpiritScore received by the team in the tournament.
+    submissions = models.PositiveIntegerField(default=0)
+    rules_knowledge = models.PositiveIntegerField(default=0)
+    fouls_contact = models.PositiveIntegerField(default=0)
+    fair_mindedness = models.PositiveIntegerField(default=0)
+    positive_attitude = models.PositiveIntegerField(default=0)
+    communication = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('tournament', 'team')
+
     def __str__(self):
-        return f"Spirit score for {self.target_team} in match {self.match.id}"
\ No newline at end of file
+        return f"Spirit summary for {self.team} in {self.tournament}"
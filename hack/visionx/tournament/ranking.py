@@ -0,0 +1,115 @@
+from array import array
+
+from .models import Match
+
+
+class ResultTable:
+    """
+    FINAL results of a tournament (or one pool) as parallel compact arrays:
+    team indexes and scores per game, plus running per-team totals and
+    each team's game indexes. A tie-break only visits the tied teams' games.
+    """
+
+    def __init__(self, team_ids, results):
+        self.team_ids = list(dict.fromkeys(team_ids))
+        self.index = {team_id: position for position, team_id in enumerate(self.team_ids)}
+        size = len(self.team_ids)
+        self.team_a, self.team_b = array('l'), array('l')
+        self.score_a, self.score_b = array('l'), array('l')
+        # Win points: 2 for a win, 1 for a tie.
+        self.record = array('l', [0]) * size
+        self.scored = array('l', [0]) * size
+        self.conceded = array('l', [0]) * size
+        self.played = array('l', [0]) * size
+        self.games = [array('l') for _ in range(size)]
+
+        for team_a, team_b, score_a, score_b in results:
+            for team_id in (team_a, team_b):
+                if team_id not in self.index:
+                    self.index[team_id] = len(self.team_ids)
+                    self.team_ids.append(team_id)
+                    for column in (self.record, self.scored, self.conceded, self.played):
+                        column.append(0)
+                    self.games.append(array('l'))
+            a, b = self.index[team_a], self.index[team_b]
+            self.games[a].append(len(self.team_a))
+            self.games[b].append(len(self.team_a))
+            self.team_a.append(a)
+            self.team_b.append(b)
+            self.score_a.append(score_a)
+            self.score_b.append(score_b)
+            self.record[a] += 2 * (score_a > score_b) + (score_a == score_b)
+            self.record[b] += 2 * (score_b > score_a) + (score_a == score_b)
+            self.scored[a] += score_a
+            self.scored[b] += score_b
+            self.conceded[a] += score_b
+            self.conceded[b] += score_a
+            self.played[a] += 1
+            self.played[b] += 1
+
+    @classmethod
+    def for_matches(cls, team_ids, matches):
+        return cls(team_ids, matches.filter(
+            status='FINAL', team_a__isnull=False, team_b__isnull=False,
+            team_a_score__isnull=False, team_b_score__isnull=False,
+        ).values_list('team_a_id', 'team_b_id', 'team_a_score', 'team_b_score'))
+
+    def group_totals(self, group):
+        """
+        (record, point differential, points scored) per team, counting only
+        games inside ``group``; reads just the group's own games.
+        """
+        member = set(group)
+        record, diff, scored = {team: 0 for team in group}, {team: 0 for team in group}, {team: 0 for team in group}
+        for team in group:
+            for game in self.games[team]:
+                a, b = self.team_a[game], self.team_b[game]
+                # Each game inside the group is counted once, from its team_a side.
+                if a != team or b not in member:
+                    continue
+                score_a, score_b = self.score_a[game], self.score_b[game]
+                record[a] += 2 * (score_a > score_b) + (score_a == score_b)
+                record[b] += 2 * (score_b > score_a) + (score_a == score_b)
+                diff[a] += score_a - score_b
+                diff[b] += score_b - score_a
+                scored[a] += score_a
+                scored[b] += score_b
+        return record, diff, scored
+
+    def order_group(self, group):
+        """
+        Order teams tied on record: head-to-head record among them, then
+        point differential among them, then points scored among them. As
+        soon as a step splits the group, each smaller tie starts over.
+        """
+        if len(group) < 2:
+            return list(group)
+        for values in self.group_totals(group):
+            levels = sorted({values[team] for team in group}, reverse=True)
+            if len(levels) > 1:
+                return [
+                    team for level in levels
+                    for team in self.order_group([team for team in group if values[team] == level])
+                ]
+        # Still level: overall differential, overall points scored, then id for a stable order.
+        return sorted(group, key=lambda team: (
+            self.conceded[team] - self.scored[team], -self.scored[team], self.team_ids[team]
+        ))
+
+    def ranking(self):
+        """Team ids, best first."""
+        ordered = []
+        for level in sorted(set(self.record), reverse=True):
+            ordered += self.order_group([team for team, record in enumerate(self.record) if record == level])
+        return [self.team_ids[team] for team in ordered]
+
+
+def rank_teams(tournament_id, team_ids=(), pool=None):
+    """
+    Team ids of a tournament best first (one query). ``team_ids`` lists teams
+    to include even without a result yet; ``pool`` restricts to that pool's games.
+    """
+    matches = Match.objects.filter(tournament_id=tournament_id)
+    if pool is not None:
+        matches = matches.filter(stage='POOL', pool=pool)
+    return ResultTable.for_matches(team_ids, matches).ranking()
@@ -0,0 +1,109 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import Match
+
+
+# Bucket length in minutes.
+BUCKETS = {'hour': 60, 'day': 24 * 60}
+
+
+def _minutes(delta):
+    return int(delta.total_seconds() // 60)
+
+
+def _bucket_bounds(moment, bucket):
+    """(start, end) of the ``bucket`` holding ``moment``, in the current time zone."""
+    local = timezone.localtime(moment)
+    if bucket == 'hour':
+        start = local.replace(minute=0, second=0, microsecond=0)
+        return start, start + timedelta(hours=1)
+    start = timezone.make_aware(datetime.combine(local.date(), time.min))
+    return start, timezone.make_aware(datetime.combine(local.date() + timedelta(days=1), time.min))
+
+
+def field_occupancy(tournament_id, bucket='hour'):
+    """
+    Games and booked minutes per field per time bucket. A game that runs
+    past the end of a bucket counts in every bucket it overlaps, with only
+    the minutes it spends in each.
+    """
+    bucket_minutes = BUCKETS[bucket]
+    games = Match.objects.filter(tournament_id=tournament_id).values_list(
+        'field_number', 'start_time', 'duration_minutes'
+    )
+    occupancy = {}
+    for field_number, start, duration in games:
+        end = start + timedelta(minutes=duration)
+        while start < end:
+            bucket_start, bucket_end = _bucket_bounds(start, bucket)
+            row = occupancy.setdefault((bucket_start, field_number), {
+                'field_number': field_number, 'bucket': bucket_start, 'games': 0, 'minutes': 0,
+            })
+            row['games'] += 1
+            row['minutes'] += _minutes(min(end, bucket_end) - start)
+            start = bucket_end
+    return [
+        dict(row, utilization=round(min(row['minutes'], bucket_minutes) / bucket_minutes, 2))
+        for _, row in sorted(occupancy.items())
+    ]
+
+
+def field_timeline(tournament_id):
+    """
+    One sweep over the tournament's games in start order: per field the
+    booked minutes and the idle gaps between games on the same day, per
+    team the rest between consecutive games.
+    """
+    games = Match.objects.filter(tournament_id=tournament_id).order_by('start_time', 'id').values_list(
+        'id', 'field_number', 'team_a_id', 'team_b_id', 'start_time', 'duration_minutes'
+    )
+
+    fields, teams = {}, {}
+    for match_id, field_number, team_a, team_b, start, duration in games:
+        end = start + timedelta(minutes=duration)
+
+        field = fields.setdefault(field_number, {
+            'field': field_number, 'games': 0, 'busy_minutes': 0,
+            'first_start': start, 'last_end': end, 'idle_gaps': [],
+        })
+        if field['games'] and start > field['last_end'] and \
+                timezone.localtime(start).date() == timezone.localtime(field['last_end']).date():
+            field['idle_gaps'].append({
+                'start': field['last_end'], 'end': start, 'minutes': _minutes(start - field['last_end']),
+            })
+        field['games'] += 1
+        field['busy_minutes'] += duration
+        field['last_end'] = max(field['last_end'], end)
+
+        for team_id in (team_a, team_b):
+            if team_id is None:
+                continue
+            team = teams.setdefault(team_id, {'team': team_id, 'games': 0, 'rests': [], 'last_end': None})
+            if team['last_end'] is not None:
+                team['rests'].append(_minutes(start - team['last_end']))
+            team['games'] += 1
+            team['last_end'] = end
+
+    for field in fields.values():
+        # Share of the playing day (first game to last, overnight excluded) the field is in use.
+        field['idle_minutes'] = sum(gap['minutes'] for gap in field['idle_gaps'])
+        day = field['busy_minutes'] + field['idle_minutes']
+        field['utilization'] = round(field['busy_minutes'] / day, 2) if day else 0
+
+    team_rows = []
+    for team in teams.values():
+        rests = team.pop('rests')
+        del team['last_end']
+        team.update({
+            'min_rest_minutes': min(rests) if rests else None,
+            'max_rest_minutes': max(rests) if rests else None,
+            'avg_rest_minutes': round(sum(rests) / len(rests)) if rests else None,
+        })
+        team_rows.append(team)
+
+    return (
+        sorted(fields.values(), key=lambda field: field['field']),
+        sorted(team_rows, key=lambda team: team['team']),
+    )
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+# Everything cached per tournament; a change to a tournament drops all of them.
+TOURNAMENT_ENDPOINTS = ('version', 'detail', 'bundle', 'matches', 'teams', 'standings')
+
+TOURNAMENT_LIST = 'tournaments:list'
+TEAM_LIST = 'teams:list'
+
+
+def _cache():
+    return caches[getattr(settings, 'TOURNAMENT_CACHE_ALIAS', 'default')]
+
+
+def tournament_key(pk, endpoint):
+    return f'tournament:{pk}:{endpoint}'
+
+
+def get_or_build(key, build):
+    """Cached value for ``key``, building and storing it on a miss. ``None`` is never cached."""
+    cache = _cache()
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        if value is not None:
+            cache.set(key, value, getattr(settings, 'TOURNAMENT_CACHE_TIMEOUT', 300))
+    return value
+
+
+def invalidate(*keys):
+    """
+    Drop ``keys`` now and again once the surrounding transaction commits, so
+    a read racing the write cannot put the old rows back in the meantime.
+    """
+    cache = _cache()
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_tournaments(*tournament_ids):
+    invalidate(*[tournament_key(pk, endpoint) for pk in tournament_ids for endpoint in TOURNAMENT_ENDPOINTS])
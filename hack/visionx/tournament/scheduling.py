@@ -0,0 +1,187 @@
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+
+def round_robin_rounds(team_ids):
+    """
+    Split a full round-robin into rounds using the circle method.
+    Every team plays at most once per round; with an odd number of
+    teams one team sits out (bye) each round.
+    """
+    teams = list(team_ids)
+    if len(teams) % 2:
+        teams.append(None)
+
+    n = len(teams)
+    rounds = []
+    for round_index in range(n - 1):
+        pairings = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is None or away is None:
+                continue
+            # Alternate sides for the fixed team so it is not always team A.
+            if i == 0 and round_index % 2:
+                home, away = away, home
+            pairings.append((home, away))
+        rounds.append(pairings)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def iter_slots(start_date, day_start, day_end, slot_length):
+    """Yield aware slot start datetimes, day by day, inside the day window."""
+    day = start_date
+    while True:
+        slot = timezone.make_aware(datetime.combine(day, day_start))
+        day_close = timezone.make_aware(datetime.combine(day, day_end))
+        while slot + slot_length <= day_close:
+            yield slot
+            slot += slot_length
+        day += timedelta(days=1)
+
+
+class SlotAllocator:
+    """
+    Hands out (start_time, field_number) slots for one tournament day plan.
+
+    ``place_pairings`` places team-vs-team games greedily, keeping every
+    team to one game per slot and at least ``rest_minutes`` between games.
+    ``place_wave`` places games whose teams are not known yet (bracket
+    placeholders) after everything placed so far has finished, plus rest.
+
+    ``occupied`` is an optional ``conflicts.ScheduleIndex`` of games that
+    are already booked; pairings are placed around them. ``earliest``
+    skips slots starting before that datetime.
+    """
+
+    def __init__(self, start_date, fields=4, slot_minutes=90, rest_minutes=0,
+                 day_start=None, day_end=None, occupied=None, earliest=None):
+        day_start = day_start or datetime.strptime('09:00', '%H:%M').time()
+        day_end = day_end or datetime.strptime('18:00', '%H:%M').time()
+
+        if fields < 1:
+            raise ValueError('fields must be at least 1.')
+        if slot_minutes < 1:
+            raise ValueError('slot_minutes must be at least 1.')
+        if rest_minutes < 0:
+            raise ValueError('rest_minutes cannot be negative.')
+        if datetime.combine(start_date, day_start) + timedelta(minutes=slot_minutes) > \
+                datetime.combine(start_date, day_end):
+            raise ValueError('The day window is shorter than one slot.')
+
+        self.fields = fields
+        self.slot_length = timedelta(minutes=slot_minutes)
+        self.rest = timedelta(minutes=rest_minutes)
+        self._slots = iter_slots(start_date, day_start, day_end, self.slot_length)
+        if earliest is not None:
+            self._slots = (slot for slot in self._slots if slot >= earliest)
+        self.occupied = occupied
+        self._seen = []
+        self.finished_at = None
+
+    def slot(self, index):
+        while len(self._seen) <= index:
+            self._seen.append(next(self._slots))
+        return self._seen[index]
+
+    def _mark(self, start):
+        end = start + self.slot_length
+        if self.finished_at is None or end > self.finished_at:
+            self.finished_at = end
+
+    def _is_booked(self, resources, start, end):
+        return bool(self.occupied and self.occupied.conflicts_for((None, resources, start, end)))
+
+    def _free_field(self, slot, taken):
+        for field in range(1, self.fields + 1):
+            if field not in taken and not self._is_booked([('field', field)], slot, slot + self.slot_length):
+                return field
+        return None
+
+    def place_pairings(self, pairings, team_count):
+        """
+        Place ``pairings`` (tuples starting with team_a_id, team_b_id) in
+        order as far as rest rules allow. Returns ``(pairing, start, field)``.
+        """
+        upcoming = iter(pairings)
+        # Only look a couple of rounds ahead so each slot costs O(teams), not O(matches).
+        lookahead = max(team_count, 2 * self.fields)
+        pending = []
+        exhausted = False
+        free_at = {}
+        placements = []
+        index = 0
+
+        while not (exhausted and not pending):
+            slot = self.slot(index)
+            index += 1
+            taken = set()
+            waiting = []
+            position = 0
+            while True:
+                field = self._free_field(slot, taken)
+                if field is None:
+                    break
+                if position < len(pending):
+                    pairing = pending[position]
+                    position += 1
+                elif not exhausted and len(waiting) < lookahead:
+                    pairing = next(upcoming, None)
+                    if pairing is None:
+                        exhausted = True
+                        break
+                else:
+                    break
+
+                team_a, team_b = pairing[0], pairing[1]
+                if free_at.get(team_a, slot) <= slot and free_at.get(team_b, slot) <= slot and \
+                        not self._is_booked([('team', team_a), ('team', team_b)],
+                                            slot - self.rest, slot + self.slot_length + self.rest):
+                    taken.add(field)
+                    placements.append((pairing, slot, field))
+                    free_at[team_a] = free_at[team_b] = slot + self.slot_length + self.rest
+                    self._mark(slot)
+                else:
+                    waiting.append(pairing)
+
+            pending = waiting + pending[position:]
+
+        return placements
+
+    def place_wave(self, games):
+        """
+        Place ``games`` side by side, starting once every game placed so far
+        has ended and rested. Returns ``(game, start, field)``.
+        """
+        index = 0
+        if self.finished_at is not None:
+            ready = self.finished_at + self.rest
+            while self.slot(index) < ready:
+                index += 1
+
+        placements = []
+        for position, game in enumerate(games):
+            slot = self.slot(index + position // self.fields)
+            placements.append((game, slot, position % self.fields + 1))
+        for _, slot, _ in placements:
+            self._mark(slot)
+        return placements
+
+
+def build_schedule(team_ids, start_date, **options):
+    """
+    Assign every round-robin pairing to a (start_time, field_number) slot.
+
+    Matches are placed greedily in round order (see ``SlotAllocator`` for
+    the options). Returns a list of
+    ``(team_a_id, team_b_id, start_time, field_number)`` tuples.
+    """
+    team_ids = list(team_ids)
+    allocator = SlotAllocator(start_date, **options)
+    pairings = (pair for pairings in round_robin_rounds(team_ids) for pair in pairings)
+    return [
+        (team_a, team_b, start, field)
+        for (team_a, team_b), start, field in allocator.place_pairings(pairings, len(team_ids))
+    ]
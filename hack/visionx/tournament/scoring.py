@@ -0,0 +1,90 @@
+from django.db import router, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+
+from .brackets import TiedBracketGame
+from .models import Match
+
+
+# Allowed moves; scoring a SCHEDULED game starts it.
+TRANSITIONS = {
+    'SCHEDULED': {'LIVE', 'FINAL'},
+    'LIVE': {'LIVE', 'FINAL'},
+    'FINAL': set(),
+}
+
+
+class ScoreConflict(Exception):
+    """The update did not apply; ``match`` is the row as it stands now (None if it is gone)."""
+
+    def __init__(self, message, match=None):
+        super().__init__(message)
+        self.match = match
+
+
+def record_score(match_id, team_a_points=0, team_b_points=0, status=None, expected_version=None):
+    """
+    Add points to a game and/or move it on (``status`` defaults to LIVE),
+    as one conditional UPDATE.
+
+    Scores change by ``F()`` increments so concurrent scorekeepers add up
+    instead of overwriting each other, and no row is read or locked first.
+    The row must still be in a state the transition is allowed from (and
+    at ``expected_version`` when given), otherwise nothing changes and
+    ScoreConflict is raised. Returns the updated match.
+    """
+    status = status or 'LIVE'
+    from_states = [state for state, targets in TRANSITIONS.items() if status in targets]
+
+    matches = Match.objects.filter(
+        pk=match_id, status__in=from_states, team_a__isnull=False, team_b__isnull=False
+    )
+    if expected_version is not None:
+        matches = matches.filter(version=expected_version)
+    # Corrections may take points off, but never below zero.
+    if team_a_points < 0:
+        matches = matches.filter(team_a_score__gte=-team_a_points)
+    if team_b_points < 0:
+        matches = matches.filter(team_b_score__gte=-team_b_points)
+
+    changes = {'version': F('version') + 1}
+    for side, points in (('team_a', team_a_points), ('team_b', team_b_points)):
+        # A side that never scored finishes on 0 rather than no score.
+        if points or status == 'FINAL':
+            changes[f'{side}_score'] = Coalesce(F(f'{side}_score'), Value(0)) + points
+    changes['status'] = status
+    changes['is_final'] = status == 'FINAL'
+
+    # The UPDATE and the receivers it triggers commit together: if a
+    # receiver fails, the score is rolled back with the standings.
+    try:
+        return _apply_score(match_id, matches, changes, status, expected_version)
+    except TiedBracketGame as exc:
+        raise ScoreConflict(str(exc), Match.objects.select_related('team_a', 'team_b').filter(pk=match_id).first())
+
+
+def _apply_score(match_id, matches, changes, status, expected_version):
+    with transaction.atomic():
+        if not matches.update(**changes):
+            current = Match.objects.select_related('team_a', 'team_b').filter(pk=match_id).first()
+            if current is None:
+                raise ScoreConflict('Match not found.')
+            if expected_version is not None and current.version != expected_version:
+                raise ScoreConflict('The match was updated by someone else.', current)
+            if status not in TRANSITIONS[current.status]:
+                raise ScoreConflict(f'A {current.status} match cannot move to {status}.', current)
+            if current.team_a_id is None or current.team_b_id is None:
+                raise ScoreConflict('The teams for this match are not known yet.', current)
+            raise ScoreConflict('A score cannot go below zero.', current)
+
+        match = Match.objects.select_related('team_a', 'team_b').get(pk=match_id)
+        # update() skips the model signals; run the same receivers a save would
+        # (standings, bracket advancement, live push, cache invalidation). The
+        # game was not FINAL before this update, so it held no standings yet.
+        match._previous_result = {}
+        post_save.send(
+            sender=Match, instance=match, created=False, raw=False,
+            using=router.db_for_write(Match), update_fields=frozenset(changes),
+        )
+    return match
@@ -1,5 +1,13 @@
+import csv
+import io
+
+from django.db import transaction
+from django.db.models import F
 from rest_framework import serializers
-from .models import Tournament, Team, PlayerRegistration, Match, SpiritScore
+from .models import Tournament, Team, PlayerRegistration, Match, SpiritScore, TeamStanding
+from . import versioning
+from .conflicts import ScheduleConflict, match_conflicts, slot
+from .scoring import ScoreConflict
 from users.serializers import CustomUserSerializer 
 from users.models import CustomUser
 
@@ -70,18 +78,231 @@ class PlayerRegistrationCreateSerializer(serializers.ModelSerializer):
             tournament=tournament
         )
         return registration
+class PlayerRegistrationBulkCreateSerializer(serializers.Serializer):
+    """
+    Register a whole roster in one request. Accepts a ``usernames`` list or
+    a CSV ``file`` whose first column holds the usernames (an optional
+    "username" header row is skipped).
+    """
+
+    MAX_ROWS = 500
+
+    team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.select_related('captain'))
+    tournament = serializers.PrimaryKeyRelatedField(queryset=Tournament.objects.all())
+    usernames = serializers.ListField(child=serializers.CharField(allow_blank=True), required=False)
+    file = serializers.FileField(required=False, write_only=True)
+
+    def validate(self, attrs):
+        if 'file' in attrs:
+            attrs['usernames'] = self.read_csv(attrs.pop('file'))
+        if not attrs.get('usernames'):
+            raise serializers.ValidationError("Provide a list of usernames or a CSV file.")
+        if len(attrs['usernames']) > self.MAX_ROWS:
+            raise serializers.ValidationError(f"At most {self.MAX_ROWS} players can be added at once.")
+        return attrs
+
+    def read_csv(self, upload):
+        try:
+            text = upload.read().decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise serializers.ValidationError({'file': "The file must be UTF-8 encoded CSV."})
+        rows = [row[0].strip() if row else '' for row in csv.reader(io.StringIO(text))]
+        if rows and rows[0].lower() == 'username':
+            rows = rows[1:]
+        return rows
+
+    def save(self, **kwargs):
+        captain = self.context['request'].user
+        team = self.validated_data['team']
+        tournament = self.validated_data['tournament']
+        usernames = [name.strip() for name in self.validated_data['usernames']]
+
+        if team.captain != captain:
+            raise serializers.ValidationError("You are not the captain of this team.")
+
+        users = {
+            user.username: user
+            for user in CustomUser.objects.filter(username__in=set(usernames))
+        }
+        already_registered = self.registered_players(tournament, [user.pk for user in users.values()])
+
+        errors, to_create, seen = [], {}, set()
+        for row, username in enumerate(usernames, start=1):
+            user = users.get(username)
+            if not username:
+                error = "Username is blank."
+            elif username in seen:
+                error = "Listed more than once."
+            elif user is None:
+                error = f"User with username '{username}' does not exist."
+            elif user.pk in already_registered:
+                error = f"{username} is already registered for this tournament."
+            else:
+                error = None
+                to_create[user.pk] = (row, username)
+            seen.add(username)
+            if error:
+                errors.append({'row': row, 'username': username, 'error': error})
+
+        with transaction.atomic():
+            # Registrations that appeared since the check above were made by
+            # someone else. Reading them first in the transaction also pins
+            # the snapshot on MySQL, so rows a concurrent request inserts
+            # after this point stay out of ``on_team`` below.
+            existing = self.registered_players(tournament, list(to_create))
+            # unique_together (player, tournament) settles any remaining race;
+            # the conflicting rows are skipped and reported below.
+            PlayerRegistration.objects.bulk_create(
+                [PlayerRegistration(player_id=pk, team=team, tournament=tournament)
+                 for pk in to_create if pk not in existing],
+                ignore_conflicts=True,
+            )
+            versioning.bump(tournament.pk)
+            on_team = set(
+                PlayerRegistration.objects.filter(
+                    tournament=tournament, team=team, player_id__in=to_create
+                ).values_list('player_id', flat=True)
+            ) - existing
+
+        created = []
+        for pk, (row, username) in to_create.items():
+            if pk in on_team:
+                created.append(username)
+            else:
+                errors.append({
+                    'row': row, 'username': username,
+                    'error': f"{username} is already registered for this tournament.",
+                })
+        errors.sort(key=lambda error: error['row'])
+        return {'created': created, 'errors': errors}
+
+    @staticmethod
+    def registered_players(tournament, player_ids):
+        return set(
+            PlayerRegistration.objects.filter(tournament=tournament, player_id__in=player_ids)
+            .values_list('player_id', flat=True)
+        )
+
+
 class MatchSerializer(serializers.ModelSerializer):
     team_a = serializers.StringRelatedField()
     team_b = serializers.StringRelatedField()
+    # Writable side of the teams; reads keep the names above.
+    team_a_id = serializers.PrimaryKeyRelatedField(
+        source='team_a', queryset=Team.objects.all(), allow_null=True, required=False, write_only=True
+    )
+    team_b_id = serializers.PrimaryKeyRelatedField(
+        source='team_b', queryset=Team.objects.all(), allow_null=True, required=False, write_only=True
+    )
     
     class Meta:
         model = Match
         
-        fields = ['id', 'tournament', 'team_a', 'team_b', 'start_time', 
-                  'field_number', 'team_a_score', 'team_b_score', 'is_final', 'status']
+        fields = ['id', 'tournament', 'team_a', 'team_b', 'team_a_id', 'team_b_id', 'start_time',
+                  'duration_minutes', 'field_number', 'team_a_score', 'team_b_score', 'is_final', 'status',
+                  'stage', 'pool', 'bracket_code', 'team_a_source', 'team_b_source', 'version']
+        read_only_fields = ['stage', 'pool', 'bracket_code', 'team_a_source', 'team_b_source']
+        extra_kwargs = {
+            # On updates: the version last read, checked before anything is written.
+            'version': {'required': False, 'min_value': 1},
+        }
+
+    SCHEDULE_FIELDS = ('tournament', 'team_a', 'team_b', 'field_number', 'start_time', 'duration_minutes')
+
+    def validate(self, data):
+        """Refuse to double-book a field or a team (raises ScheduleConflict)."""
+        def value(name):
+            if name in data:
+                return data[name]
+            return getattr(self.instance, name, None)
+
+        if self.instance is not None and 'version' not in data:
+            raise serializers.ValidationError({
+                'version': "Send the version of the match you last read, so concurrent edits are not lost."
+            })
+
+        team_a, team_b = value('team_a'), value('team_b')
+        if team_a is not None and team_a == team_b:
+            raise serializers.ValidationError("A team cannot play itself.")
+
+        if (value('bracket_code') and value('status') == 'FINAL'
+                and value('team_a_score') is not None and value('team_a_score') == value('team_b_score')):
+            raise serializers.ValidationError("A bracket game cannot end in a tie.")
+
+        # Score and status updates leave the schedule alone; skip the check for them.
+        if self.instance is not None and all(
+            value(name) == getattr(self.instance, name) for name in self.SCHEDULE_FIELDS
+        ):
+            return data
+
+        game = slot(
+            getattr(self.instance, 'pk', None),
+            getattr(team_a, 'pk', None), getattr(team_b, 'pk', None),
+            value('field_number'), value('start_time'),
+            value('duration_minutes') or Match._meta.get_field('duration_minutes').default,
+        )
+        conflicts = match_conflicts(value('tournament').pk, game)
+        if conflicts:
+            # Not a ValidationError: that would turn the ids in the payload into strings.
+            raise ScheduleConflict(conflicts)
+        return data
+
+    def create(self, validated_data):
+        validated_data.pop('version', None)
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """
+        Apply the edit only if the match is still at the version the client
+        sent, otherwise raise ScoreConflict. The conditional version bump
+        locks the row, so the save and its signals follow in the same
+        transaction without anyone else writing in between.
+        """
+        expected = validated_data.pop('version')
+        with transaction.atomic():
+            if not Match.objects.filter(pk=instance.pk, version=expected).update(version=F('version') + 1):
+                current = Match.objects.select_related('team_a', 'team_b').filter(pk=instance.pk).first()
+                raise ScoreConflict('The match was updated by someone else.', current)
+            instance.version = expected + 1
+            return super().update(instance, validated_data)
+
+
+class ScoreUpdateSerializer(serializers.Serializer):
+    """Points to add (negative to correct) and/or the status to move to."""
+    team_a_points = serializers.IntegerField(default=0, min_value=-99, max_value=99)
+    team_b_points = serializers.IntegerField(default=0, min_value=-99, max_value=99)
+    status = serializers.ChoiceField(choices=['LIVE', 'FINAL'], required=False)
+    version = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, data):
+        if not (data['team_a_points'] or data['team_b_points'] or data.get('status')):
+            raise serializers.ValidationError("Send points for a team or a status.")
+        return data
+
+
+class ProposedMatchSerializer(serializers.Serializer):
+    """One game of a proposed schedule change, for the conflict check only."""
+    id = serializers.IntegerField(required=False)
+    team_a_id = serializers.IntegerField(required=False, allow_null=True)
+    team_b_id = serializers.IntegerField(required=False, allow_null=True)
+    field_number = serializers.IntegerField(min_value=0)
+    start_time = serializers.DateTimeField()
+    duration_minutes = serializers.IntegerField(min_value=1, default=90)
+
+
 class SpiritScoreSerializer(serializers.ModelSerializer):
     class Meta:
         model = SpiritScore
         
         fields = '__all__'
         read_only_fields = ['submitting_user']
+
+
+class TeamStandingSerializer(serializers.ModelSerializer):
+    team_name = serializers.CharField(source='team.name', read_only=True)
+    rank = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = TeamStanding
+        fields = ['rank', 'team', 'team_name', 'played', 'wins', 'losses', 'ties',
+                  'points_for', 'points_against', 'point_differential']
@@ -0,0 +1,151 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .brackets import TiedBracketGame, advance, is_tied_bracket_final
+from .live import broadcast_match
+from .models import Match, PlayerRegistration, SpiritScore, Team, Tournament, TournamentVersion
+from .spirit import (
+    SPIRIT_CATEGORIES,
+    apply_contribution_change,
+    contribution_for_score,
+    score_contribution,
+)
+from .standings import apply_result_change, result_for_match
+from .response_cache import TEAM_LIST, TOURNAMENT_LIST, invalidate, invalidate_tournaments
+from . import versioning
+from users.models import CustomUser
+
+
+@receiver(pre_save, sender=Match)
+def refuse_tied_bracket_final(sender, instance, raw=False, **kwargs):
+    if not raw and is_tied_bracket_final(instance):
+        raise TiedBracketGame(f'Bracket game {instance.bracket_code} cannot end in a tie.')
+
+
+@receiver(pre_save, sender=Match)
+def remember_previous_result(sender, instance, raw=False, **kwargs):
+    """Stash what the stored row contributed before this save overwrites it."""
+    if raw or not instance.pk:
+        instance._previous_result = {}
+        return
+    previous = Match.objects.filter(pk=instance.pk).only(
+        'tournament_id', 'status', 'team_a_id', 'team_b_id', 'team_a_score', 'team_b_score'
+    ).first()
+    instance._previous_result = result_for_match(previous) if previous else {}
+
+
+@receiver(post_save, sender=Match)
+def update_standings_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_previous_result', {})
+    after = result_for_match(instance)
+    if before != after:
+        apply_result_change(before, after)
+    instance._previous_result = after
+
+
+@receiver(post_save, sender=Match)
+def advance_teams(sender, instance, raw=False, **kwargs):
+    """Move winners/losers and pool finishers into the games waiting on them."""
+    if raw or instance.status != 'FINAL':
+        return
+    advance(instance)
+
+
+@receiver(post_save, sender=Match)
+def push_live_update(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    transaction.on_commit(lambda: broadcast_match(instance))
+
+
+@receiver(post_delete, sender=Match)
+def update_standings_on_delete(sender, instance, **kwargs):
+    before = result_for_match(instance)
+    if before:
+        apply_result_change(before, {})
+
+
+@receiver(pre_save, sender=SpiritScore)
+def remember_previous_spirit(sender, instance, raw=False, **kwargs):
+    if raw or not instance.pk:
+        instance._previous_contribution = {}
+        return
+    previous = SpiritScore.objects.filter(pk=instance.pk).values(
+        'match__tournament_id', 'target_team_id', *SPIRIT_CATEGORIES
+    ).first()
+    instance._previous_contribution = score_contribution(
+        previous.pop('match__tournament_id'), previous.pop('target_team_id'), previous
+    ) if previous else {}
+
+
+@receiver(post_save, sender=SpiritScore)
+def update_spirit_summary_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_previous_contribution', {})
+    after = contribution_for_score(instance)
+    if before != after:
+        apply_contribution_change(before, after)
+    instance._previous_contribution = after
+    # The tournament bundle lists spirit scores; a retarget can move one between tournaments.
+    versioning.bump(*{tournament_id for tournament_id, _ in [*before, *after]})
+
+
+@receiver(post_delete, sender=SpiritScore)
+def update_spirit_summary_on_delete(sender, instance, **kwargs):
+    before = contribution_for_score(instance)
+    apply_contribution_change(before, {})
+    versioning.bump(*{tournament_id for tournament_id, _ in before})
+
+
+@receiver(post_save, sender=Tournament)
+def bump_version_on_tournament_save(sender, instance, created, raw=False, **kwargs):
+    if created:
+        TournamentVersion.objects.get_or_create(tournament=instance)
+    elif not raw:
+        versioning.bump(instance.pk)
+    invalidate(TOURNAMENT_LIST)
+
+
+@receiver(post_delete, sender=Tournament)
+def invalidate_deleted_tournament(sender, instance, **kwargs):
+    invalidate_tournaments(instance.pk)
+    invalidate(TOURNAMENT_LIST)
+
+
+@receiver(post_save, sender=Match)
+@receiver(post_delete, sender=Match)
+@receiver(post_save, sender=PlayerRegistration)
+@receiver(post_delete, sender=PlayerRegistration)
+def bump_version_on_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        versioning.bump(instance.tournament_id)
+
+
+@receiver(post_save, sender=Team)
+def bump_version_on_team_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        versioning.bump_for_team(instance.pk)
+    invalidate(TEAM_LIST)
+
+
+@receiver(post_delete, sender=Team)
+def invalidate_deleted_team(sender, instance, **kwargs):
+    # Its matches and registrations are deleted with it and bump their tournaments.
+    invalidate(TEAM_LIST)
+
+
+# Fields of a user that tournament and team responses embed (CustomUserSerializer).
+EMBEDDED_USER_FIELDS = {'username', 'email', 'role'}
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_version_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # A new user is on no team yet; last_login-only saves change nothing shown.
+    if created or raw or (update_fields is not None and not EMBEDDED_USER_FIELDS & set(update_fields)):
+        return
+    if versioning.bump_for_user(instance.pk):
+        invalidate(TEAM_LIST)
@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from visionx.counters import apply_counter_change, sum_contributions
+from .models import Match, SpiritScore, SpiritScoreSummary
+
+
+SPIRIT_CATEGORIES = [
+    'rules_knowledge', 'fouls_contact', 'fair_mindedness',
+    'positive_attitude', 'communication',
+]
+SUMMARY_FIELDS = ['submissions'] + SPIRIT_CATEGORIES + ['total']
+
+
+def score_contribution(tournament_id, target_team_id, categories):
+    """
+    Return what one SpiritScore adds to its team's summary as
+    ``{(tournament_id, team_id): {field: delta}}``.
+    """
+    contribution = {'submissions': 1, 'total': sum(categories.values())}
+    contribution.update(categories)
+    return {(tournament_id, target_team_id): contribution}
+
+
+def contribution_for_score(spirit_score):
+    return score_contribution(
+        spirit_score.match.tournament_id,
+        spirit_score.target_team_id,
+        {category: getattr(spirit_score, category) for category in SPIRIT_CATEGORIES},
+    )
+
+
+def apply_contribution_change(before, after):
+    """Move the running sums from the ``before`` contribution to the ``after`` one."""
+    apply_counter_change(SpiritScoreSummary, SUMMARY_FIELDS, before, after)
+
+
+def leaderboard(tournament_id):
+    """Per-team averages, highest average total first."""
+    rows = []
+    summaries = SpiritScoreSummary.objects.filter(
+        tournament_id=tournament_id, submissions__gt=0
+    ).select_related('team')
+    for summary in summaries:
+        row = {
+            'team': summary.team_id,
+            'team_name': summary.team.name,
+            'submissions': summary.submissions,
+        }
+        for field in SPIRIT_CATEGORIES + ['total']:
+            row[field] = round(getattr(summary, field) / summary.submissions, 2)
+        rows.append(row)
+
+    rows.sort(key=lambda row: (-row['total'], row['team_name']))
+    return rows
+
+
+def missing_submissions(tournament_id):
+    """
+    FINAL matches that are still waiting on a spirit score for one or both
+    teams, found with a single grouped query.
+    """
+    matches = Match.objects.filter(tournament_id=tournament_id, status='FINAL').annotate(
+        received_a=Count('spirit_scores', filter=Q(spirit_scores__target_team=F('team_a'))),
+        received_b=Count('spirit_scores', filter=Q(spirit_scores__target_team=F('team_b'))),
+    ).filter(Q(received_a=0) | Q(received_b=0)).values(
+        'id', 'team_a_id', 'team_b_id', 'received_a', 'received_b'
+    ).order_by('start_time', 'id')
+
+    return [
+        {
+            'match': match['id'],
+            'missing_for': [
+                team_id for team_id, received in (
+                    (match['team_a_id'], match['received_a']),
+                    (match['team_b_id'], match['received_b']),
+                ) if not received
+            ],
+        }
+        for match in matches
+    ]
+
+
+def rebuild_spirit_summaries(tournament):
+    """Recompute a tournament's spirit summaries from its SpiritScore rows."""
+    scores = SpiritScore.objects.filter(match__tournament=tournament).values_list(
+        'target_team_id', *SPIRIT_CATEGORIES
+    )
+    totals = sum_contributions(SUMMARY_FIELDS, (
+        score_contribution(tournament.pk, target_team_id, dict(zip(SPIRIT_CATEGORIES, values)))
+        for target_team_id, *values in scores
+    ))
+
+    with transaction.atomic():
+        SpiritScoreSummary.objects.filter(tournament=tournament).delete()
+        SpiritScoreSummary.objects.bulk_create([
+            SpiritScoreSummary(tournament_id=tournament_id, team_id=team_id, **row)
+            for (tournament_id, team_id), row in totals.items()
+        ])
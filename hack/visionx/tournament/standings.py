@@ -0,0 +1,83 @@
+from django.db import transaction
+
+from visionx.counters import apply_counter_change, sum_contributions
+from .models import Match, TeamStanding
+
+
+# TeamStanding rows follow Match saves and deletes through the signals in
+# signals.py. QuerySet.update(), bulk_create() and bulk_update() send no
+# signals: code that writes matches that way must apply the result change
+# itself (see scoring.record_score) or run the rebuild_standings command.
+
+STANDING_FIELDS = [
+    'played', 'wins', 'losses', 'ties',
+    'points_for', 'points_against', 'point_differential',
+]
+
+
+def match_result(tournament_id, status, team_a_id, team_b_id, team_a_score, team_b_score):
+    """
+    Return what a match contributes to the standings table as
+    ``{(tournament_id, team_id): {field: delta}}``, or an empty dict if it
+    does not count yet.
+    Only FINAL matches with both scores recorded are counted.
+    """
+    if status != 'FINAL' or team_a_score is None or team_b_score is None:
+        return {}
+    if team_a_id is None or team_b_id is None:
+        return {}
+
+    result = {}
+    for team_id, scored, conceded in (
+        (team_a_id, team_a_score, team_b_score),
+        (team_b_id, team_b_score, team_a_score),
+    ):
+        result[(tournament_id, team_id)] = {
+            'played': 1,
+            'wins': int(scored > conceded),
+            'losses': int(scored < conceded),
+            'ties': int(scored == conceded),
+            'points_for': scored,
+            'points_against': conceded,
+            'point_differential': scored - conceded,
+        }
+    return result
+
+
+def result_for_match(match):
+    return match_result(
+        match.tournament_id, match.status, match.team_a_id, match.team_b_id,
+        match.team_a_score, match.team_b_score,
+    )
+
+
+def apply_result_change(before, after):
+    """Move the standings from the ``before`` contribution of a match to the ``after`` one."""
+    apply_counter_change(TeamStanding, STANDING_FIELDS, before, after)
+
+
+def seed_standings(tournament, team_ids):
+    """Make sure every scheduled team has a (zeroed) row in the table."""
+    TeamStanding.objects.bulk_create(
+        [TeamStanding(tournament=tournament, team_id=team_id) for team_id in team_ids],
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_standings(tournament):
+    """Recompute a tournament's standings from scratch out of its matches."""
+    matches = list(Match.objects.filter(tournament=tournament).values_list(
+        'tournament_id', 'status', 'team_a_id', 'team_b_id', 'team_a_score', 'team_b_score'
+    ))
+    totals = sum_contributions(STANDING_FIELDS, (match_result(*match) for match in matches))
+    # Teams that have not finished a game yet still get a zeroed row.
+    for match in matches:
+        for team_id in (match[2], match[3]):
+            totals.setdefault((match[0], team_id), dict.fromkeys(STANDING_FIELDS, 0))
+
+    with transaction.atomic():
+        TeamStanding.objects.filter(tournament=tournament).delete()
+        TeamStanding.objects.bulk_create([
+            TeamStanding(tournament_id=tournament_id, team_id=team_id, **row)
+            for (tournament_id, team_id), row in totals.items()
+        ])
@@ -1,3 +1,1100 @@
-from django.test import TestCase
+import asyncio
+import threading
+import time
+from io import StringIO
+from unittest import mock
+from datetime import date, datetime, timedelta, timezone
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import Q
+from django.test import AsyncClient, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as dj_timezone
+from rest_framework.test import APITestCase
+
+from users.models import CustomUser
+from visionx.pagination import KeysetPagination
+from .models import (
+    Tournament, Team, PlayerRegistration, Match, SpiritScore, SpiritScoreSummary, TeamStanding,
+    TournamentVersion,
+)
+from .brackets import TiedBracketGame, seed_pools
+from .management.commands.benchmark_indexes import Command as BenchmarkIndexes
+from .live import InProcessBroker, broadcast_match
+from .ranking import ResultTable
+from .reports import field_occupancy
+from .scheduling import build_schedule, round_robin_rounds
+from .scoring import ScoreConflict, record_score
+from .serializers import PlayerRegistrationBulkCreateSerializer
+from .spirit import leaderboard, rebuild_spirit_summaries
+from .standings import rebuild_standings
+
+
+class SchedulingTests(TestCase):
+
+    def assertValidSchedule(self, team_ids, schedule, slot_minutes=90, rest_minutes=0):
+        pairs = [frozenset((team_a, team_b)) for team_a, team_b, _, _ in schedule]
+        expected = {frozenset((a, b)) for a in team_ids for b in team_ids if a < b}
+        self.assertEqual(len(pairs), len(expected))
+        self.assertEqual(set(pairs), expected)
+
+        booked, last_end = set(), {}
+        for team_a, team_b, start, field in sorted(schedule, key=lambda game: game[2]):
+            self.assertNotIn((start, 'field', field), booked)
+            booked.add((start, 'field', field))
+            for team in (team_a, team_b):
+                self.assertNotIn((start, 'team', team), booked)
+                booked.add((start, 'team', team))
+                if team in last_end:
+                    self.assertGreaterEqual((start - last_end[team]).total_seconds() / 60, rest_minutes)
+                last_end[team] = start + timedelta(minutes=slot_minutes)
+
+    def test_every_pairing_once_and_nobody_double_booked(self):
+        for count in (2, 4, 7, 12):
+            team_ids = list(range(1, count + 1))
+            self.assertValidSchedule(team_ids, build_schedule(team_ids, date(2025, 11, 5), fields=3))
+
+    def test_odd_team_count_gives_one_bye_per_round(self):
+        team_ids = [1, 2, 3, 4, 5]
+        rounds = round_robin_rounds(team_ids)
+        self.assertEqual(len(rounds), 5)
+        for pairings in rounds:
+            playing = [team for pairing in pairings for team in pairing]
+            self.assertEqual(len(playing), 4)
+            self.assertEqual(len(set(playing)), 4)
+
+    def test_rest_between_games(self):
+        team_ids = list(range(1, 7))
+        schedule = build_schedule(team_ids, date(2025, 11, 5), fields=3, slot_minutes=60, rest_minutes=60)
+        self.assertValidSchedule(team_ids, schedule, slot_minutes=60, rest_minutes=60)
+
+    def test_games_stay_inside_the_day_window(self):
+        schedule = build_schedule(range(1, 9), date(2025, 11, 5), fields=1)
+        for _, _, start, field in schedule:
+            local = dj_timezone.localtime(start)
+            self.assertEqual(field, 1)
+            self.assertGreaterEqual(local.hour, 9)
+            self.assertLessEqual(local.hour * 60 + local.minute + 90, 18 * 60)
+
+
+class ReadQueryCountTests(APITestCase):
+    """
+    Every read endpoint must run the same number of queries whatever the
+    number of rows it returns. Each test measures the endpoint, adds more
+    rows, and measures it again.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_user(
+            username='director', password='pw', role='ADMIN', is_staff=True
+        )
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        self.teams = []
+        self.client.force_authenticate(self.admin)
+
+    def add_teams(self, count, players_per_team=3):
+        for _ in range(count):
+            index = len(self.teams)
+            captain = CustomUser.objects.create_user(username=f'captain{index}', role='MANAGER')
+            team = Team.objects.create(name=f'Team {index}', captain=captain)
+            PlayerRegistration.objects.create(player=captain, team=team, tournament=self.tournament)
+            for number in range(players_per_team - 1):
+                player = CustomUser.objects.create_user(username=f'player{index}_{number}', role='PLAYER')
+                PlayerRegistration.objects.create(player=player, team=team, tournament=self.tournament)
+            if self.teams:
+                Match.objects.create(
+                    tournament=self.tournament, team_a=self.teams[-1], team_b=team,
+                    start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+                )
+            self.teams.append(team)
+
+    def assertConstantQueries(self, url, expected, user=None):
+        if user is not None:
+            self.client.force_authenticate(user)
+        self.add_teams(2)
+        with self.assertNumQueries(expected):
+            small = self.client.get(url)
+        self.add_teams(8)
+        with self.assertNumQueries(expected):
+            large = self.client.get(url)
+        self.assertEqual(small.status_code, 200)
+        self.assertEqual(large.status_code, 200)
+        return large
+
+    def test_team_list(self):
+        self.assertConstantQueries('/api/tournaments/teams/', 1)
+
+    def test_registration_list(self):
+        response = self.assertConstantQueries('/api/tournaments/registrations/', 1)
+        self.assertEqual(len(response.data), 30)
+
+    def test_match_list(self):
+        self.assertConstantQueries('/api/tournaments/matches/', 1)
+
+    def test_tournament_matches(self):
+        self.assertConstantQueries(f'/api/tournaments/{self.tournament.pk}/matches/', 2)
+
+    def test_tournament_teams(self):
+        self.assertConstantQueries(f'/api/tournaments/{self.tournament.pk}/teams/', 2)
+
+    def test_tournament_bundle(self):
+        url = f'/api/tournaments/{self.tournament.pk}/bundle/'
+        self.add_teams(2)
+        self.add_spirit_scores()
+        with self.assertNumQueries(5):
+            small = self.client.get(url)
+        self.add_teams(8)
+        self.add_spirit_scores()
+        with self.assertNumQueries(5):
+            large = self.client.get(url)
+        self.assertEqual(len(small.data['spirit_scores']['rows']), 2)
+        self.assertEqual(len(large.data['teams']['rows']), 10)
+        self.assertEqual(len(large.data['matches']['rows']), 9)
+        self.assertEqual(len(large.data['spirit_scores']['rows']), 18)
+
+    def test_bundle_lists_unregistered_teams_and_new_spirit_scores(self):
+        url = f'/api/tournaments/{self.tournament.pk}/bundle/'
+        self.add_teams(2)
+        guest = Team.objects.create(name='Guest', captain=self.admin)
+        match = Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[0], team_b=guest,
+            start_time=datetime(2025, 11, 5, 11, tzinfo=timezone.utc), field_number=2
+        )
+        bundle = self.client.get(url).data
+        self.assertEqual([row[0] for row in bundle['teams']['rows']], [team.pk for team in self.teams] + [guest.pk])
+
+        SpiritScore.objects.create(match=match, submitting_user=self.admin, target_team=guest)
+        rows = self.client.get(url).data['spirit_scores']['rows']
+        self.assertEqual([(row[1], row[2]) for row in rows], [(match.pk, guest.pk)])
+
+    def add_spirit_scores(self):
+        for match in Match.objects.filter(spirit_scores__isnull=True):
+            for team in (match.team_a, match.team_b):
+                SpiritScore.objects.create(match=match, submitting_user=self.admin, target_team=team)
+
+    def test_field_report(self):
+        response = self.assertConstantQueries(f'/api/tournaments/{self.tournament.pk}/field-report/', 3)
+        self.assertEqual(response.data['fields'][0]['games'], 9)
+        self.assertEqual(len(response.data['teams']), 10)
+
+    def test_team_search(self):
+        self.add_teams(3)
+        Team.objects.create(name='Flying Discs', captain=self.admin)
+        response = self.client.get('/api/tournaments/teams/search/', {'q': 'team'})
+        self.assertEqual([row['name'] for row in response.data], ['Team 0', 'Team 1', 'Team 2'])
+        response = self.client.get('/api/tournaments/teams/search/', {'q': 'disc'})
+        self.assertEqual(response.data, [{'id': Team.objects.get(name='Flying Discs').pk,
+                                          'name': 'Flying Discs', 'captain_id': self.admin.pk}])
+        self.assertEqual(self.client.get('/api/tournaments/teams/search/').status_code, 400)
+
+    def test_team_roster(self):
+        self.add_teams(1)
+        team = self.teams[0]
+        self.client.force_authenticate(team.captain)
+        url = f'/api/tournaments/teams/{team.pk}/roster/'
+        with self.assertNumQueries(2):
+            small = self.client.get(url)
+        for number in range(10):
+            player = CustomUser.objects.create_user(username=f'extra{number}', role='PLAYER')
+            PlayerRegistration.objects.create(player=player, team=team, tournament=self.tournament)
+        with self.assertNumQueries(2):
+            large = self.client.get(url)
+        self.assertEqual(len(small.data), 3)
+        self.assertEqual(len(large.data), 13)
+
+    def test_standings(self):
+        url = f'/api/tournaments/{self.tournament.pk}/standings/'
+        self.add_teams(2)
+        self.finish_matches()
+        with self.assertNumQueries(3):
+            small = self.client.get(url)
+        self.add_teams(8)
+        self.finish_matches()
+        with self.assertNumQueries(3):
+            large = self.client.get(url)
+        self.assertEqual(len(small.data), 2)
+        self.assertEqual(len(large.data), 10)
+
+    def finish_matches(self):
+        for match in Match.objects.filter(status='SCHEDULED'):
+            match.status = 'FINAL'
+            match.team_a_score, match.team_b_score = 15, 11
+            match.save()
+
+
+class BulkRegistrationTests(APITestCase):
+
+    def setUp(self):
+        self.captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        self.team = Team.objects.create(name='Discs', captain=self.captain)
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        for index in range(5):
+            CustomUser.objects.create_user(username=f'player{index}', role='PLAYER')
+        self.client.force_authenticate(self.captain)
+
+    def test_registers_valid_rows_and_reports_the_rest(self):
+        PlayerRegistration.objects.create(
+            player=CustomUser.objects.get(username='player4'), team=self.team, tournament=self.tournament
+        )
+        response = self.client.post('/api/tournaments/registrations/bulk/', {
+            'team': self.team.pk,
+            'tournament': self.tournament.pk,
+            'usernames': ['player0', 'player1', 'ghost', 'player1', 'player4'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], ['player0', 'player1'])
+        self.assertEqual([error['row'] for error in response.data['errors']], [3, 4, 5])
+        self.assertEqual(PlayerRegistration.objects.filter(team=self.team).count(), 3)
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile('roster.csv', b'username\nplayer0\nplayer2\n', content_type='text/csv')
+        response = self.client.post('/api/tournaments/registrations/bulk/', {
+            'team': self.team.pk, 'tournament': self.tournament.pk, 'file': upload,
+        }, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], ['player0', 'player2'])
+
+    def test_concurrent_registration_is_not_reported_as_created(self):
+        registered = PlayerRegistrationBulkCreateSerializer.registered_players
+        calls = []
+
+        def race(tournament, player_ids):
+            # Another request registers player1 for the same team right after the validation read.
+            if not calls:
+                PlayerRegistration.objects.create(
+                    player=CustomUser.objects.get(username='player1'), team=self.team, tournament=self.tournament
+                )
+            calls.append(player_ids)
+            return registered(tournament, player_ids)
+
+        with mock.patch.object(PlayerRegistrationBulkCreateSerializer, 'registered_players', side_effect=race):
+            response = self.client.post('/api/tournaments/registrations/bulk/', {
+                'team': self.team.pk, 'tournament': self.tournament.pk, 'usernames': ['player0', 'player1'],
+            }, format='json')
+
+        self.assertEqual(response.data['created'], ['player0'])
+        self.assertEqual(response.data['errors'][0]['username'], 'player1')
+        self.assertEqual(PlayerRegistration.objects.filter(team=self.team).count(), 2)
+
+    def test_only_the_captain_can_register(self):
+        self.client.force_authenticate(CustomUser.objects.get(username='player0'))
+        response = self.client.post('/api/tournaments/registrations/bulk/', {
+            'team': self.team.pk, 'tournament': self.tournament.pk, 'usernames': ['player1'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PlayerRegistration.objects.exists())
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        self.teams = [Team.objects.create(name=f'Team {index}', captain=captain) for index in range(2)]
+        self.match = Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[0], team_b=self.teams[1],
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+        self.url = f'/api/tournaments/{self.tournament.pk}/matches/'
+
+    def test_unchanged_tournament_answers_304_from_the_cache(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_score_update_changes_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.match.team_a_score = 3
+        self.match.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_team_rename_changes_the_etag(self):
+        PlayerRegistration.objects.create(player=self.teams[0].captain, team=self.teams[0], tournament=self.tournament)
+        url = f'/api/tournaments/{self.tournament.pk}/teams/'
+        etag = self.client.get(url)['ETag']
+        self.teams[0].name = 'Renamed'
+        self.teams[0].save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_captain_rename_changes_the_etag(self):
+        captain = self.teams[0].captain
+        PlayerRegistration.objects.create(player=captain, team=self.teams[0], tournament=self.tournament)
+        url = f'/api/tournaments/{self.tournament.pk}/teams/'
+        etag = self.client.get(url)['ETag']
+        captain.save(update_fields=['last_login'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        captain.username = 'skipper'
+        captain.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_tournament_detail(self):
+        url = f'/api/tournaments/{self.tournament.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class ResponseCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        self.teams = [Team.objects.create(name=f'Team {index}', captain=captain) for index in range(2)]
+        self.match = Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[0], team_b=self.teams[1],
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+        self.url = f'/api/tournaments/{self.tournament.pk}/matches/'
+
+    def test_repeated_reads_come_from_memory(self):
+        for url in (self.url, '/api/tournaments/', '/api/tournaments/teams/',
+                    f'/api/tournaments/{self.tournament.pk}/'):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(first.data, second.data)
+
+    def test_score_update_is_never_stale(self):
+        self.client.get(self.url)
+        self.match.team_a_score = 7
+        self.match.save()
+        self.assertEqual(self.client.get(self.url).data[0]['team_a_score'], 7)
+
+    def test_team_rename_reaches_every_cached_list(self):
+        self.client.get(self.url)
+        self.client.get('/api/tournaments/teams/')
+        self.teams[0].name = 'Renamed'
+        self.teams[0].save()
+        self.assertEqual(self.client.get(self.url).data[0]['team_a'], 'Renamed')
+        names = [team['name'] for team in self.client.get('/api/tournaments/teams/').data]
+        self.assertIn('Renamed', names)
+
+    def test_captain_rename_reaches_the_team_list(self):
+        self.client.get('/api/tournaments/teams/')
+        captain = self.teams[0].captain
+        captain.username = 'skipper'
+        captain.save()
+        captains = {team['captain']['username'] for team in self.client.get('/api/tournaments/teams/').data}
+        self.assertEqual(captains, {'skipper'})
+
+    def test_new_tournament_shows_up_in_the_list(self):
+        self.client.get('/api/tournaments/')
+        Tournament.objects.create(
+            title='Indoor', start_date=date(2025, 12, 1), end_date=date(2025, 12, 2), location='Hall'
+        )
+        self.assertEqual(len(self.client.get('/api/tournaments/').data), 2)
+
+
+class ScheduleConflictTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_user(username='director', role='ADMIN', is_staff=True)
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        self.teams = [Team.objects.create(name=f'Team {index}', captain=self.admin) for index in range(4)]
+        self.match = Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[0], team_b=self.teams[1],
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+        self.client.force_authenticate(self.admin)
+
+    def create(self, **fields):
+        return self.client.post('/api/tournaments/matches/', {
+            'tournament': self.tournament.pk, 'field_number': 2,
+            'start_time': '2025-11-05T09:30:00Z', **fields,
+        }, format='json')
+
+    def test_rejects_a_double_booked_field(self):
+        response = self.create(field_number=1)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['conflicts'][0]['type'], 'field')
+
+    def test_rejects_a_double_booked_team(self):
+        response = self.create(team_a_id=self.teams[1].pk, team_b_id=self.teams[2].pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['conflicts'][0]['team'], self.teams[1].pk)
+        self.assertEqual(response.data['conflicts'][0]['other_match'], self.match.pk)
+
+    def test_accepts_a_free_slot_and_score_updates(self):
+        response = self.create(team_a_id=self.teams[2].pk, team_b_id=self.teams[3].pk)
+        self.assertEqual(response.status_code, 201)
+        response = self.client.patch(f'/api/tournaments/matches/{self.match.pk}/',
+                                     {'team_a_score': 4, 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_moving_a_match_onto_another(self):
+        other = Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[2], team_b=self.teams[3],
+            start_time=datetime(2025, 11, 5, 11, tzinfo=timezone.utc), field_number=1
+        )
+        url = f'/api/tournaments/matches/{other.pk}/'
+        response = self.client.patch(url, {'start_time': '2025-11-05T10:00:00Z', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(url, {'start_time': '2025-11-05T10:30:00Z', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_validation_endpoint(self):
+        url = f'/api/tournaments/{self.tournament.pk}/schedule/conflicts/'
+        self.assertEqual(self.client.get(url).data['conflicts'], [])
+        response = self.client.post(url, {'matches': [
+            {'team_a_id': self.teams[0].pk, 'team_b_id': self.teams[2].pk,
+             'field_number': 3, 'start_time': '2025-11-05T10:00:00Z'},
+        ]}, format='json')
+        self.assertEqual(response.data['conflicts'], [
+            {'type': 'team', 'team': self.teams[0].pk, 'match': 'new-0', 'other_match': self.match.pk},
+        ])
+        self.assertEqual(Match.objects.count(), 1)
+
+
+class ScoreUpdateTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.volunteer = CustomUser.objects.create_user(username='scorer', role='VOLUNTEER')
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        teams = [Team.objects.create(name=f'Team {index}', captain=self.volunteer) for index in range(2)]
+        self.match = Match.objects.create(
+            tournament=self.tournament, team_a=teams[0], team_b=teams[1],
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+        self.url = f'/api/tournaments/matches/{self.match.pk}/score/'
+        self.client.force_authenticate(self.volunteer)
+
+    def test_increments_add_up_and_start_the_match(self):
+        self.client.post(self.url, {'team_a_points': 1}, format='json')
+        response = self.client.post(self.url, {'team_a_points': 1, 'team_b_points': 1}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['team_a_score'], response.data['team_b_score']), (2, 1))
+        self.assertEqual(response.data['status'], 'LIVE')
+        self.assertEqual(response.data['version'], 3)
+
+    def test_stale_version_is_refused(self):
+        version = self.client.post(self.url, {'team_a_points': 1}, format='json').data['version']
+        self.client.post(self.url, {'team_b_points': 1}, format='json')
+        response = self.client.post(self.url, {'team_a_points': 1, 'version': version}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['match']['team_a_score'], 1)
+
+    def test_final_updates_standings_and_locks_the_score(self):
+        self.client.post(self.url, {'team_a_points': 3}, format='json')
+        self.assertEqual(self.client.post(self.url, {'status': 'FINAL'}, format='json').status_code, 200)
+        standings = self.client.get(f'/api/tournaments/{self.tournament.pk}/standings/').data
+        self.assertEqual(standings[0]['wins'], 1)
+        self.assertEqual(self.client.post(self.url, {'team_a_points': 1}, format='json').status_code, 409)
+
+    def test_score_cannot_go_negative(self):
+        response = self.client.post(self.url, {'team_a_points': -1}, format='json')
+        self.assertEqual(response.status_code, 409)
+
+    def test_failing_receiver_rolls_the_score_back(self):
+        with mock.patch('tournament.signals.advance', side_effect=RuntimeError('receiver failed')):
+            with self.assertRaises(RuntimeError):
+                record_score(self.match.pk, status='FINAL', team_a_points=3)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.status, self.match.team_a_score, self.match.version), ('SCHEDULED', None, 1))
+        self.assertFalse(TeamStanding.objects.filter(tournament=self.tournament, played__gt=0).exists())
+
+    def test_match_edits_need_the_current_version(self):
+        url = f'/api/tournaments/matches/{self.match.pk}/'
+        self.assertEqual(self.client.patch(url, {'team_a_score': 4}, format='json').status_code, 400)
+        self.assertEqual(self.client.patch(url, {'team_a_score': 4, 'version': 1}, format='json').data['version'], 2)
+
+        response = self.client.patch(url, {'team_a_score': 9, 'version': 1}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['match']['team_a_score'], 4)
+        self.match.refresh_from_db()
+        self.assertEqual((self.match.team_a_score, self.match.version), (4, 2))
+
+
+class IncrementalScheduleTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_user(username='director', role='ADMIN', is_staff=True)
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        self.teams = [self.register(index) for index in range(4)]
+        self.url = f'/api/tournaments/{self.tournament.pk}/generate_schedule/'
+        self.client.force_authenticate(self.admin)
+        self.client.post(self.url, {}, format='json')
+
+    def register(self, index):
+        captain = CustomUser.objects.create_user(username=f'captain{index}', role='MANAGER')
+        team = Team.objects.create(name=f'Team {index}', captain=captain)
+        PlayerRegistration.objects.create(player=captain, team=team, tournament=self.tournament)
+        return team
+
+    def version(self):
+        return TournamentVersion.objects.get(tournament=self.tournament).version
+
+    def test_late_team_keeps_played_games(self):
+        played = Match.objects.filter(tournament=self.tournament).first()
+        played.status, played.team_a_score, played.team_b_score = 'FINAL', 15, 9
+        played.save()
+        untouched = set(Match.objects.values_list('id', flat=True))
+
+        self.register(4)
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.data['added'], 4)
+        self.assertTrue(untouched <= set(Match.objects.values_list('id', flat=True)))
+        self.assertEqual(Match.objects.count(), 10)
+        conflicts = self.client.get(f'/api/tournaments/{self.tournament.pk}/schedule/conflicts/').data
+        self.assertEqual(conflicts['conflicts'], [])
+
+    def test_withdrawn_team_loses_only_unplayed_games(self):
+        withdrawn = self.teams[3]
+        played = Match.objects.filter(Q(team_a=withdrawn) | Q(team_b=withdrawn)).first()
+        played.status, played.team_a_score, played.team_b_score = 'FINAL', 15, 9
+        played.save()
+        PlayerRegistration.objects.filter(team=withdrawn).delete()
+
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual((response.data['added'], response.data['removed']), (0, 2))
+        self.assertTrue(Match.objects.filter(pk=played.pk).exists())
+
+    def test_added_games_start_from_the_requested_date(self):
+        before = set(Match.objects.values_list('id', flat=True))
+        self.register(4)
+        response = self.client.post(self.url, {'start_date': '2025-11-06'}, format='json')
+        self.assertEqual(response.data['added'], 4)
+        added = Match.objects.exclude(id__in=before)
+        self.assertEqual(min(match.start_time for match in added).date(), date(2025, 11, 6))
+
+    def test_pool_and_bracket_tournaments_are_not_extended(self):
+        bracket_url = f'/api/tournaments/{self.tournament.pk}/generate_bracket/'
+        self.assertEqual(self.client.post(bracket_url, {'pool_count': 2, 'advance': 1}, format='json').status_code, 201)
+
+        response = self.client.post(self.url, {'mode': 'incremental'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Match.objects.filter(stage='BRACKET').exists())
+
+        # Without a mode the schedule is replaced, not topped up with a second round-robin.
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(Match.objects.values_list('stage', flat=True)), {'ROUND_ROBIN'})
+        self.assertEqual(Match.objects.count(), 6)
+
+    def test_replacing_the_schedule_bumps_the_version_once(self):
+        for index in range(4, 10):
+            self.register(index)
+        self.client.post(self.url, {'mode': 'replace'}, format='json')
+        version = self.version()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'mode': 'replace'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        bumps = [query for query in queries if query['sql'].startswith('UPDATE "tournament_tournamentversion"')]
+        self.assertEqual(len(bumps), 1)
+        self.assertEqual(self.version(), version + 1)
+
+    def test_deleting_a_team_bumps_each_tournament_once(self):
+        version = self.version()
+        self.client.force_authenticate(self.teams[0].captain)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.delete(f'/api/tournaments/teams/{self.teams[0].pk}/').status_code, 204)
+        bumps = [query for query in queries if query['sql'].startswith('UPDATE "tournament_tournamentversion"')]
+        self.assertEqual(len(bumps), 1)
+        self.assertEqual(self.version(), version + 1)
+
+
+class BracketTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUser.objects.create_user(username='director', role='ADMIN', is_staff=True)
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        self.teams = []
+        for index in range(4):
+            captain = CustomUser.objects.create_user(username=f'captain{index}', role='MANAGER')
+            team = Team.objects.create(name=f'Team {index}', captain=captain)
+            PlayerRegistration.objects.create(player=captain, team=team, tournament=self.tournament)
+            self.teams.append(team)
+        self.url = f'/api/tournaments/{self.tournament.pk}/generate_bracket/'
+        self.client.force_authenticate(self.admin)
+
+    def generate(self, **options):
+        response = self.client.post(self.url, dict({'pool_count': 2, 'advance': 1}, **options), format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def finish(self, match, score_a, score_b):
+        match.status, match.team_a_score, match.team_b_score = 'FINAL', score_a, score_b
+        match.save()
+
+    def test_snake_seeding(self):
+        self.assertEqual(seed_pools(list(range(1, 9)), 2), {'A': [1, 4, 5, 8], 'B': [2, 3, 6, 7]})
+        self.assertEqual(seed_pools(list(range(1, 7)), 3), {'A': [1, 6], 'B': [2, 5], 'C': [3, 4]})
+        with self.assertRaises(ValueError):
+            seed_pools([1, 2, 3], 2)
+
+    def test_pools_and_placeholder_games(self):
+        data = self.generate()
+        self.assertEqual((data['pool_matches'], data['bracket_matches']), (2, 1))
+        for pool, members in data['pools'].items():
+            game = Match.objects.get(tournament=self.tournament, stage='POOL', pool=pool)
+            self.assertEqual({game.team_a_id, game.team_b_id}, set(members))
+        final = Match.objects.get(tournament=self.tournament, stage='BRACKET')
+        self.assertEqual((final.team_a_source, final.team_b_source), ('POOL:A:1', 'POOL:B:1'))
+        self.assertIsNone(final.team_a_id)
+
+    def test_unseeded_teams_follow_the_ranking(self):
+        team_0, team_1, team_2, team_3 = (team.pk for team in self.teams)
+        Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[3], team_b=self.teams[0], status='FINAL',
+            team_a_score=15, team_b_score=5, start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+        # team 1 seeded first by hand; the rest by record: 3 (won), 2 (not played), 0 (lost).
+        data = self.generate(seeding=[team_1])
+        self.assertEqual(data['pools'], {'A': [team_1, team_0], 'B': [team_3, team_2]})
+
+    def test_finished_pools_and_games_fill_the_bracket(self):
+        self.generate(pool_count=1, advance=4, format='placement')
+        pool_games = list(Match.objects.filter(tournament=self.tournament, stage='POOL'))
+        ranking = [self.teams[index].pk for index in (2, 0, 3, 1)]
+        for game in pool_games[:-1]:
+            better = min((game.team_a_id, game.team_b_id), key=ranking.index)
+            self.finish(game, 15 if better == game.team_a_id else 5, 5 if better == game.team_a_id else 15)
+        self.assertFalse(Match.objects.filter(stage='BRACKET', team_a__isnull=False).exists())
+
+        last = pool_games[-1]
+        better = min((last.team_a_id, last.team_b_id), key=ranking.index)
+        with mock.patch('tournament.signals.broadcast_match') as broadcast:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.finish(last, 15 if better == last.team_a_id else 5, 5 if better == last.team_a_id else 15)
+
+        semis = {game.bracket_code: game for game in Match.objects.filter(stage='BRACKET', team_a__isnull=False)}
+        self.assertEqual(
+            {code: (game.team_a_id, game.team_b_id) for code, game in semis.items()},
+            {'P1-4M1': (ranking[0], ranking[3]), 'P1-4M2': (ranking[1], ranking[2])},
+        )
+        # Filled through save(): versions bumped and the live update sent for each game.
+        self.assertTrue(all(game.version == 2 for game in semis.values()))
+        self.assertTrue({game.pk for game in semis.values()} <= {call.args[0].pk for call in broadcast.call_args_list})
+
+        self.finish(semis['P1-4M1'], 15, 10)
+        self.finish(semis['P1-4M2'], 8, 15)
+        final = Match.objects.get(bracket_code='P1-2M1')
+        third = Match.objects.get(bracket_code='P3-4M1')
+        self.assertEqual((final.team_a_id, final.team_b_id), (ranking[0], ranking[2]))
+        self.assertEqual((third.team_a_id, third.team_b_id), (ranking[3], ranking[1]))
+
+    def test_tied_bracket_game_is_refused(self):
+        self.generate()
+        for game in Match.objects.filter(tournament=self.tournament, stage='POOL'):
+            self.finish(game, 15, 10)
+        final = Match.objects.get(tournament=self.tournament, stage='BRACKET')
+        self.assertIsNotNone(final.team_b_id)
+
+        response = self.client.patch(
+            f'/api/tournaments/matches/{final.pk}/',
+            {'status': 'FINAL', 'team_a_score': 12, 'team_b_score': 12, 'version': final.version}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+        record_score(final.pk, team_a_points=12, team_b_points=12)
+        with self.assertRaises(ScoreConflict):
+            record_score(final.pk, status='FINAL')
+        final.refresh_from_db()
+        self.assertEqual(final.status, 'LIVE')
+
+        with self.assertRaises(TiedBracketGame):
+            self.finish(final, 12, 12)
+        final.refresh_from_db()
+        self.assertEqual(final.status, 'LIVE')
+
+
+class FieldOccupancyTests(TestCase):
+
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+
+    def add_game(self, hour, minute, duration, field_number=1):
+        Match.objects.create(
+            tournament=self.tournament, field_number=field_number, duration_minutes=duration,
+            start_time=datetime(2025, 11, 5, hour, minute, tzinfo=timezone.utc),
+        )
+
+    def test_game_crossing_a_bucket_boundary_is_split(self):
+        self.add_game(9, 30, 90)
+        self.add_game(10, 0, 60, field_number=2)
+        rows = [
+            (row['bucket'].hour, row['field_number'], row['games'], row['minutes'], row['utilization'])
+            for row in field_occupancy(self.tournament.pk)
+        ]
+        self.assertEqual(rows, [(9, 1, 1, 30, 0.5), (10, 1, 1, 60, 1.0), (10, 2, 1, 60, 1.0)])
+
+    def test_game_crossing_midnight_counts_on_both_days(self):
+        self.add_game(23, 0, 90)
+        rows = [(row['bucket'].day, row['minutes']) for row in field_occupancy(self.tournament.pk, 'day')]
+        self.assertEqual(rows, [(5, 60), (6, 30)])
+
+
+class RankingTests(TestCase):
+
+    def test_head_to_head_beats_point_differential(self):
+        # 1 and 2 both 2-1; 2 has the better differential but lost to 1.
+        results = [(1, 2, 15, 14), (1, 3, 10, 15), (2, 3, 15, 5), (1, 4, 15, 13), (2, 4, 15, 10), (3, 4, 5, 15)]
+        self.assertEqual(ResultTable([1, 2, 3, 4], results).ranking()[:2], [1, 2])
+
+    def test_three_way_tie_uses_differential_inside_the_group(self):
+        # 1 > 2 > 3 > 1: head-to-head is level, so only these three games' differential counts.
+        results = [(1, 2, 15, 13), (2, 3, 15, 7), (3, 1, 15, 14), (1, 4, 15, 0), (2, 4, 15, 14), (3, 4, 15, 14)]
+        self.assertEqual(ResultTable([1, 2, 3, 4], results).ranking(), [2, 1, 3, 4])
+
+    def test_two_hundred_teams(self):
+        team_ids = list(range(200))
+        results = [(a, b, (a * 7 + b) % 16, (b * 5 + a) % 16) for a in team_ids for b in team_ids if a < b]
+        started = time.perf_counter()
+        ranking = ResultTable(team_ids, results).ranking()
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(sorted(ranking), team_ids)
+
+    def test_group_totals_only_count_games_inside_the_group(self):
+        results = [(1, 2, 15, 10), (2, 1, 12, 15), (1, 3, 0, 15), (3, 2, 9, 15), (4, 1, 15, 15)]
+        table = ResultTable([1, 2, 3, 4], results)
+        group = [table.index[1], table.index[2]]
+        record, diff, scored = table.group_totals(group)
+        self.assertEqual([record[team] for team in group], [4, 0])
+        self.assertEqual([diff[team] for team in group], [8, -8])
+        self.assertEqual([scored[team] for team in group], [30, 22])
+
+
+class StandingsTests(TestCase):
+
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        self.teams = [Team.objects.create(name=f'Team {index}', captain=captain) for index in range(3)]
+
+    def play(self, team_a, team_b, score_a, score_b, status='FINAL'):
+        return Match.objects.create(
+            tournament=self.tournament, team_a=team_a, team_b=team_b, status=status,
+            team_a_score=score_a, team_b_score=score_b,
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1,
+        )
+
+    def table(self):
+        return {
+            standing.team_id: (standing.played, standing.wins, standing.losses, standing.ties,
+                               standing.points_for, standing.points_against, standing.point_differential)
+            for standing in TeamStanding.objects.filter(tournament=self.tournament)
+        }
+
+    def assertMatchesRebuild(self):
+        maintained = {team: row for team, row in self.table().items() if row[0]}
+        rebuild_standings(self.tournament)
+        self.assertEqual(maintained, {team: row for team, row in self.table().items() if row[0]})
+
+    def test_final_match_counts_on_create(self):
+        a, b, _ = self.teams
+        self.play(a, b, 15, 12)
+        self.play(a, b, 4, 2, status='LIVE')
+        self.assertEqual(self.table(), {a.pk: (1, 1, 0, 0, 15, 12, 3), b.pk: (1, 0, 1, 0, 12, 15, -3)})
+        self.assertMatchesRebuild()
+
+    def test_changing_a_score_moves_the_result(self):
+        a, b, c = self.teams
+        match = self.play(a, b, 15, 12)
+        self.play(b, c, 13, 13)
+        match.team_a_score, match.team_b_score = 10, 15
+        match.save()
+        self.assertEqual(self.table()[a.pk], (1, 0, 1, 0, 10, 15, -5))
+        self.assertEqual(self.table()[b.pk], (2, 1, 0, 1, 28, 23, 5))
+        match.status = 'LIVE'
+        match.save()
+        self.assertEqual(self.table()[a.pk][0], 0)
+        self.assertMatchesRebuild()
+
+    def test_delete_removes_the_result(self):
+        a, b, c = self.teams
+        self.play(a, c, 15, 1)
+        self.play(a, b, 15, 12).delete()
+        self.assertEqual(self.table()[a.pk], (1, 1, 0, 0, 15, 1, 14))
+        self.assertEqual(self.table()[b.pk][0], 0)
+        self.assertMatchesRebuild()
+
+    def test_migration_backfills_finished_matches(self):
+        a, b, c = self.teams
+        match = self.play(a, b, 15, 12)
+        self.play(b, c, 13, 13)
+        self.play(a, c, 4, 2, status='LIVE')
+        expected = {team: row for team, row in self.table().items() if row[0]}
+        TeamStanding.objects.all().delete()
+        import_module('tournament.migrations.0003_teamstanding').backfill_standings(apps, None)
+        self.assertEqual(self.table(), expected)
+
+        # Editing a game that was final before the migration moves the backfilled rows.
+        match.team_a_score = 10
+        match.save()
+        self.assertEqual(self.table()[a.pk], (1, 0, 1, 0, 10, 12, -2))
+        self.assertMatchesRebuild()
+
+
+class SpiritSummaryTests(TestCase):
+
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        self.captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        self.teams = [Team.objects.create(name=f'Team {index}', captain=self.captain) for index in range(2)]
+        self.match = Match.objects.create(
+            tournament=self.tournament, team_a=self.teams[0], team_b=self.teams[1],
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+
+    def score(self, team, **categories):
+        return SpiritScore.objects.create(
+            match=self.match, submitting_user=self.captain, target_team=team, **categories
+        )
+
+    def summary(self, team):
+        return SpiritScoreSummary.objects.filter(tournament=self.tournament, team=team).values_list(
+            'submissions', 'rules_knowledge', 'fouls_contact', 'total'
+        ).first()
+
+    def assertMatchesRebuild(self):
+        maintained = list(SpiritScoreSummary.objects.filter(submissions__gt=0).order_by('team').values_list(
+            'team', 'submissions', 'total'
+        ))
+        rebuild_spirit_summaries(self.tournament)
+        self.assertEqual(maintained, list(SpiritScoreSummary.objects.order_by('team').values_list(
+            'team', 'submissions', 'total'
+        )))
+
+    def test_create_adds_to_the_summary(self):
+        self.score(self.teams[0], rules_knowledge=4)
+        self.score(self.teams[0], fouls_contact=0)
+        self.assertEqual(self.summary(self.teams[0]), (2, 6, 2, 20))
+        self.assertIsNone(self.summary(self.teams[1]))
+        self.assertEqual(leaderboard(self.tournament.pk)[0]['total'], 10)
+        self.assertMatchesRebuild()
+
+    def test_edit_moves_the_difference(self):
+        score = self.score(self.teams[0])
+        score.rules_knowledge = 0
+        score.save()
+        self.assertEqual(self.summary(self.teams[0]), (1, 0, 2, 8))
+        score.target_team = self.teams[1]
+        score.save()
+        self.assertEqual(self.summary(self.teams[0])[0], 0)
+        self.assertEqual(self.summary(self.teams[1]), (1, 0, 2, 8))
+        self.assertMatchesRebuild()
+
+    def test_delete_takes_the_score_back_out(self):
+        self.score(self.teams[0], communication=4)
+        self.score(self.teams[0]).delete()
+        self.assertEqual(self.summary(self.teams[0]), (1, 2, 2, 12))
+        self.assertMatchesRebuild()
+
+    def test_migration_backfills_submitted_scores(self):
+        score = self.score(self.teams[0], rules_knowledge=4)
+        self.score(self.teams[0], fouls_contact=0)
+        self.score(self.teams[1], communication=3)
+        expected = [self.summary(team) for team in self.teams]
+        SpiritScoreSummary.objects.all().delete()
+        import_module('tournament.migrations.0004_spiritscoresummary').backfill_summaries(apps, None)
+        self.assertEqual([self.summary(team) for team in self.teams], expected)
+
+        # Editing a score submitted before the migration moves the backfilled sums.
+        score.rules_knowledge = 0
+        score.save()
+        self.assertEqual(self.summary(self.teams[0]), (2, 2, 2, 16))
+        self.assertMatchesRebuild()
+
+
+class LiveBrokerTests(TestCase):
+
+    def test_publish_reaches_every_subscriber_of_the_channel(self):
+        broker = InProcessBroker()
+
+        async def run():
+            first, second = broker.subscribe('match:1'), broker.subscribe('match:1')
+            other = broker.subscribe('match:2')
+            broker.publish('match:1', 'score')
+            received = [await asyncio.wait_for(queue.get(), 1) for _, queue in (first, second)]
+            return received, other[1].empty()
+
+        self.assertEqual(asyncio.run(run()), (['score', 'score'], True))
+
+    def test_publish_from_another_thread(self):
+        broker = InProcessBroker()
+
+        async def run():
+            subscription = broker.subscribe('match:1')
+            thread = threading.Thread(target=broker.publish, args=('match:1', 'from a view'))
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(subscription[1].get(), 1)
+
+        self.assertEqual(asyncio.run(run()), 'from a view')
+
+    def test_slow_subscriber_keeps_the_latest_updates(self):
+        broker = InProcessBroker()
+        broker.queue_size = 2
+
+        async def run():
+            _, queue = broker.subscribe('match:1')
+            for score in ('1-0', '2-0', '3-0'):
+                broker.publish('match:1', score)
+            await asyncio.sleep(0)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        self.assertEqual(asyncio.run(run()), ['2-0', '3-0'])
+
+    def test_unsubscribe_stops_delivery(self):
+        broker = InProcessBroker()
+
+        async def run():
+            subscription = broker.subscribe('match:1')
+            broker.unsubscribe('match:1', subscription)
+            broker.publish('match:1', 'score')
+            await asyncio.sleep(0)
+            return subscription[1].empty()
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(dict(broker._subscribers), {})
+
+
+class LiveStreamViewTests(TestCase):
+
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            title='Open', start_date=date(2025, 11, 5), end_date=date(2025, 11, 6), location='Field'
+        )
+        captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        teams = [Team.objects.create(name=f'Team {index}', captain=captain) for index in range(2)]
+        self.match = Match.objects.create(
+            tournament=self.tournament, team_a=teams[0], team_b=teams[1],
+            start_time=datetime(2025, 11, 5, 9, tzinfo=timezone.utc), field_number=1
+        )
+
+    def test_wsgi_requests_are_refused(self):
+        response = self.client.get(f'/api/tournaments/matches/{self.match.pk}/live/')
+        self.assertEqual(response.status_code, 501)
+
+    async def test_asgi_stream_delivers_updates(self):
+        response = await AsyncClient().get(f'/api/tournaments/matches/{self.match.pk}/live/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 3000\n\n')
+
+        # The subscription is made once the generator runs; publish after that.
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        self.match.team_a_score = 5
+        broadcast_match(self.match)
+        event = await asyncio.wait_for(pending, 1)
+        self.assertTrue(event.startswith(b'event: match\ndata: '))
+        self.assertIn(b'"team_a_score": 5', event)
+        await stream.aclose()
+
+
+class KeysetPaginationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        # Several tournaments share a start date, so the id tie-break decides.
+        for index, day in enumerate([5, 5, 5, 7, 7, 1, 5]):
+            Tournament.objects.create(
+                title=f'Cup {index}', start_date=date(2025, 11, day), end_date=date(2025, 11, 9), location='Field'
+            )
+        captain = CustomUser.objects.create_user(username='captain', role='MANAGER')
+        self.client.force_authenticate(captain)
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            url, pages = response.data['next'], pages + 1
+        return ids, pages
+
+    def test_descending_order_with_duplicate_keys(self):
+        expected = list(Tournament.objects.order_by('-start_date', 'id').values_list('id', flat=True))
+        ids, pages = self.walk('/api/tournaments/?page_size=2')
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_ascending_datetimes_with_duplicate_keys(self):
+        tournament = Tournament.objects.first()
+        team_a, team_b = (Team.objects.create(name=name) for name in ('A', 'B'))
+        for minute in (0, 0, 0, 30, 30):
+            Match.objects.create(
+                tournament=tournament, team_a=team_a, team_b=team_b, field_number=1,
+                start_time=datetime(2025, 11, 5, 9, minute, 0, 250000, tzinfo=timezone.utc),
+            )
+        expected = list(Match.objects.order_by('start_time', 'id').values_list('id', flat=True))
+        self.assertEqual(self.walk('/api/tournaments/matches/?page_size=2')[0], expected)
+
+    def test_plain_requests_are_not_paginated(self):
+        self.assertEqual(len(self.client.get('/api/tournaments/').data), 7)
+
+    def test_page_size_is_clamped(self):
+        response = self.client.get('/api/tournaments/?page_size=0')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(len(self.client.get('/api/tournaments/?page_size=1000').data['results']), 7)
+
+    def test_cursor_round_trip_keeps_microseconds(self):
+        paginator = KeysetPagination()
+        moment = datetime(2025, 11, 5, 9, 0, 0, 123456, tzinfo=timezone.utc)
+        self.assertEqual(paginator.decode_cursor(paginator.encode_cursor([moment, 3])),
+                         [moment.isoformat(), 3])
+
+    def test_tampered_cursors_are_rejected(self):
+        paginator = KeysetPagination()
+        for cursor in ('not base64!', paginator.encode_cursor({'id': 1})[:-2],
+                       paginator.encode_cursor({'id': 1}), paginator.encode_cursor([1]),
+                       paginator.encode_cursor(['not a date', 1])):
+            response = self.client.get('/api/tournaments/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class BenchmarkIndexesCommandTests(TestCase):
+
+    def test_no_seed_on_an_empty_database_fails_cleanly(self):
+        with self.assertRaisesMessage(CommandError, 'run without --no-seed'):
+            call_command('benchmark_indexes', no_seed=True, stdout=StringIO())
+
+    def test_analyze_never_commits_the_seed_on_mysql(self):
+        command = BenchmarkIndexes(stdout=StringIO())
+        # TestCase wraps the test in a transaction, as handle() wraps the seed.
+        with mock.patch.object(connection, 'vendor', 'mysql'), \
+                mock.patch.object(connection, 'cursor') as cursor:
+            command.analyze()
+        cursor.return_value.__enter__.return_value.execute.assert_not_called()
+        self.assertIn('Skipping ANALYZE TABLE', command.stdout.getvalue())
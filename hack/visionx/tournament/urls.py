@@ -9,18 +9,21 @@ urlpatterns = [
     path('<int:pk>/', views.TournamentDetailView.as_view(), name='tournament-detail'),
    
     path('<int:pk>/generate_schedule/', views.generate_schedule, name='tournament-generate-schedule'),
+    path('<int:pk>/generate_bracket/', views.generate_bracket, name='tournament-generate-bracket'),
     
 
     path('<int:pk>/matches/', views.tournament_matches, name='tournament-matches'),
     
 
     path('teams/', views.TeamListCreateView.as_view(), name='team-list'),
+    path('teams/search/', views.search_teams, name='team-search'),
     
 
     path('teams/<int:pk>/', views.TeamDetailView.as_view(), name='team-detail'),
     
 
     path('registrations/', views.PlayerRegistrationListCreateView.as_view(), name='registration-list'),
+    path('registrations/bulk/', views.bulk_register_players, name='registration-bulk'),
     
     
     path('registrations/<int:pk>/', views.PlayerRegistrationDetailView.as_view(), name='registration-detail'),
@@ -38,4 +41,12 @@ urlpatterns = [
 
     path('<int:pk>/teams/', views.tournament_teams, name='tournament-teams'),
     path('teams/<int:pk>/roster/', views.team_roster, name='team-roster'),
+    path('<int:pk>/bundle/', views.tournament_bundle, name='tournament-bundle'),
+    path('<int:pk>/schedule/conflicts/', views.schedule_conflicts, name='tournament-schedule-conflicts'),
+    path('<int:pk>/standings/', views.tournament_standings, name='tournament-standings'),
+    path('<int:pk>/field-report/', views.tournament_field_report, name='tournament-field-report'),
+    path('<int:pk>/spirit/', views.tournament_spirit_leaderboard, name='tournament-spirit-leaderboard'),
+    path('<int:pk>/live/', views.tournament_live, name='tournament-live'),
+    path('matches/<int:pk>/score/', views.update_match_score, name='match-score'),
+    path('matches/<int:pk>/live/', views.match_live, name='match-live'),
 ]
\ No newline at end of file
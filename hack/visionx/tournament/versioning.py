@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Match, PlayerRegistration, Team, TournamentVersion
+from .response_cache import get_or_build, invalidate_tournaments, tournament_key
+
+
+# Tournaments bumped inside batched(), applied when the outermost block ends.
+_pending = ContextVar('pending_bumps', default=None)
+
+
+def bump(*tournament_ids):
+    """
+    Advance the change stamp of the given tournaments (one UPDATE) and drop
+    their cached responses; inside batched() they are only collected.
+    """
+    pending = _pending.get()
+    if pending is not None:
+        pending.update(tournament_ids)
+        return
+    TournamentVersion.objects.filter(tournament_id__in=tournament_ids).update(
+        version=F('version') + 1, modified_at=timezone.now()
+    )
+    invalidate_tournaments(*tournament_ids)
+
+
+@contextmanager
+def batched():
+    """
+    Collect the bumps made inside the block, such as one per match a bulk
+    delete removes, and apply them together once it ends.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    if pending:
+        bump(*pending)
+
+
+def bump_for_team(team_id):
+    """A team change shows up in every tournament the team is registered for or plays in."""
+    bump_for_teams([team_id])
+
+
+def bump_for_teams(team_ids, tournament_ids=()):
+    """Bump the tournaments of the given teams plus ``tournament_ids``."""
+    tournament_ids = set(tournament_ids)
+    tournament_ids.update(
+        PlayerRegistration.objects.filter(team_id__in=team_ids).values_list('tournament_id', flat=True)
+    )
+    tournament_ids.update(
+        Match.objects.filter(Q(team_a_id__in=team_ids) | Q(team_b_id__in=team_ids)).values_list(
+            'tournament_id', flat=True
+        )
+    )
+    if tournament_ids:
+        bump(*tournament_ids)
+
+
+def bump_for_user(user_id):
+    """
+    A user's name, email and role are embedded as team captain and as a
+    registered player; bump every tournament showing either. Returns
+    whether the user captains a team.
+    """
+    team_ids = list(Team.objects.filter(captain_id=user_id).values_list('id', flat=True))
+    bump_for_teams(team_ids, PlayerRegistration.objects.filter(player_id=user_id).values_list(
+        'tournament_id', flat=True
+    ))
+    return bool(team_ids)
+
+
+def current(request, pk):
+    """(version, modified_at) for a tournament, from the cache or looked up once per request."""
+    # DRF wraps the HttpRequest the condition() decorator saw; share its cache.
+    request = getattr(request, '_request', request)
+    cache = request.__dict__.setdefault('_tournament_versions', {})
+    if pk not in cache:
+        cache[pk] = get_or_build(
+            tournament_key(pk, 'version'),
+            lambda: TournamentVersion.objects.filter(tournament_id=pk).values_list(
+                'version', 'modified_at'
+            ).first()
+        )
+    return cache[pk]
+
+
+def etag_func(endpoint):
+    """ETag builder for django.views.decorators.http.condition."""
+    def etag(request, pk, *args, **kwargs):
+        stamp = current(request, pk)
+        return f'"{endpoint}-{pk}-{stamp[0]}"' if stamp else None
+    return etag
+
+
+def last_modified(request, pk, *args, **kwargs):
+    stamp = current(request, pk)
+    return stamp[1] if stamp else None
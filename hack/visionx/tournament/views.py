@@ -1,8 +1,15 @@
 from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes 
 from rest_framework.response import Response
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.db.models import Q
-from .models import Tournament, Team, PlayerRegistration, Match, SpiritScore
+from visionx.search import prefix_search, search_params
+from .models import Tournament, Team, PlayerRegistration, Match, SpiritScore, TeamStanding
 from .serializers import (
     TournamentSerializer,
     TeamSerializer,
@@ -10,26 +17,75 @@ from .serializers import (
     PlayerRegistrationSerializer,
     MatchSerializer,
     SpiritScoreSerializer,
-    PlayerRegistrationCreateSerializer
+    PlayerRegistrationCreateSerializer,
+    PlayerRegistrationBulkCreateSerializer,
+    ProposedMatchSerializer,
+    ScoreUpdateSerializer,
+    TeamStandingSerializer
 )
 from .permissions import IsAdminOrVolunteerOrReadOnly
-from django.db.models import Q
-import itertools
+from .live import event_stream, match_channel, tournament_channel
+from .scoring import ScoreConflict, record_score
+from .conflicts import SLOT_FIELDS, ScheduleConflict, ScheduleIndex, slot
+from .brackets import build_bracket, pool_pairings, pool_seeds, seed_pools
+from .scheduling import SlotAllocator, build_schedule, round_robin_rounds
+from .spirit import SPIRIT_CATEGORIES, leaderboard, missing_submissions
+from .standings import seed_standings
+from .ranking import rank_teams
+from .reports import BUCKETS, field_occupancy, field_timeline
+from .response_cache import TEAM_LIST, TOURNAMENT_LIST, get_or_build, tournament_key
+from . import versioning
+from datetime import datetime
+
+
+class CachedListMixin:
+    """
+    Serve plain GETs of the whole list from the response cache; paginated
+    or filtered requests go to the database as usual.
+    """
+    cache_key = None
 
+    def list(self, request, *args, **kwargs):
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+        return Response(get_or_build(
+            self.cache_key,
+            lambda: self.get_serializer(self.filter_queryset(self.get_queryset()), many=True).data
+        ))
 
-class TournamentListCreateView(generics.ListCreateAPIView):
+
+class TournamentListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = Tournament.objects.all()
+    cache_key = TOURNAMENT_LIST
+    keyset_ordering = ('-start_date', 'id')
     serializer_class = TournamentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+@method_decorator(
+    condition(etag_func=versioning.etag_func('tournament'), last_modified_func=versioning.last_modified),
+    name='get'
+)
 class TournamentDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Tournament.objects.all()
     serializer_class = TournamentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def retrieve(self, request, *args, **kwargs):
+        return Response(get_or_build(
+            tournament_key(kwargs['pk'], 'detail'),
+            lambda: self.get_serializer(self.get_object()).data
+        ))
+
+    def perform_destroy(self, instance):
+        # The cascade deletes every match and registration, each bumping the version.
+        with transaction.atomic(), versioning.batched():
+            instance.delete()
 
-class TeamListCreateView(generics.ListCreateAPIView):
-    queryset = Team.objects.all()
+
+class TeamListCreateView(CachedListMixin, generics.ListCreateAPIView):
+    queryset = Team.objects.select_related('captain')
+    cache_key = TEAM_LIST
+    keyset_ordering = ('name', 'id')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     def get_serializer_class(self):
@@ -40,14 +96,28 @@ class TeamListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(captain=self.request.user)
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def search_teams(request):
+    """Team name autocomplete: ``?q=<prefix>&limit=<n>`` (default 10, at most 50)."""
+    term, limit = search_params(request)
+    return Response(prefix_search(Team.objects.all(), 'name', term, limit, ('id', 'name', 'captain_id')))
+
+
 class TeamDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Team.objects.all()
+    queryset = Team.objects.select_related('captain')
     serializer_class = TeamSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def perform_destroy(self, instance):
+        # One bump per tournament the cascaded matches and registrations were in.
+        with transaction.atomic(), versioning.batched():
+            instance.delete()
+
 
 class PlayerRegistrationListCreateView(generics.ListCreateAPIView):
-    queryset = PlayerRegistration.objects.all()
+    queryset = PlayerRegistration.objects.select_related('player', 'team__captain', 'tournament')
+    keyset_ordering = ('id',)
     permission_classes = [permissions.IsAuthenticated]
 
     def get_serializer_class(self):
@@ -58,25 +128,98 @@ class PlayerRegistrationListCreateView(generics.ListCreateAPIView):
     def get_serializer_context(self):
         return {'request': self.request}
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_register_players(request):
+    """
+    Captains add a whole roster at once: a JSON list of usernames or a CSV
+    upload. Valid rows are inserted in one transaction; the response lists
+    who was added and a per-row error for everyone who was not.
+    """
+    serializer = PlayerRegistrationBulkCreateSerializer(data=request.data, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    result = serializer.save()
+    return Response(
+        result,
+        status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST
+    )
+
+
 class PlayerRegistrationDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = PlayerRegistration.objects.all()
+    queryset = PlayerRegistration.objects.select_related('player', 'team__captain', 'tournament')
     serializer_class = PlayerRegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
+def _conflicts_response(exc):
+    # Same payload as the schedule/conflicts endpoint, ids kept as numbers.
+    return Response({'conflicts': exc.conflicts}, status=status.HTTP_400_BAD_REQUEST)
+
+
 class MatchListCreateView(generics.ListCreateAPIView):
-    queryset = Match.objects.all()
+    queryset = Match.objects.select_related('team_a', 'team_b')
+    keyset_ordering = ('start_time', 'id')
     serializer_class = MatchSerializer
     permission_classes = [IsAdminOrVolunteerOrReadOnly]
 
+    def create(self, request, *args, **kwargs):
+        try:
+            return super().create(request, *args, **kwargs)
+        except ScheduleConflict as exc:
+            return _conflicts_response(exc)
+
+
 class MatchDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Match.objects.all()
+    """Updates must send the match ``version`` last read; a stale one gets 409."""
+    queryset = Match.objects.select_related('team_a', 'team_b')
     serializer_class = MatchSerializer
     permission_classes = [IsAdminOrVolunteerOrReadOnly]
 
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except ScheduleConflict as exc:
+            return _conflicts_response(exc)
+        except ScoreConflict as exc:
+            if exc.match is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            return Response(
+                {'error': str(exc), 'match': MatchSerializer(exc.match).data},
+                status=status.HTTP_409_CONFLICT
+            )
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminOrVolunteerOrReadOnly])
+def update_match_score(request, pk):
+    """
+    Scorekeeper endpoint: add points and/or move the game to LIVE or FINAL
+    in one atomic UPDATE. Send ``version`` (from the last response) to have
+    the update refused with 409 if someone else changed the game since.
+    """
+    serializer = ScoreUpdateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    try:
+        match = record_score(
+            pk,
+            team_a_points=serializer.validated_data['team_a_points'],
+            team_b_points=serializer.validated_data['team_b_points'],
+            status=serializer.validated_data.get('status'),
+            expected_version=serializer.validated_data.get('version'),
+        )
+    except ScoreConflict as exc:
+        if exc.match is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {'error': str(exc), 'match': MatchSerializer(exc.match).data},
+            status=status.HTTP_409_CONFLICT
+        )
+    return Response(MatchSerializer(match).data)
+
 
 class SpiritScoreListCreateView(generics.ListCreateAPIView):
     queryset = SpiritScore.objects.all()
+    keyset_ordering = ('-submitted_at', '-id')
     serializer_class = SpiritScoreSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -89,82 +232,358 @@ class SpiritScoreDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
+def _registered_team_ids(tournament):
+    return list(
+        PlayerRegistration.objects.filter(tournament=tournament)
+        .values_list('team', flat=True).distinct().order_by('team')
+    )
+
+
+def _slot_options(request, tournament):
+    """Parse the shared scheduling options; raises ValueError/TypeError on bad input."""
+    start_date = request.data.get('start_date')
+    start_date = (
+        datetime.strptime(start_date, '%Y-%m-%d').date() if start_date
+        else tournament.start_date
+    )
+    return start_date, {
+        'fields': int(request.data.get('fields', 4)),
+        'slot_minutes': int(request.data.get('slot_minutes', 90)),
+        'rest_minutes': int(request.data.get('rest_minutes', 0)),
+        'day_start': datetime.strptime(request.data.get('day_start', '09:00'), '%H:%M').time(),
+        'day_end': datetime.strptime(request.data.get('day_end', '18:00'), '%H:%M').time(),
+    }
+
+
+def _replace_schedule(tournament, matches, team_ids):
+    # Each deleted match would bump the tournament again; once is enough.
+    with transaction.atomic(), versioning.batched():
+        Match.objects.filter(tournament=tournament).delete()
+        Match.objects.bulk_create(matches)
+        seed_standings(tournament, team_ids)
+        versioning.bump(tournament.pk)
+
+
+def _extend_schedule(tournament, team_ids, start_date, options, earliest=None):
+    """
+    Bring a round-robin schedule in line with the registered teams without
+    touching anything already played: unplayed games of withdrawn teams are
+    removed, missing pairings are placed in free slots from ``start_date``
+    (and not before ``earliest``) around the games that stay. Returns
+    (added, removed) match counts.
+    """
+    registered = set(team_ids)
+    with transaction.atomic(), versioning.batched():
+        round_robin = Match.objects.filter(tournament=tournament, stage='ROUND_ROBIN')
+        _, deleted = round_robin.filter(status='SCHEDULED').filter(
+            ~Q(team_a_id__in=registered) | ~Q(team_b_id__in=registered)
+        ).delete()
+        removed = deleted.get(Match._meta.label, 0)
+        scheduled = {frozenset(pair) for pair in round_robin.values_list('team_a_id', 'team_b_id')}
+        pairings = [
+            pair for pairings in round_robin_rounds(team_ids)
+            for pair in pairings if frozenset(pair) not in scheduled
+        ]
+
+        booked = Match.objects.filter(tournament=tournament).values_list(*SLOT_FIELDS)
+        allocator = SlotAllocator(
+            start_date, occupied=ScheduleIndex(slot(*row) for row in booked),
+            earliest=earliest, **options
+        )
+        Match.objects.bulk_create([
+            Match(
+                tournament=tournament, team_a_id=team_a_id, team_b_id=team_b_id,
+                start_time=start_time, duration_minutes=options['slot_minutes'], field_number=field_number
+            )
+            for (team_a_id, team_b_id), start_time, field_number in allocator.place_pairings(pairings, len(team_ids))
+        ])
+        seed_standings(tournament, team_ids)
+        versioning.bump(tournament.pk)
+    return len(pairings), removed
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAdminUser])
 def generate_schedule(request, pk):
+    """
+    Build a time-slotted round-robin schedule for a tournament.
+
+    Optional body parameters: fields, slot_minutes, rest_minutes,
+    day_start / day_end ("HH:MM") and start_date ("YYYY-MM-DD",
+    defaults to the tournament start date).
+
+    ``mode`` is "replace" (drop every match and start over) or
+    "incremental" (keep existing games, only schedule pairings for added
+    teams and drop unplayed games of withdrawn ones). It defaults to
+    incremental once the tournament has round-robin matches; a tournament
+    with pool or bracket games can only be replaced. Incremental games go
+    from start_date if it is sent, otherwise from now on.
+    """
     try:
         tournament = Tournament.objects.get(pk=pk)
     except Tournament.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
-        
-    registrations = PlayerRegistration.objects.filter(tournament=tournament)
-    team_ids = registrations.values_list('team', flat=True).distinct()
-    teams = list(Team.objects.filter(id__in=team_ids))
 
-    if len(teams) < 2:
+    team_ids = _registered_team_ids(tournament)
+
+    if len(team_ids) < 2:
         return Response(
             {'error': 'You need at least 2 teams to generate a schedule.'},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    Match.objects.filter(tournament=tournament).delete()
-    all_pairings = list(itertools.combinations(teams, 2))
-    
-    field_num = 1
-    for team_a, team_b in all_pairings:
-        Match.objects.create(
+    stages = set(Match.objects.filter(tournament=tournament).values_list('stage', flat=True).distinct())
+    mode = request.data.get('mode') or ('incremental' if 'ROUND_ROBIN' in stages else 'replace')
+    if mode not in ('replace', 'incremental'):
+        return Response({'error': 'mode must be "replace" or "incremental".'}, status=status.HTTP_400_BAD_REQUEST)
+    if mode == 'incremental' and stages - {'ROUND_ROBIN'}:
+        return Response(
+            {'error': 'This tournament has pool or bracket games; only mode "replace" can reschedule it.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        start_date, options = _slot_options(request, tournament)
+        if mode == 'incremental':
+            earliest = None if request.data.get('start_date') else timezone.now()
+            added, removed = _extend_schedule(tournament, team_ids, start_date, options, earliest)
+        else:
+            slots = build_schedule(team_ids, start_date, **options)
+    except (TypeError, ValueError) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if mode == 'incremental':
+        return Response(
+            {'message': f'Added {added} matches and removed {removed} unplayed matches.',
+             'added': added, 'removed': removed},
+            status=status.HTTP_200_OK
+        )
+
+    matches = [
+        Match(
             tournament=tournament,
-            team_a=team_a,
-            team_b=team_b,
-            start_time="2025-11-05 09:00:00", 
-            field_number=field_num
+            team_a_id=team_a_id,
+            team_b_id=team_b_id,
+            start_time=start_time,
+            duration_minutes=options['slot_minutes'],
+            field_number=field_number
         )
-        field_num = (field_num % 4) + 1
+        for team_a_id, team_b_id, start_time, field_number in slots
+    ]
+    _replace_schedule(tournament, matches, team_ids)
 
     return Response(
-        {'message': f'Successfully generated {len(all_pairings)} matches.'},
+        {
+            'message': f'Successfully generated {len(matches)} matches.',
+            'first_start': slots[0][2],
+            'last_start': slots[-1][2],
+        },
         status=status.HTTP_201_CREATED
     )
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def generate_bracket(request, pk):
+    """
+    Pool play followed by a knockout bracket.
+
+    Body parameters (all optional): pool_count, advance (teams per pool
+    that go through), format ("single", "double" or "placement"), seeding
+    (team ids, best first) plus the generate_schedule slot options.
+    Teams left out of ``seeding`` follow in their current ranking, from
+    the tournament's results so far. Bracket games are created as placeholders and filled in automatically
+    as pools and feeding games go FINAL.
+    """
+    try:
+        tournament = Tournament.objects.get(pk=pk)
+    except Tournament.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    team_ids = _registered_team_ids(tournament)
+    if len(team_ids) < 2:
+        return Response(
+            {'error': 'You need at least 2 teams to generate a bracket.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        seeding = [int(team_id) for team_id in request.data.get('seeding', [])]
+        registered = set(team_ids)
+        ordered = [team_id for team_id in dict.fromkeys(seeding) if team_id in registered]
+        ordered += [team_id for team_id in rank_teams(tournament.pk, team_ids)
+                    if team_id in registered and team_id not in set(ordered)]
+
+        pools = seed_pools(ordered, int(request.data.get('pool_count', max(1, len(ordered) // 6))))
+        advance = int(request.data.get('advance', 2))
+        if not 1 <= advance <= min(len(members) for members in pools.values()):
+            raise ValueError('advance must be between 1 and the size of the smallest pool.')
+        games = build_bracket(pool_seeds(list(pools), advance), request.data.get('format', 'single'))
+
+        start_date, options = _slot_options(request, tournament)
+        allocator = SlotAllocator(start_date, **options)
+        pool_slots = allocator.place_pairings(pool_pairings(pools), len(ordered))
+        bracket_slots = []
+        for wave in sorted({game['wave'] for game in games}):
+            bracket_slots += allocator.place_wave([game for game in games if game['wave'] == wave])
+    except (TypeError, ValueError) as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    matches = [
+        Match(
+            tournament=tournament, stage='POOL', pool=pool,
+            team_a_id=team_a_id, team_b_id=team_b_id,
+            start_time=start_time, duration_minutes=options['slot_minutes'], field_number=field_number
+        )
+        for (team_a_id, team_b_id, pool), start_time, field_number in pool_slots
+    ] + [
+        Match(
+            tournament=tournament, stage='BRACKET', bracket_code=game['code'],
+            team_a_source=game['team_a_source'], team_b_source=game['team_b_source'],
+            start_time=start_time, duration_minutes=options['slot_minutes'], field_number=field_number
+        )
+        for game, start_time, field_number in bracket_slots
+    ]
+    _replace_schedule(tournament, matches, ordered)
+
+    return Response(
+        {
+            'message': f'Successfully generated {len(matches)} matches.',
+            'pools': pools,
+            'pool_matches': len(pool_slots),
+            'bracket_matches': len(bracket_slots),
+            'first_start': matches[0].start_time,
+            'last_start': max(match.start_time for match in matches),
+        },
+        status=status.HTTP_201_CREATED
+    )
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAdminOrVolunteerOrReadOnly])
+def schedule_conflicts(request, pk):
+    """
+    Check a tournament's schedule for double-booked fields and teams.
+
+    GET checks the stored schedule. POST checks it with proposed changes
+    applied first: ``matches`` is a list of games, each with an ``id`` to
+    move an existing game or without one to add a game (reported as
+    "new-<index>"). Nothing is saved either way.
+    """
+    if not Tournament.objects.filter(pk=pk).exists():
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    games = {row[0]: slot(*row) for row in Match.objects.filter(tournament_id=pk).values_list(*SLOT_FIELDS)}
+    if request.method == 'POST':
+        serializer = ProposedMatchSerializer(data=request.data.get('matches', []), many=True)
+        serializer.is_valid(raise_exception=True)
+        for index, proposal in enumerate(serializer.validated_data):
+            match_id = proposal.get('id') or f'new-{index}'
+            if 'id' in proposal and match_id not in games:
+                return Response(
+                    {'error': f'Match {match_id} is not part of this tournament.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            games[match_id] = slot(
+                match_id, proposal.get('team_a_id'), proposal.get('team_b_id'),
+                proposal['field_number'], proposal['start_time'], proposal['duration_minutes'],
+            )
+
+    return Response({
+        'match_count': len(games),
+        'conflicts': ScheduleIndex(games.values()).conflicts(),
+    })
+
+
+BUNDLE_TEAM_FIELDS = ('id', 'name', 'captain_id')
+BUNDLE_MATCH_FIELDS = (
+    'id', 'team_a_id', 'team_b_id', 'start_time', 'duration_minutes', 'field_number',
+    'team_a_score', 'team_b_score', 'status', 'stage', 'pool', 'bracket_code',
+    'team_a_source', 'team_b_source',
+)
+BUNDLE_SPIRIT_FIELDS = ('id', 'match_id', 'target_team_id', *SPIRIT_CATEGORIES, 'submitted_at')
+
+
+@condition(etag_func=versioning.etag_func('bundle'), last_modified_func=versioning.last_modified)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def tournament_bundle(request, pk):
+    """
+    Everything the tournament page needs in one response: the tournament,
+    its teams, its matches and their spirit scores. Rows are sent as a
+    ``fields`` header plus one array per row, and refer to teams and
+    matches by id. Built with four queries whatever the size of the event.
+    """
+    def build():
+        tournament = Tournament.objects.filter(pk=pk).first()
+        if tournament is None:
+            return None
+        matches = Match.objects.filter(tournament_id=pk).order_by('start_time', 'id')
+        # Semi-joins rather than joins: no duplicate rows, so no DISTINCT.
+        teams = Team.objects.filter(
+            Q(id__in=PlayerRegistration.objects.filter(tournament_id=pk).values('team_id'))
+            | Q(id__in=Match.objects.filter(tournament_id=pk).values('team_a_id'))
+            | Q(id__in=Match.objects.filter(tournament_id=pk).values('team_b_id'))
+        ).order_by('id')
+        spirit_scores = SpiritScore.objects.filter(match__tournament_id=pk).order_by('match_id', 'id')
+        return {
+            'tournament': TournamentSerializer(tournament).data,
+            'teams': {'fields': BUNDLE_TEAM_FIELDS, 'rows': list(teams.values_list(*BUNDLE_TEAM_FIELDS))},
+            'matches': {'fields': BUNDLE_MATCH_FIELDS, 'rows': list(matches.values_list(*BUNDLE_MATCH_FIELDS))},
+            'spirit_scores': {
+                'fields': BUNDLE_SPIRIT_FIELDS,
+                'rows': list(spirit_scores.values_list(*BUNDLE_SPIRIT_FIELDS)),
+            },
+        }
+
+    bundle = get_or_build(tournament_key(pk, 'bundle'), build)
+    if bundle is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    return Response(bundle)
+
+
+@condition(etag_func=versioning.etag_func('matches'), last_modified_func=versioning.last_modified)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticatedOrReadOnly]) 
 def tournament_matches(request, pk):
     """
     Get all matches for a specific tournament.
     """
-    try:
-        tournament = Tournament.objects.get(pk=pk)
-    except Tournament.DoesNotExist:
+    # Every tournament has a version row, already fetched for the ETag.
+    if versioning.current(request, pk) is None:
         return Response(status=status.HTTP_404_NOT_FOUND)
         
-    matches = Match.objects.filter(tournament=tournament)
-    serializer = MatchSerializer(matches, many=True)
-    return Response(serializer.data)
+    def build():
+        matches = Match.objects.filter(tournament_id=pk).select_related('team_a', 'team_b')
+        return MatchSerializer(matches, many=True).data
+
+    return Response(get_or_build(tournament_key(pk, 'matches'), build))
+@condition(etag_func=versioning.etag_func('teams'), last_modified_func=versioning.last_modified)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticatedOrReadOnly]) 
 def tournament_teams(request, pk):
   
-    try:
-        tournament = Tournament.objects.get(pk=pk)
-    except Tournament.DoesNotExist:
+    # Every tournament has a version row, already fetched for the ETag.
+    if versioning.current(request, pk) is None:
         return Response(status=status.HTTP_404_NOT_FOUND)
         
     
-    registrations = PlayerRegistration.objects.filter(tournament=tournament)
-    
-    team_ids = registrations.values_list('team', flat=True).distinct()
-    
-    teams = Team.objects.filter(id__in=team_ids)
-    
-    serializer = TeamSerializer(teams, many=True)
-    return Response(serializer.data)
+    def build():
+        registrations = PlayerRegistration.objects.filter(tournament_id=pk)
+
+        team_ids = registrations.values_list('team', flat=True).distinct()
+
+        teams = Team.objects.filter(id__in=team_ids).select_related('captain')
+
+        return TeamSerializer(teams, many=True).data
+
+    return Response(get_or_build(tournament_key(pk, 'teams'), build))
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated]) # Must be logged in
 def team_roster(request, pk):
   
     try:
-        team = Team.objects.get(pk=pk)
+        team = Team.objects.select_related('captain').get(pk=pk)
     except Team.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
     
@@ -173,6 +592,105 @@ def team_roster(request, pk):
        return Response({"error": "You are not the captain of this team."}, status=status.HTTP_403_FORBIDDEN)
 
    
-    registrations = PlayerRegistration.objects.filter(team=team)
+    registrations = PlayerRegistration.objects.filter(team=team).select_related(
+        'player', 'team__captain', 'tournament'
+    )
     serializer = PlayerRegistrationSerializer(registrations, many=True)
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data)
+
+
+@condition(etag_func=versioning.etag_func('standings'), last_modified_func=versioning.last_modified)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def tournament_standings(request, pk):
+    """
+    Standings for a tournament, read straight from the maintained
+    TeamStanding table (kept current by the Match signals) and ordered by
+    the tie-break rules in ranking.py.
+    """
+    # Every tournament has a version row, already fetched for the ETag.
+    if versioning.current(request, pk) is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    def build():
+        standings = {
+            standing.team_id: standing
+            for standing in TeamStanding.objects.filter(tournament_id=pk).select_related('team')
+        }
+        ordered = [standings[team_id] for team_id in rank_teams(pk, sorted(standings)) if team_id in standings]
+        for rank, standing in enumerate(ordered, start=1):
+            standing.rank = rank
+        return TeamStandingSerializer(ordered, many=True).data
+
+    return Response(get_or_build(tournament_key(pk, 'standings'), build))
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def tournament_field_report(request, pk):
+    """
+    How the fields are used: occupancy per field per ``bucket`` ("hour",
+    the default, or "day"), each field's idle gaps within a playing day,
+    and the rest every team gets between games.
+    """
+    bucket = request.query_params.get('bucket', 'hour')
+    if bucket not in BUCKETS:
+        return Response({'error': 'bucket must be "hour" or "day".'}, status=status.HTTP_400_BAD_REQUEST)
+    if not Tournament.objects.filter(pk=pk).exists():
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    fields, teams = field_timeline(pk)
+    return Response({
+        'bucket': bucket,
+        'occupancy': field_occupancy(pk, bucket),
+        'fields': fields,
+        'teams': teams,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticatedOrReadOnly])
+def tournament_spirit_leaderboard(request, pk):
+    """
+    Spirit leaderboard for a tournament: per-team category averages from the
+    running SpiritScoreSummary sums, plus FINAL matches still missing scores.
+    """
+    if not Tournament.objects.filter(pk=pk).exists():
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'leaderboard': leaderboard(pk),
+        'missing_submissions': missing_submissions(pk),
+    })
+
+
+def _live_response(request, channel):
+    # Under WSGI Django would buffer the never-ending event stream in
+    # memory and the client would never see an event.
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'Live streams need the ASGI server (e.g. uvicorn visionx.asgi:application).'},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    response = StreamingHttpResponse(event_stream(channel), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def tournament_live(request, pk):
+    """
+    Server-sent event stream of score/status changes for every match in a
+    tournament. Needs an ASGI server (e.g. uvicorn visionx.asgi:application);
+    under WSGI it answers 501.
+    """
+    if not await Tournament.objects.filter(pk=pk).aexists():
+        raise Http404
+    return _live_response(request, tournament_channel(pk))
+
+
+async def match_live(request, pk):
+    """Server-sent event stream of score/status changes for a single match (ASGI only, as above)."""
+    if not await Match.objects.filter(pk=pk).aexists():
+        raise Http404
+    return _live_response(request, match_channel(pk))
@@ -1,3 +1,61 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+
+from tournament.models import Tournament, Team, PlayerRegistration
+from .models import CustomUser
+
+
+class ReadQueryCountTests(APITestCase):
+    """Read endpoints must not issue extra queries per returned row."""
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(
+            username='director', password='pw', role='ADMIN', is_staff=True
+        )
+
+    def test_my_registrations(self):
+        player = CustomUser.objects.create_user(username='player', role='PLAYER')
+        self.client.force_authenticate(player)
+
+        def register(count):
+            for _ in range(count):
+                index = Tournament.objects.count()
+                tournament = Tournament.objects.create(
+                    title=f'Cup {index}', start_date=date(2025, 11, 5),
+                    end_date=date(2025, 11, 6), location='Field'
+                )
+                captain = CustomUser.objects.create_user(username=f'captain{index}', role='MANAGER')
+                team = Team.objects.create(name=f'Team {index}', captain=captain)
+                PlayerRegistration.objects.create(player=player, team=team, tournament=tournament)
+
+        register(2)
+        with self.assertNumQueries(1):
+            self.client.get('/api/users/my-registrations/')
+        register(10)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/my-registrations/')
+        self.assertEqual(len(response.data), 12)
+
+    def test_user_list(self):
+        self.client.force_authenticate(self.admin)
+        with self.assertNumQueries(1):
+            self.client.get('/api/users/admin/list-users/')
+        for index in range(10):
+            CustomUser.objects.create_user(username=f'user{index}', role='SPECTATOR')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/admin/list-users/')
+        self.assertEqual(len(response.data), 11)
+
+    def test_username_search(self):
+        for name in ('alice', 'alex', 'bob', 'al_smith'):
+            CustomUser.objects.create_user(username=name, role='PLAYER')
+        self.client.force_authenticate(self.admin)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/search/', {'q': 'al', 'role': 'PLAYER', 'limit': 2})
+        self.assertEqual([row['username'] for row in response.data], ['al_smith', 'alex'])
+
+    def test_username_search_is_limited_to_picker_roles(self):
+        for role, expected in (('SPECTATOR', 403), ('PLAYER', 403), ('COACH', 200), ('MANAGER', 200)):
+            self.client.force_authenticate(CustomUser.objects.create_user(username=f'{role.lower()}1', role=role))
+            self.assertEqual(self.client.get('/api/users/search/', {'q': 'dir'}).status_code, expected)
@@ -4,6 +4,7 @@ from .views import (
     UserRegistrationView, 
     AdminUserCreateView,
     get_my_registrations,
+    search_users,
     UserListView
     
 )
@@ -22,4 +23,5 @@ urlpatterns = [
     path('admin/create-user/', AdminUserCreateView.as_view(), name='admin_create_user'),
     path('my-registrations/', get_my_registrations, name='my-registrations'),
     path('admin/list-users/', UserListView.as_view(), name='admin_list_users'),
+    path('search/', search_users, name='user_search'),
 ]
\ No newline at end of file
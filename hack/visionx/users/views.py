@@ -6,6 +6,7 @@ from .serializers import CustomUserSerializer, UserRegistrationSerializer, Admin
 from tournament.serializers import PlayerRegistrationSerializer
 from tournament.models import PlayerRegistration
 from rest_framework.decorators import api_view, permission_classes
+from visionx.search import prefix_search, search_params
 
 class CurrentUserView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
@@ -60,10 +61,13 @@ class AdminUserCreateView(generics.CreateAPIView):
 def get_my_registrations(request):
     
     user = request.user
-    registrations = PlayerRegistration.objects.filter(player=user)
+    registrations = PlayerRegistration.objects.filter(player=user).select_related(
+        'player', 'team__captain', 'tournament'
+    )
     serializer = PlayerRegistrationSerializer(registrations, many=True)
     return Response(serializer.data)
 class UserListView(generics.ListAPIView):
+    keyset_ordering = ('id',)
    
     serializer_class = CustomUserSerializer
    
@@ -76,4 +80,25 @@ class UserListView(generics.ListAPIView):
             return CustomUser.objects.all()
         
         
-        return CustomUser.objects.none()
\ No newline at end of file
+        return CustomUser.objects.none()
+
+
+# Roles that add players to teams and children to cohorts through the pickers.
+SEARCH_ROLES = ('ADMIN', 'MANAGER', 'COACH')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_users(request):
+    """
+    Username autocomplete for the player pickers: ``?q=<prefix>``, an
+    optional ``role`` filter and ``limit`` (default 10, at most 50).
+    Only admins, managers and coaches may search.
+    """
+    if request.user.role not in SEARCH_ROLES:
+        return Response({"error": "You do not have permission to search users."}, status=status.HTTP_403_FORBIDDEN)
+    term, limit = search_params(request)
+    users = CustomUser.objects.filter(is_active=True)
+    if request.query_params.get('role'):
+        users = users.filter(role=request.query_params['role'])
+    return Response(prefix_search(users, 'username', term, limit, ('id', 'username', 'role')))
@@ -0,0 +1,58 @@
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+
+# Keys per UPDATE statement; keeps the CASE and its parameters bounded.
+UPDATE_BATCH_SIZE = 250
+
+
+def apply_counter_change(model, fields, before, after, key_fields=('tournament_id', 'team_id')):
+    """
+    Move rows of a counter table from the ``before`` contribution to the
+    ``after`` one. Both are dicts of ``{key: {field: value}}`` where a key
+    holds the values of ``key_fields`` (per (tournament, team) by default).
+    Only rows whose totals actually change are touched: missing rows are
+    inserted in one bulk_create, then each batch of keys gets a single
+    UPDATE adding its deltas through a CASE per field.
+    """
+    deltas = {}
+    for sign, contribution in ((-1, before), (1, after)):
+        for key, values in contribution.items():
+            row = deltas.setdefault(key, dict.fromkeys(fields, 0))
+            for field, value in values.items():
+                row[field] += sign * value
+    keys = [key for key, row in deltas.items() if any(row.values())]
+    if not keys:
+        return
+
+    with transaction.atomic():
+        # Rows are only created for additions, so a cascading delete
+        # never re-creates a row for a parent that is going away.
+        model.objects.bulk_create(
+            [model(**dict(zip(key_fields, key))) for key in keys if key in after],
+            ignore_conflicts=True,
+        )
+        for start in range(0, len(keys), UPDATE_BATCH_SIZE):
+            batch = {key: Q(**dict(zip(key_fields, key))) for key in keys[start:start + UPDATE_BATCH_SIZE]}
+            changes = {}
+            for field in fields:
+                whens = [When(match, then=Value(deltas[key][field])) for key, match in batch.items()
+                         if deltas[key][field]]
+                if whens:
+                    changes[field] = F(field) + Case(*whens, default=Value(0))
+            model.objects.filter(reduce(or_, batch.values())).update(updated_at=timezone.now(), **changes)
+
+
+def sum_contributions(fields, contributions):
+    """Fold an iterable of contribution dicts into absolute totals."""
+    totals = {}
+    for contribution in contributions:
+        for key, values in contribution.items():
+            row = totals.setdefault(key, dict.fromkeys(fields, 0))
+            for field, value in values.items():
+                row[field] += value
+    return totals
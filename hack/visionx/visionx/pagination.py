@@ -0,0 +1,122 @@
+import base64
+import json
+from functools import reduce
+from operator import and_, or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset ("seek") pagination.
+
+    Views declare ``keyset_ordering``, e.g. ``('start_time', 'id')`` or
+    ``('-date', '-time', 'id')``; ``id`` is appended if missing so the key
+    is unique. The cursor carries the ordering values of the last row on
+    the page and the next page is fetched with a ``WHERE (a, b) > (x, y)``
+    style filter, so every page costs one indexed range scan and no COUNT.
+
+    Pagination only kicks in when the client sends ``cursor`` or
+    ``page_size``; plain requests still get the full list as before.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+        queryset = queryset.order_by(*self.ordering)
+
+        encoded = params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.seek_filter(queryset.model, self.decode_cursor(encoded)))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[:self.page_size]
+        self.last_key = self.key_for(page[-1]) if page else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE or self.max_page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, view):
+        ordering = list(getattr(view, 'keyset_ordering', None) or ('id',))
+        if not {'id', '-id'} & set(ordering):
+            ordering.append('id')
+        return ordering
+
+    def key_for(self, obj):
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def seek_filter(self, model, values):
+        """Lexicographic "after this key" filter honouring each field's direction."""
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        names = [field.lstrip('-') for field in self.ordering]
+        try:
+            values = [model._meta.get_field(name).to_python(value) for name, value in zip(names, values)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        clauses = []
+        for index, field in enumerate(self.ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = [Q(**{names[i]: values[i]}) for i in range(index)]
+            clauses.append(reduce(and_, equal + [Q(**{f'{names[index]}__{lookup}': values[index]})]))
+        return reduce(or_, clauses)
+
+    def decode_cursor(self, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def encode_cursor(self, values):
+        # isoformat() keeps full microsecond precision, which the seek needs.
+        return base64.urlsafe_b64encode(
+            json.dumps(values, default=lambda value: value.isoformat()).encode('utf-8')
+        ).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_key))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,34 @@
+from rest_framework.exceptions import ValidationError
+
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def search_params(request):
+    """(term, limit) from ``?q=`` and ``?limit=`` for the autocomplete endpoints."""
+    term = request.query_params.get('q', '').strip()
+    if not term:
+        raise ValidationError({'q': 'Type at least one character.'})
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValidationError({'limit': 'limit must be a number.'})
+    return term, max(1, min(limit, MAX_LIMIT))
+
+
+def prefix_search(queryset, field, term, limit, columns):
+    """
+    Top ``limit`` rows for an autocomplete box, as ``columns`` dicts.
+
+    Rows whose ``field`` starts with ``term`` come first; that is a range
+    scan on the field's (unique) index, so it stays fast however big the
+    table is. If that leaves room, rows with a later word starting with
+    ``term`` ("disc" finds "Flying Discs") fill it up.
+    """
+    rows = list(queryset.filter(**{f'{field}__istartswith': term}).order_by(field).values(*columns)[:limit])
+    if len(rows) < limit:
+        rows += queryset.filter(**{f'{field}__icontains': f' {term}'}).exclude(
+            pk__in=[row['id'] for row in rows]
+        ).order_by(field).values(*columns)[:limit - len(rows)]
+    return rows
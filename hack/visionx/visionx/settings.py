@@ -74,6 +74,9 @@ TEMPLATES = [
     },
 ]
 
+# The live score streams (/api/tournaments/<pk>/live/, matches/<pk>/live/)
+# only work under ASGI (uvicorn visionx.asgi:application); under WSGI they
+# answer 501 and everything else works as usual.
 WSGI_APPLICATION = 'visionx.wsgi.application'
 
 
@@ -140,8 +143,33 @@ AUTH_USER_MODEL = 'users.CustomUser'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # Opt-in: list endpoints page only when ?cursor= or ?page_size= is sent.
+    'DEFAULT_PAGINATION_CLASS': 'visionx.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
+
+# Pub/sub backend for the live score streams (tournament/live.py). The
+# in-process broker only fans out within one ASGI worker; point this at a
+# class with the same subscribe/unsubscribe/publish API to share updates
+# between workers.
+LIVE_SCORE_BROKER = 'tournament.live.InProcessBroker'
+
+# Response cache for the public tournament reads (tournament/response_cache.py),
+# dropped by the model signals on every change. LocMemCache evicts least
+# recently used entries past MAX_ENTRIES but is per process; with several
+# workers switch to a shared backend such as
+# django.core.cache.backends.redis.RedisCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'visionx',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+TOURNAMENT_CACHE_ALIAS = 'default'
+TOURNAMENT_CACHE_TIMEOUT = 300
+
 # For development, allow all origins (change in production!)
 CORS_ALLOW_ALL_ORIGINS = True  # Set to False in production
 